@@ -18,6 +18,8 @@ from ...models.note import Note
 from ...models.interview_question import InterviewQuestion
 from ...models.login_log import LoginLog
 from ...models.operation_log import OperationLog
+from ...services.generation_cache import generation_cache
+from ...services.course_search_service import course_search_service
 
 
 router = APIRouter()
@@ -41,15 +43,49 @@ class ActivityItem(BaseModel):
     timestamp: datetime
 
 
+class LatencyHistogram(BaseModel):
+    """耗时直方图：counts[i] 为耗时不超过 bounds[i] 秒（且超过上一个上界）的调用数，最后一项为超过最大上界的调用数"""
+    bounds: List[float]
+    counts: List[int]
+    count: int
+    sum: float
+
+
+class PlatformHealth(BaseModel):
+    """外部资源平台的熔断器状态"""
+    platform: str
+    state: str  # "closed", "open", "half_open"
+    failure_rate: float  # 统计窗口内的失败率
+    slow_call_rate: float
+    window_calls: int
+    open_count: int  # 本进程启动以来的打开次数
+    retry_after: Optional[float] = None  # 打开状态下距离开始探测的秒数
+    latency: LatencyHistogram
+
+
 class SystemStatus(BaseModel):
     database_status: str  # "healthy", "slow", "error"
-    api_status: str
+    api_status: str  # "healthy", "degraded"（有外部平台处于熔断状态）
     cpu_usage: float
     memory_usage: float
     disk_usage: float
     last_check_time: datetime
+    platforms: List[PlatformHealth] = []
     
 
+class GenerationCacheStats(BaseModel):
+    """学习路线生成缓存统计（hits / misses / stores 为本进程启动以来的计数）"""
+    enabled: bool
+    ttl_hours: float
+    hits: int
+    misses: int
+    stores: int
+    hit_rate: float
+    entries: int  # 未过期的缓存条目数
+    entry_hits: int  # 未过期条目的累计命中次数
+    since: datetime
+
+
 class QuickStats(BaseModel):
     """快速统计（本周对比上周）"""
     users_this_week: int
@@ -231,16 +267,39 @@ async def get_system_status(
         memory_info = type('obj', (object,), {'percent': 0})()
         disk_info = type('obj', (object,), {'percent': 0})()
     
+    platforms = course_search_service.platform_health()
+    api_status = "degraded" if any(p["state"] != "closed" for p in platforms) else "healthy"
+    
     return SystemStatus(
         database_status=database_status,
-        api_status="healthy",
+        api_status=api_status,
         cpu_usage=cpu_usage,
         memory_usage=memory_info.percent,
         disk_usage=disk_info.percent,
-        last_check_time=datetime.now()
+        last_check_time=datetime.now(),
+        platforms=platforms
     )
 
 
+@router.get("/dashboard/generation-cache", response_model=GenerationCacheStats)
+async def get_generation_cache_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """获取学习路线生成缓存的命中统计"""
+    return GenerationCacheStats(**generation_cache.stats(db))
+
+
+@router.delete("/dashboard/generation-cache")
+async def clear_generation_cache(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """清空学习路线生成缓存"""
+    deleted = generation_cache.clear(db)
+    return {"success": True, "deleted": deleted}
+
+
 @router.get("/dashboard/quick-stats", response_model=QuickStats)
 async def get_quick_stats(
     db: Session = Depends(get_db),
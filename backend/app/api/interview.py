@@ -1,26 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
-from ..core.database import get_db
+import base64
+import tempfile
+from ..core.database import get_db, SessionLocal
 from ..api.deps import get_current_user
 from ..models.user import User
 from ..models.interview_question import InterviewQuestion
 from ..models.question_status import QuestionStatus
 from ..models.learning_path import LearningPath
+from ..models.knowledge_point import KnowledgePoint, QuestionKnowledgePoint
 from ..schemas.interview import (
     InterviewQuestionGenerate,
     InterviewQuestionResponse,
     InterviewQuestionsListResponse,
     InterviewStatistics,
     QuestionStatusUpdate,
-    GenerateQuestionsResponse
+    QuestionStatusBatchUpdate,
+    QuestionStatusBatchResponse,
+    QuestionStatusResult,
+    ReviewCard,
+    ReviewQueueResponse,
+    QuestionImportResponse,
+    GenerateQuestionsResponse,
+    InterviewSearchResponse
 )
 from ..services.interview_service import interview_service
+from ..services.question_search import question_search_service
+from ..services.knowledge_point_index import canonicalize_knowledge_point
+from ..services.review_scheduler import review_scheduler
+from ..services.question_transfer import question_transfer_service
 
 router = APIRouter(prefix="/api/interview", tags=["面试题库"])
 
+IMPORT_SPOOL_MAX_SIZE = 1024 * 1024  # 导入请求体超过1MB时写入磁盘
+
 
 @router.post("/generate", response_model=GenerateQuestionsResponse)
 async def generate_questions(
@@ -48,7 +66,8 @@ async def generate_questions(
             learning_path_id=request.learning_path_id,
             count=request.count,
             category=request.category,
-            based_on_weak_points=request.based_on_weak_points
+            based_on_weak_points=request.based_on_weak_points,
+            use_shared_pool=request.use_shared_pool
         )
         
         # 转换为响应格式
@@ -82,134 +101,147 @@ async def generate_questions(
         )
 
 
-@router.get("/questions/all/mistakes", response_model=InterviewQuestionsListResponse)
-async def get_all_mistakes(
-    limit: int = Query(500, ge=1, le=500),
+@router.get("/search", response_model=InterviewSearchResponse)
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取用户所有学习路线的错题"""
-    # 查询所有用户的学习路线
-    user_learning_paths = db.query(LearningPath).filter(
-        LearningPath.user_id == current_user.id
-    ).all()
-    
-    if not user_learning_paths:
-        # 空统计数据
-        empty_stats = InterviewStatistics(
-            total=0,
-            not_seen=0,
-            mastered=0,
-            not_mastered=0,
-            mastery_rate=0.0,
-            weak_categories=[],
-            weak_knowledge_points=[]
+    """全文检索用户所有学习路线中的面试题（题干、答案、知识点）"""
+    try:
+        question_ids, total = question_search_service.search(
+            db=db,
+            user_id=current_user.id,
+            query=q,
+            limit=limit,
+            offset=offset
         )
-        return InterviewQuestionsListResponse(
-            questions=[],
-            statistics=empty_stats,
-            total=0,
-            has_more=False
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(e)
         )
     
-    # 获取所有学习路线的ID
-    path_ids = [path.id for path in user_learning_paths]
-    
-    # 获取所有题目（用于统计）
-    all_questions = db.query(InterviewQuestion).filter(
-        InterviewQuestion.learning_path_id.in_(path_ids)
-    ).all()
-    
-    # 获取所有状态记录
-    all_question_ids = [q.id for q in all_questions]
-    all_statuses = db.query(QuestionStatus).filter(
-        QuestionStatus.question_id.in_(all_question_ids),
-        QuestionStatus.user_id == current_user.id
-    ).all()
-    
-    # 构建状态映射
-    all_status_map = {s.question_id: s for s in all_statuses}
-    
-    # 计算统计信息
-    stats = {
-        'total': len(all_questions),
-        'not_seen': 0,
-        'mastered': 0,
-        'not_mastered': 0
-    }
+    questions_map = {}
+    statuses_dict = {}
+    if question_ids:
+        questions_map = {
+            q_obj.id: q_obj for q_obj in db.query(InterviewQuestion).filter(
+                InterviewQuestion.id.in_(question_ids)
+            ).all()
+        }
+        statuses_dict = {
+            s.question_id: s for s in db.query(QuestionStatus).filter(
+                QuestionStatus.user_id == current_user.id,
+                QuestionStatus.question_id.in_(question_ids)
+            ).all()
+        }
     
-    category_count = {}
-    knowledge_point_count = {}
-    
-    for q in all_questions:
-        status_obj = all_status_map.get(q.id)
-        if status_obj:
-            if status_obj.status == 'not_seen':
-                stats['not_seen'] += 1
-            elif status_obj.status == 'mastered':
-                stats['mastered'] += 1
-            elif status_obj.status == 'not_mastered':
-                stats['not_mastered'] += 1
-                # 统计薄弱分类
-                category_count[q.category] = category_count.get(q.category, 0) + 1
-                # 统计薄弱知识点
-                for kp in q.knowledge_points:
-                    knowledge_point_count[kp] = knowledge_point_count.get(kp, 0) + 1
-        else:
-            stats['not_seen'] += 1
+    # 按相关度顺序构建响应
+    question_responses = []
+    for question_id in question_ids:
+        q_obj = questions_map.get(question_id)
+        if not q_obj:
+            continue
+        status_obj = statuses_dict.get(question_id)
+        question_responses.append(InterviewQuestionResponse(
+            id=q_obj.id,
+            learning_path_id=q_obj.learning_path_id,
+            question=q_obj.question,
+            answer=q_obj.answer,
+            category=q_obj.category,
+            difficulty=q_obj.difficulty,
+            knowledge_points=q_obj.knowledge_points,
+            created_at=q_obj.created_at,
+            user_status=status_obj.status if status_obj else "not_seen",
+            review_count=status_obj.review_count if status_obj else 0,
+            last_reviewed_at=status_obj.last_reviewed_at if status_obj else None
+        ))
     
-    # 计算掌握率
-    mastery_rate = stats['mastered'] / stats['total'] if stats['total'] > 0 else 0.0
+    return InterviewSearchResponse(
+        query=q,
+        questions=question_responses,
+        total=total,
+        has_more=(offset + limit) < total
+    )
+
+
+@router.get("/questions/all/mistakes", response_model=InterviewQuestionsListResponse)
+async def get_all_mistakes(
+    limit: int = Query(500, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    获取用户所有学习路线的错题
     
-    # 构建薄弱分类和知识点列表
-    weak_categories = [
-        {"category": cat, "count": count}
-        for cat, count in sorted(category_count.items(), key=lambda x: x[1], reverse=True)[:5]
-    ]
-    weak_knowledge_points = [
-        {"point": kp, "count": count}
-        for kp, count in sorted(knowledge_point_count.items(), key=lambda x: x[1], reverse=True)[:10]
-    ]
+    按最近复习时间倒序，使用 (last_reviewed_at, id) 游标分页；
+    统计信息由数据库聚合，不加载整个题库。
+    """
+    try:
+        cursor_key = _decode_mistakes_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
     
     statistics = InterviewStatistics(
-        total=stats['total'],
-        not_seen=stats['not_seen'],
-        mastered=stats['mastered'],
-        not_mastered=stats['not_mastered'],
-        mastery_rate=mastery_rate,
-        weak_categories=weak_categories,
-        weak_knowledge_points=weak_knowledge_points
+        **interview_service.get_user_mistake_statistics(db=db, user_id=current_user.id)
     )
     
-    # 构建查询：所有学习路线的错题
-    query = db.query(InterviewQuestion).filter(
-        InterviewQuestion.learning_path_id.in_(path_ids)
-    ).join(
-        QuestionStatus,
-        (QuestionStatus.question_id == InterviewQuestion.id) &
-        (QuestionStatus.user_id == current_user.id)
-    ).filter(QuestionStatus.status == "not_mastered")
+    if statistics.not_mastered == 0:
+        return InterviewQuestionsListResponse(
+            questions=[],
+            statistics=statistics,
+            total=0,
+            has_more=False
+        )
     
-    # 总数
-    total = query.count()
+    query = db.query(InterviewQuestion, QuestionStatus).join(
+        QuestionStatus,
+        QuestionStatus.question_id == InterviewQuestion.id
+    ).join(
+        LearningPath,
+        LearningPath.id == InterviewQuestion.learning_path_id
+    ).filter(
+        QuestionStatus.user_id == current_user.id,
+        QuestionStatus.status == "not_mastered",
+        LearningPath.user_id == current_user.id
+    )
     
-    # 分页
-    questions = query.offset(offset).limit(limit).all()
+    if cursor_key:
+        last_reviewed_at, status_id = cursor_key
+        if last_reviewed_at is None:
+            # 游标已进入未复习过的记录（排在最后）
+            query = query.filter(
+                QuestionStatus.last_reviewed_at.is_(None),
+                QuestionStatus.id < status_id
+            )
+        else:
+            query = query.filter(or_(
+                QuestionStatus.last_reviewed_at < last_reviewed_at,
+                and_(
+                    QuestionStatus.last_reviewed_at == last_reviewed_at,
+                    QuestionStatus.id < status_id
+                ),
+                QuestionStatus.last_reviewed_at.is_(None)
+            ))
     
-    # 获取用户状态
-    question_ids = [q.id for q in questions]
-    statuses = db.query(QuestionStatus).filter(
-        QuestionStatus.question_id.in_(question_ids),
-        QuestionStatus.user_id == current_user.id
-    ).all()
+    # 多取一条判断是否还有下一页
+    rows = query.order_by(
+        QuestionStatus.last_reviewed_at.desc().nullslast(),
+        QuestionStatus.id.desc()
+    ).limit(limit + 1).all()
     
-    status_map = {s.question_id: s for s in statuses}
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
-    # 转换为响应格式
     question_responses = []
-    for q in questions:
-        user_status_obj = status_map.get(q.id)
+    for q, status_obj in rows:
         question_responses.append(InterviewQuestionResponse(
             id=q.id,
             learning_path_id=q.learning_path_id,
@@ -219,22 +251,156 @@ async def get_all_mistakes(
             difficulty=q.difficulty,
             knowledge_points=q.knowledge_points,
             created_at=q.created_at,
-            user_status=user_status_obj.status if user_status_obj else "not_seen",
-            review_count=user_status_obj.review_count if user_status_obj else 0
+            user_status=status_obj.status,
+            review_count=status_obj.review_count,
+            last_reviewed_at=status_obj.last_reviewed_at
         ))
     
+    next_cursor = None
+    if has_more:
+        last_status = rows[-1][1]
+        next_cursor = _encode_mistakes_cursor(last_status.last_reviewed_at, last_status.id)
+    
     return InterviewQuestionsListResponse(
         questions=question_responses,
         statistics=statistics,
-        total=total,
-        has_more=(offset + limit) < total
+        total=statistics.not_mastered,
+        has_more=has_more,
+        next_cursor=next_cursor
     )
 
 
+def _encode_mistakes_cursor(last_reviewed_at: Optional[datetime], status_id: int) -> str:
+    """把 (last_reviewed_at, id) 编码为不透明的分页游标"""
+    reviewed = last_reviewed_at.isoformat() if last_reviewed_at else ""
+    return base64.urlsafe_b64encode(f"{reviewed}|{status_id}".encode()).decode()
+
+
+def _decode_mistakes_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """解析分页游标，格式不合法时抛出 ValueError（base64/解码错误也是其子类）"""
+    reviewed, status_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return (datetime.fromisoformat(reviewed) if reviewed else None), int(status_id)
+
+
+def _get_owned_learning_path(db: Session, learning_path_id: int, user_id: int) -> LearningPath:
+    learning_path = db.query(LearningPath).filter(
+        LearningPath.id == learning_path_id,
+        LearningPath.user_id == user_id
+    ).first()
+    
+    if not learning_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="学习路线不存在"
+        )
+    return learning_path
+
+
+@router.get("/export/{learning_path_id}")
+async def export_questions(
+    learning_path_id: int,
+    include_statuses: bool = Query(False, description="同时导出当前用户的刷题状态"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """以 JSONL 流式导出学习路线的题库（每行一道题）"""
+    _get_owned_learning_path(db, learning_path_id, current_user.id)
+    user_id = current_user.id
+    
+    def line_stream():
+        # 流式响应期间使用独立会话，服务端游标分批读取
+        export_db = SessionLocal()
+        try:
+            yield from question_transfer_service.iter_export(
+                export_db,
+                learning_path_id,
+                user_id=user_id,
+                include_statuses=include_statuses
+            )
+        finally:
+            export_db.close()
+    
+    return StreamingResponse(
+        line_stream(),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="interview_questions_{learning_path_id}.jsonl"'
+        }
+    )
+
+
+@router.post("/import/{learning_path_id}", response_model=QuestionImportResponse)
+async def import_questions(
+    learning_path_id: int,
+    request: Request,
+    include_statuses: bool = Query(False, description="同时导入文件中的刷题状态"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    从 JSONL 请求体导入题目（Content-Type: application/x-ndjson）
+    
+    请求体先写入临时文件（超过1MB落盘），再逐行分批去重、批量插入。
+    """
+    _get_owned_learning_path(db, learning_path_id, current_user.id)
+    
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_SIZE) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        
+        result = question_transfer_service.import_lines(
+            db,
+            learning_path_id,
+            spool,
+            user_id=current_user.id,
+            include_statuses=include_statuses
+        )
+    
+    return QuestionImportResponse(
+        success=True,
+        message=f"成功导入{result['imported']}道题目",
+        **result
+    )
+
+
+@router.get("/review-queue", response_model=ReviewQueueResponse)
+async def get_review_queue(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """获取已到期的复习卡片（间隔复习，按到期时间升序）"""
+    # 多取一条判断是否还有更多到期卡片
+    rows = review_scheduler.get_review_queue(db=db, user_id=current_user.id, limit=limit + 1)
+    
+    cards = []
+    for q, status_obj in rows[:limit]:
+        cards.append(ReviewCard(
+            id=q.id,
+            learning_path_id=q.learning_path_id,
+            question=q.question,
+            answer=q.answer,
+            category=q.category,
+            difficulty=q.difficulty,
+            knowledge_points=q.knowledge_points,
+            created_at=q.created_at,
+            user_status=status_obj.status,
+            review_count=status_obj.review_count,
+            last_reviewed_at=status_obj.last_reviewed_at,
+            due_at=status_obj.due_at,
+            ease=status_obj.ease,
+            interval_days=status_obj.interval_days
+        ))
+    
+    return ReviewQueueResponse(cards=cards, has_more=len(rows) > limit)
+
+
 @router.get("/questions/{learning_path_id}", response_model=InterviewQuestionsListResponse)
 async def get_questions(
     learning_path_id: int,
     status_filter: Optional[str] = Query(None, alias="status"),
+    knowledge_point: Optional[str] = Query(None, max_length=200, description="按知识点筛选"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
@@ -266,6 +432,16 @@ async def get_questions(
             (QuestionStatus.user_id == current_user.id)
         ).filter(QuestionStatus.status == status_filter)
     
+    # 如果有知识点筛选（走知识点关联表）
+    if knowledge_point:
+        query = query.join(
+            QuestionKnowledgePoint,
+            QuestionKnowledgePoint.question_id == InterviewQuestion.id
+        ).join(
+            KnowledgePoint,
+            KnowledgePoint.id == QuestionKnowledgePoint.knowledge_point_id
+        ).filter(KnowledgePoint.canonical_name == canonicalize_knowledge_point(knowledge_point))
+    
     # 获取总数
     total = query.count()
     
@@ -379,6 +555,17 @@ async def update_question_status(
         )
         db.add(question_status)
     
+    # 安排下次复习
+    schedule = review_scheduler.schedule(
+        question_status.ease,
+        question_status.interval_days,
+        review_scheduler.quality_for_status(request.status.value, request.quality),
+        question_status.last_reviewed_at
+    )
+    question_status.ease = schedule.ease
+    question_status.interval_days = schedule.interval_days
+    question_status.due_at = schedule.due_at
+    
     db.commit()
     db.refresh(question_status)
     
@@ -386,10 +573,45 @@ async def update_question_status(
         "success": True,
         "message": "状态更新成功",
         "status": question_status.status,
-        "review_count": question_status.review_count
+        "review_count": question_status.review_count,
+        "due_at": question_status.due_at
     }
 
 
+@router.post("/status/batch", response_model=QuestionStatusBatchResponse)
+async def batch_update_question_status(
+    request: QuestionStatusBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量更新题目状态（复习会话结束时一次提交）"""
+    try:
+        rows = interview_service.batch_update_statuses(
+            db=db,
+            user_id=current_user.id,
+            items=[(item.question_id, item.status.value, item.quality) for item in request.items]
+        )
+    except PermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
+    
+    return QuestionStatusBatchResponse(
+        success=True,
+        message=f"已更新{len(rows)}道题目状态",
+        statuses=[
+            QuestionStatusResult(
+                question_id=row.question_id,
+                status=row.status,
+                review_count=row.review_count,
+                due_at=row.due_at
+            )
+            for row in rows
+        ]
+    )
+
+
 @router.get("/statistics/{learning_path_id}", response_model=InterviewStatistics)
 async def get_statistics(
     learning_path_id: int,
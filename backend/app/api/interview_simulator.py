@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import Optional
-from ..core.database import get_db
+import asyncio
+import datetime
+import json
+from ..core.database import get_db, SessionLocal
 from ..api.deps import get_current_user
 from ..models.user import User
 from ..models.interview_session import InterviewSession
-from ..services.interview_simulator import InterviewSimulator
+from ..services.interview_simulator import InterviewSimulator, run_evaluation_job, DIMENSION_SCORE_COLUMNS
 from pydantic import BaseModel
 
 
 router = APIRouter()
 
+# SSE 推送评价结果的轮询间隔与最长等待时间（秒）
+EVALUATION_POLL_INTERVAL = 1.0
+EVALUATION_STREAM_TIMEOUT = 300
+
 
 class StartSessionRequest(BaseModel):
     learning_path_id: int
@@ -66,13 +75,15 @@ async def continue_interview(
 @router.post("/end")
 async def end_interview_session(
     request: EndSessionRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """结束面试，生成评价报告"""
+    """结束面试，后台生成评价报告（通过 /session/{id} 轮询或 SSE 获取结果）"""
     try:
         simulator = InterviewSimulator(db)
         result = simulator.end_session(request.session_id, current_user.id)
+        background_tasks.add_task(run_evaluation_job, request.session_id)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -80,15 +91,89 @@ async def end_interview_session(
         raise HTTPException(status_code=500, detail=f"结束面试失败：{str(e)}")
 
 
+@router.post("/session/{session_id}/evaluate")
+async def retry_session_evaluation(
+    session_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """重新生成评价失败的面试报告"""
+    try:
+        simulator = InterviewSimulator(db)
+        result = simulator.retry_evaluation(session_id, current_user.id)
+        background_tasks.add_task(run_evaluation_job, session_id)
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/session/{session_id}/events")
+async def stream_session_evaluation(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """以 SSE 推送评价进度，评价结束（completed / evaluation_failed）后关闭连接"""
+    exists = db.query(InterviewSession.id).filter(
+        InterviewSession.id == session_id,
+        InterviewSession.user_id == current_user.id
+    ).first()
+    
+    if not exists:
+        raise HTTPException(status_code=404, detail="会话不存在")
+    
+    async def event_stream():
+        waited = 0.0
+        while True:
+            # 每次轮询使用短生命周期的会话，避免长连接占用连接池
+            poll_db = SessionLocal()
+            try:
+                session = poll_db.query(InterviewSession).filter(
+                    InterviewSession.id == session_id
+                ).first()
+                payload = {
+                    "session_id": session_id,
+                    "status": session.status,
+                    "evaluation": session.evaluation if session.status != "evaluating" else None
+                } if session else None
+            finally:
+                poll_db.close()
+            
+            if payload is None:
+                yield f"event: error\ndata: {json.dumps({'error': '会话已删除'}, ensure_ascii=False)}\n\n"
+                break
+            
+            yield f"event: status\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+            
+            if payload["status"] != "evaluating" or waited >= EVALUATION_STREAM_TIMEOUT:
+                break
+            
+            await asyncio.sleep(EVALUATION_POLL_INTERVAL)
+            waited += EVALUATION_POLL_INTERVAL
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/history")
 async def get_interview_history(
     limit: int = 10,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取历史面试记录"""
+    """获取历史面试记录（只查询列表所需的列，不加载对话和评价 JSON）"""
     try:
-        sessions = db.query(InterviewSession).filter(
+        sessions = db.query(
+            InterviewSession.id,
+            InterviewSession.position,
+            InterviewSession.overall_score,
+            InterviewSession.duration_seconds,
+            InterviewSession.started_at
+        ).filter(
             InterviewSession.user_id == current_user.id,
             InterviewSession.status == "completed"
         ).order_by(InterviewSession.created_at.desc()).limit(limit).all()
@@ -96,7 +181,7 @@ async def get_interview_history(
         return [{
             "id": s.id,
             "position": s.position,
-            "score": s.evaluation.get("overall_score") if s.evaluation else None,
+            "score": s.overall_score,
             "duration_minutes": s.duration_seconds // 60 if s.duration_seconds else 0,
             "started_at": s.started_at.isoformat()
         } for s in sessions]
@@ -104,6 +189,58 @@ async def get_interview_history(
         raise HTTPException(status_code=500, detail=f"获取历史记录失败：{str(e)}")
 
 
+@router.get("/trends")
+async def get_score_trends(
+    days: int = Query(90, ge=1, le=365),
+    dimension: Optional[str] = Query(None, description="overall 或维度名：technical_depth/expression/problem_solving/experience"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """面试得分趋势（直接读取评分冗余列）"""
+    score_columns = {
+        "overall": InterviewSession.overall_score,
+        **{
+            name: getattr(InterviewSession, column)
+            for name, column in DIMENSION_SCORE_COLUMNS.items()
+        }
+    }
+    
+    if dimension and dimension not in score_columns:
+        raise HTTPException(status_code=400, detail=f"不支持的评分维度：{dimension}")
+    
+    selected = {dimension: score_columns[dimension]} if dimension else score_columns
+    since = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+    filters = (
+        InterviewSession.user_id == current_user.id,
+        InterviewSession.status == "completed",
+        InterviewSession.completed_at >= since
+    )
+    
+    rows = db.query(
+        InterviewSession.id,
+        InterviewSession.completed_at,
+        *[column.label(name) for name, column in selected.items()]
+    ).filter(*filters).order_by(InterviewSession.completed_at.asc()).all()
+    
+    averages = db.query(
+        *[func.avg(column).label(name) for name, column in selected.items()]
+    ).filter(*filters).one()
+    
+    return {
+        "days": days,
+        "count": len(rows),
+        "averages": {
+            name: round(value, 1) if value is not None else None
+            for name, value in averages._mapping.items()
+        },
+        "points": [{
+            "session_id": row.id,
+            "completed_at": row.completed_at.isoformat(),
+            "scores": {name: getattr(row, name) for name in selected}
+        } for row in rows]
+    }
+
+
 @router.get("/session/{session_id}")
 async def get_session_detail(
     session_id: int,
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
-from typing import List, Dict, Any
-from ..core.database import get_db
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, load_only
+from typing import List, Dict, Any, Optional
+from ..core.database import get_db, SessionLocal
 from ..api.deps import get_current_user
 from ..models.user import User
 from ..models.learning_path import LearningPath
@@ -10,131 +10,243 @@ from ..schemas.learning_path import (
     LearningPathCreate,
     LearningPathResponse,
     LearningPathList,
-    ContentGenerationRequest
+    LearningPathSummary,
+    ContentGenerationRequest,
+    GenerationJobResponse,
+    LearningPathSectionResponse
 )
 from ..services.n8n_client import n8n_client
 from ..services.resource_matcher import resource_matcher
 from ..services.dynamic_resource_service import dynamic_resource_service
-import re
+from ..services.learning_path_jobs import learning_path_jobs
+from ..services.generation_cache import generation_cache
+from ..services.learning_path_keywords import learning_path_keywords
+from ..services.learning_path_sections import learning_path_section_store, RESOURCE_SECTION_TYPES, SECTION_TYPES
+import asyncio
+import base64
+import json
 
 router = APIRouter(prefix="/api/learning-paths", tags=["学习路线"])
 
+GENERATION_POLL_INTERVAL = 1.0
+GENERATION_STREAM_TIMEOUT = 600
 
-def extract_keywords_from_learning_path(learning_path: LearningPath) -> List[str]:
-    """
-    从学习路线中提取关键词用于搜索
-    
-    Args:
-        learning_path: 学习路线对象
-        
-    Returns:
-        关键词列表
-    """
-    keywords = []
-    
-    # 1. 职位名称
-    keywords.append(learning_path.position)
-    
-    # 2. 从generated_content中提取技术关键词
-    generated_content = learning_path.generated_content or {}
-    output = generated_content.get('output', '')
-    
-    # 3. 从Markdown内容中提取加粗的技术名词（**xxx**）
-    if output:
-        # 提取Markdown加粗文本
-        bold_keywords = re.findall(r'\*\*([^\*]+)\*\*', output)
-        keywords.extend(bold_keywords[:10])  # 最多10个
-        
-        # 提取常见技术关键词
-        tech_pattern = r'\b(Java|Python|JavaScript|React|Vue|Angular|Node\.js|Spring|Django|Flask|MySQL|PostgreSQL|MongoDB|Redis|Docker|Kubernetes|AWS|Azure|Git|Linux|HTTP|TCP|SQL|NoSQL|RESTful|GraphQL|微服务|前端|后端|全栈)\b'
-        tech_keywords = re.findall(tech_pattern, output, re.IGNORECASE)
-        keywords.extend(list(set(tech_keywords))[:5])  # 去重后最多5个
-    
-    # 4. 去重并限制数量
-    unique_keywords = []
-    seen = set()
-    for kw in keywords:
-        kw_clean = kw.strip()
-        if kw_clean and kw_clean.lower() not in seen:
-            unique_keywords.append(kw_clean)
-            seen.add(kw_clean.lower())
-    
-    return unique_keywords[:5]  # 返回最多5个关键词
+# 列表可选字段（generated_content 只在详情接口返回）
+LIST_FIELDS = ("id", "user_id", "position", "job_description", "created_at", "generation_status", "generation_error")
+DEFAULT_LIST_FIELDS = ("id", "user_id", "position", "created_at", "generation_status", "generation_error")
 
 
-@router.post("/generate", response_model=LearningPathResponse)
+@router.post("/generate", response_model=GenerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def generate_learning_path(
     path_data: LearningPathCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """生成学习路线（调用n8n工作流）"""
-    # 调用n8n工作流，传递content_types
-    result = await n8n_client.generate_learning_path(
-        user_id=str(current_user.id),
-        position=path_data.position,
-        job_description=path_data.job_description,
-        content_types=path_data.content_types
-    )
+    """
+    提交学习路线生成任务（调用n8n工作流）
     
-    if not result.get("success", False):
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=result.get("error", "学习路线生成失败")
+    立即返回 202 和任务ID（即学习路线ID），进度通过 /{path_id}/status 轮询或 /{path_id}/events 订阅。
+    相同职位、JD和内容类型已生成过时（use_cache=True），直接复制缓存结果，返回的状态即为 completed。
+    """
+    cached_content = None
+    if path_data.use_cache:
+        cached_content = generation_cache.get(
+            db, path_data.position, path_data.job_description, path_data.content_types
         )
+        if cached_content is not None:
+            cached_content.setdefault("metadata", {})["position"] = path_data.position
     
-    # 构建generated_content，只标记实际生成的内容类型
-    generated_data = result.get("data", {})
-    
-    # 只有mindmap是首次生成时一定有的，其他内容需要单独生成
-    actually_generated_types = []
-    if generated_data.get("output"):
-        actually_generated_types.append("mindmap")
-    
-    generated_content = {
-        "output": generated_data.get("output", ""),
-        "generated_types": actually_generated_types,
-        "metadata": {
-            "position": path_data.position,
-            "timestamp": generated_data.get("timestamp")
-        }
-    }
-    
-    # 保存到数据库
-    learning_path = LearningPath(
+    learning_path = learning_path_jobs.create_job(
+        db,
         user_id=current_user.id,
         position=path_data.position,
         job_description=path_data.job_description,
-        generated_content=generated_content
+        content_types=path_data.content_types,
+        generated_content=cached_content
     )
-    db.add(learning_path)
-    db.commit()
-    db.refresh(learning_path)
+    if cached_content is not None:
+        print(f"[DEBUG] 学习路线 {learning_path.id} 命中生成缓存")
+        return _job_response(learning_path, from_cache=True)
+    
+    background_tasks.add_task(learning_path_jobs.run, learning_path.id)
+    return _job_response(learning_path)
+
+
+def _job_response(learning_path: LearningPath, from_cache: bool = False) -> GenerationJobResponse:
+    return GenerationJobResponse(
+        job_id=learning_path.id,
+        learning_path_id=learning_path.id,
+        status=learning_path.generation_status,
+        error=learning_path.generation_error,
+        attempts=learning_path.generation_attempts or 0,
+        from_cache=from_cache
+    )
+
+
+def _get_user_learning_path(db: Session, path_id: int, user_id: int) -> LearningPath:
+    learning_path = db.query(LearningPath).filter(
+        LearningPath.id == path_id,
+        LearningPath.user_id == user_id
+    ).first()
+    
+    if not learning_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="学习路线不存在"
+        )
+    return learning_path
+
+
+@router.get("/{path_id}/status", response_model=GenerationJobResponse)
+async def get_generation_status(
+    path_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """查询学习路线生成任务的进度"""
+    return _job_response(_get_user_learning_path(db, path_id, current_user.id))
+
+
+@router.post("/{path_id}/retry", response_model=GenerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def retry_generation(
+    path_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """重新提交生成失败的学习路线"""
+    learning_path = _get_user_learning_path(db, path_id, current_user.id)
+    try:
+        learning_path_jobs.retry(db, learning_path)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    background_tasks.add_task(learning_path_jobs.run, learning_path.id)
+    return _job_response(learning_path)
+
+
+@router.get("/{path_id}/events")
+async def stream_generation_status(
+    path_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """以 SSE 推送生成进度，状态变化时发送事件，任务结束（completed / failed）后关闭连接"""
+    _get_user_learning_path(db, path_id, current_user.id)
+    
+    async def event_stream():
+        waited = 0.0
+        last_status = None
+        while True:
+            # 每次轮询使用短生命周期的会话，避免长连接占用连接池
+            poll_db = SessionLocal()
+            try:
+                learning_path = poll_db.query(LearningPath).filter(LearningPath.id == path_id).first()
+                payload = _job_response(learning_path).model_dump() if learning_path else None
+            finally:
+                poll_db.close()
+            
+            if payload is None:
+                yield f"event: error\ndata: {json.dumps({'error': '学习路线已删除'}, ensure_ascii=False)}\n\n"
+                break
+            
+            if payload["status"] != last_status:
+                yield f"event: status\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                last_status = payload["status"]
+            
+            if payload["status"] in ("completed", "failed") or waited >= GENERATION_STREAM_TIMEOUT:
+                break
+            
+            await asyncio.sleep(GENERATION_POLL_INTERVAL)
+            waited += GENERATION_POLL_INTERVAL
     
-    return LearningPathResponse.model_validate(learning_path)
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
-@router.get("", response_model=LearningPathList)
+@router.get("", response_model=LearningPathList, response_model_exclude_unset=True)
 async def list_learning_paths(
-    skip: int = 0,
-    limit: int = 20,
+    skip: int = Query(0, ge=0, description="偏移分页（未传 cursor 时使用）"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    fields: Optional[str] = Query(None, description="逗号分隔的返回字段，如 id,position,created_at"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取用户的学习路线列表"""
-    query = db.query(LearningPath).filter(
-        LearningPath.user_id == current_user.id
-    ).order_by(LearningPath.created_at.desc())
+    """
+    获取用户的学习路线列表（按创建顺序倒序）
+    
+    只加载列表需要的列，generated_content 不加载也不返回（详情见 /{path_id}）；
+    job_description 默认不返回，需要时通过 fields 指定。
+    """
+    try:
+        selected = _parse_list_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        before_id = _decode_list_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
     
+    query = db.query(LearningPath).filter(LearningPath.user_id == current_user.id)
     total = query.count()
-    items = query.offset(skip).limit(limit).all()
+    
+    query = query.options(
+        load_only(*[getattr(LearningPath, field) for field in selected])
+    ).order_by(LearningPath.id.desc())
+    if before_id is not None:
+        query = query.filter(LearningPath.id < before_id)
+    else:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     return LearningPathList(
         total=total,
-        items=[LearningPathResponse.model_validate(item) for item in items]
+        items=[LearningPathSummary(**{field: getattr(row, field) for field in selected}) for row in rows],
+        has_more=has_more,
+        next_cursor=_encode_list_cursor(rows[-1].id) if has_more else None
     )
 
 
+def _parse_list_fields(fields: Optional[str]) -> List[str]:
+    """解析 fields 参数（id 总是返回），包含不支持的字段时抛出 ValueError"""
+    if not fields:
+        return list(DEFAULT_LIST_FIELDS)
+    
+    selected = ["id"]
+    for field in fields.split(","):
+        field = field.strip()
+        if not field or field in selected:
+            continue
+        if field not in LIST_FIELDS:
+            raise ValueError(f"不支持的字段: {field}，可选: {', '.join(LIST_FIELDS)}")
+        selected.append(field)
+    return selected
+
+
+def _encode_list_cursor(last_id: int) -> str:
+    """把最后一条学习路线的 id 编码为不透明的分页游标"""
+    return base64.urlsafe_b64encode(f"lp|{last_id}".encode()).decode()
+
+
+def _decode_list_cursor(cursor: str) -> int:
+    """解析分页游标，格式不合法时抛出 ValueError（base64/解码错误也是其子类）"""
+    prefix, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    if prefix != "lp":
+        raise ValueError(cursor)
+    return int(last_id)
+
+
 @router.get("/{path_id}", response_model=LearningPathResponse)
 async def get_learning_path(
     path_id: int,
@@ -153,7 +265,33 @@ async def get_learning_path(
             detail="学习路线不存在"
         )
     
-    return LearningPathResponse.model_validate(learning_path)
+    response = LearningPathResponse.model_validate(learning_path)
+    response.generated_content = learning_path_section_store.assemble(db, learning_path)
+    return response
+
+
+@router.get("/{path_id}/sections/{content_type}", response_model=LearningPathSectionResponse)
+async def get_learning_path_section(
+    path_id: int,
+    content_type: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """只读取学习路线的某一类内容（knowledge, interview, courses, books, certifications）"""
+    if content_type not in SECTION_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的内容类型: {content_type}"
+        )
+    _get_user_learning_path(db, path_id, current_user.id)
+    
+    section = learning_path_section_store.get_section(db, path_id, content_type)
+    if section is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="该内容尚未生成"
+        )
+    return LearningPathSectionResponse(**section)
 
 
 @router.delete("/{path_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -198,53 +336,56 @@ async def generate_specific_content(
             detail="学习路线不存在"
         )
     
+    if learning_path.generation_status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="学习路线尚未生成完成"
+        )
+    
     content_type = content_request.content_type
-    generated_content = learning_path.generated_content or {}
-    generated_types = generated_content.get("generated_types", [])
     
     # 资源推荐类型（courses, books, certifications）允许多次生成（加载更多）
     # 其他类型（knowledge, interview）检查缓存
-    if content_type not in ["courses", "books", "certifications"]:
+    if content_type not in RESOURCE_SECTION_TYPES:
         # 检查是否已生成该类型内容（并且内容不为空）
-        if content_type in generated_types and generated_content.get(content_type):
+        existing_content = learning_path_section_store.get_text(db, learning_path.id, content_type)
+        if existing_content:
             return {
                 "success": True,
                 "message": "内容已存在",
-                "content": generated_content.get(content_type),
+                "content": existing_content,
                 "from_cache": True
             }
     
     # 处理资源推荐类型 (courses, books, certifications)
-    if content_type in ["courses", "books", "certifications"]:
-        # 从学习路线中提取关键词
-        keywords = extract_keywords_from_learning_path(learning_path)
+    if content_type in RESOURCE_SECTION_TYPES:
+        # 学习路线的搜索关键词（生成时已提取；旧数据在此补提取并保存）
+        if learning_path_keywords.ensure(learning_path):
+            db.commit()
+        keywords = list(learning_path.keywords or [])
         
-        # 获取现有资源并计算页码
-        existing_resources = generated_content.get(content_type, [])
         # 每次生成就增加页码，而不是等满一页
-        # 这样可以确保每次都获取不同的结果
-        generation_count = generated_content.get(f"{content_type}_generation_count", 0)
-        page = generation_count + 1
-        generated_content[f"{content_type}_generation_count"] = page
+        # 这样可以确保每次都获取不同的结果（搜索期间不持有写事务，保存时再推进页码）
+        page = learning_path_section_store.get_generation_count(db, learning_path.id, content_type) + 1
         
         print(f"[DEBUG] 提取的关键词: {keywords}")
-        print(f"[DEBUG] 当前已有 {len(existing_resources)} 个资源，将搜索第 {page} 页")
+        print(f"[DEBUG] 将搜索第 {page} 页")
         
         # 使用DynamicResourceService动态搜索资源
         try:
             if content_type == "courses":
-                matched_resources = dynamic_resource_service.search_courses(
+                matched_resources = await dynamic_resource_service.search_courses(
                     keywords=keywords,
                     platforms=['bilibili', 'imooc', 'geekbang'],
                     page=page
                 )
             elif content_type == "books":
-                matched_resources = dynamic_resource_service.search_books(
+                matched_resources = await dynamic_resource_service.search_books(
                     keywords=keywords,
                     page=page
                 )
             else:  # certifications
-                matched_resources = dynamic_resource_service.search_certifications(
+                matched_resources = await dynamic_resource_service.search_certifications(
                     keywords=keywords,
                     page=page
                 )
@@ -260,23 +401,17 @@ async def generate_specific_content(
             else:
                 matched_resources = resource_matcher.match_certifications(keywords)
         
-        # 追加新资源（而不是覆盖）
-        # existing_resources 已在上面定义
-        
-        # 使用URL去重
-        existing_urls = {res.get('url') for res in existing_resources if isinstance(res, dict) and res.get('url')}
-        
-        # 只添加新资源
-        new_resources = []
-        for resource in matched_resources:
-            if isinstance(resource, dict) and resource.get('url') not in existing_urls:
-                new_resources.append(resource)
-                existing_urls.add(resource.get('url'))
+        # 追加新资源（只插入新行，按URL去重）；没有新资源时回滚，页码不变
+        learning_path_section_store.advance_page(db, learning_path.id, content_type)
+        new_resources = learning_path_section_store.append_resources(
+            db, learning_path.id, content_type, matched_resources
+        )
         
-        print(f"[DEBUG] 已有 {len(existing_resources)} 个资源，新增 {len(new_resources)} 个")
+        print(f"[DEBUG] 新增 {len(new_resources)} 个资源")
         
         # 检查是否有新资源
         if len(new_resources) == 0:
+            db.rollback()
             # 没有新资源可推荐
             content_type_names = {
                 "courses": "课程",
@@ -288,24 +423,16 @@ async def generate_specific_content(
             return {
                 "success": False,
                 "message": f"暂无更多{type_name}推荐，已展示所有相关{type_name}",
-                "content": existing_resources,  # 返回现有资源
+                "content": learning_path_section_store.get_resources(db, learning_path.id, content_type),  # 返回现有资源
                 "from_cache": True,
                 "no_more_resources": True  # 标记：没有更多资源
             }
         
-        # 合并资源列表
-        all_resources = existing_resources + new_resources
-        generated_content[content_type] = all_resources
-        
-        if content_type not in generated_types:
-            generated_types.append(content_type)
-        generated_content["generated_types"] = generated_types
-        
-        learning_path.generated_content = generated_content
-        # 标记JSON字段已修改
-        flag_modified(learning_path, "generated_content")
         db.commit()
-        db.refresh(learning_path)
+        all_resources = learning_path_section_store.get_resources(db, learning_path.id, content_type)
+        
+        # 下一次"加载更多"会搜索 page + 1，提前在后台预取
+        dynamic_resource_service.prefetch(content_type, keywords, page + 1)
         
         print(f"[DEBUG] 总计 {len(all_resources)} 个资源")
         
@@ -357,16 +484,8 @@ async def generate_specific_content(
             detail="AI生成的内容为空"
         )
     
-    generated_content[content_type] = ai_output
-    if content_type not in generated_types:
-        generated_types.append(content_type)
-    generated_content["generated_types"] = generated_types
-    
-    learning_path.generated_content = generated_content
-    # 标记JSON字段已修改，否则SQLAlchemy不会更新
-    flag_modified(learning_path, "generated_content")
+    learning_path_section_store.save_text(db, learning_path.id, content_type, ai_output)
     db.commit()
-    db.refresh(learning_path)
     
     return {
         "success": True,
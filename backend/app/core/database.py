@@ -17,3 +17,16 @@ def get_db():
     finally:
         db.close()
 
+
+
+def dialect_insert(db):
+    """
+    返回当前数据库方言的 insert 构造器（支持 ON CONFLICT）
+
+    SQLite 和 PostgreSQL 都支持 on_conflict_do_nothing / on_conflict_do_update。
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
@@ -4,6 +4,14 @@ from .core.config import settings
 from .core.database import engine, Base
 from .api import auth, learning_paths, progress, notes, notebooks, chat, tech_links, interview, ai_assistant, ai_notes, interview_simulator
 from .api.admin import users as admin_users, analytics as admin_analytics, config as admin_config, logs as admin_logs, login_logs as admin_login_logs, dashboard as admin_dashboard
+from .services.question_search import question_search_service
+from .services.knowledge_point_index import knowledge_point_index
+from .services.learning_path_jobs import learning_path_jobs
+from .services.n8n_client import n8n_client
+from .services.course_search_service import course_search_service
+from .services.dynamic_resource_service import dynamic_resource_service
+from .services.learning_path_sections import learning_path_section_store
+from .services.interview_simulator import fail_interrupted_evaluations
 
 # 创建数据库表
 Base.metadata.create_all(bind=engine)
@@ -46,6 +54,44 @@ app.include_router(admin_logs.router, prefix="/api/admin", tags=["管理-操作
 app.include_router(admin_login_logs.router, prefix="/api/admin", tags=["管理-登录日志"])
 
 
+@app.on_event("startup")
+async def create_question_search_index():
+    """创建面试题全文检索索引、同步触发器并回填（幂等）"""
+    question_search_service.ensure_index(engine)
+
+
+@app.on_event("startup")
+async def migrate_learning_path_sections():
+    """旧版学习路线的按需生成内容迁移到分区表（幂等，只处理未标记为已迁移的学习路线）"""
+    learning_path_section_store.ensure_backfilled()
+
+
+@app.on_event("startup")
+async def backfill_knowledge_point_index():
+    """回填面试题知识点索引（幂等，只处理未标记为已建立索引的题目）"""
+    knowledge_point_index.ensure_backfilled()
+
+
+@app.on_event("startup")
+async def resume_generation_jobs():
+    """恢复重启前未完成的学习路线生成任务"""
+    learning_path_jobs.resume_pending()
+
+
+@app.on_event("startup")
+async def fail_interrupted_interview_evaluations():
+    """重启前未完成的面试评价不会继续执行，标记为失败以便客户端重试"""
+    fail_interrupted_evaluations()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """关闭共享的HTTP连接池"""
+    await dynamic_resource_service.stop_prefetch()
+    await n8n_client.aclose()
+    await course_search_service.aclose()
+
+
 @app.get("/")
 async def root():
     """根路径"""
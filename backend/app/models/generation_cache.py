@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class GenerationCacheEntry(Base):
+    """学习路线生成结果缓存：按规范化后的（职位, JD, 内容类型）哈希寻址"""
+    __tablename__ = "generation_cache_entries"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 十六进制
+    position = Column(String(200), nullable=False)  # 首次生成时的原始职位名称
+    content_types = Column(JSON)
+    generated_content = Column(JSON, nullable=False)
+    hit_count = Column(Integer, default=0)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
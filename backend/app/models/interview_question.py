@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum, Boolean
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -11,19 +11,29 @@ class DifficultyLevel(str, enum.Enum):
     HARD = "hard"
 
 
+# 题目来源
+QUESTION_SOURCE_GENERATED = "generated"  # 按职位生成（未选择共享题库）
+QUESTION_SOURCE_SHARED = "shared"  # 选择共享题库时按职位生成或从题库取得，可入池
+QUESTION_SOURCE_WEAK_POINTS = "weak_points"  # 针对个人薄弱点生成
+QUESTION_SOURCE_IMPORTED = "imported"  # JSONL 导入
+
+
 class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
     
     id = Column(Integer, primary_key=True, index=True)
-    learning_path_id = Column(Integer, ForeignKey("learning_paths.id", ondelete="CASCADE"), nullable=False)
+    learning_path_id = Column(Integer, ForeignKey("learning_paths.id", ondelete="CASCADE"), nullable=False, index=True)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
     category = Column(String(100))  # 技术基础/项目经验/行为面试等，由AI灵活生成
     difficulty = Column(String(20), default="medium")
     knowledge_points = Column(JSON)  # 关联的知识点列表
+    source = Column(String(20))  # 题目来源（QUESTION_SOURCE_*），旧数据为空
+    # 知识点是否已写入 question_knowledge_points（新题目保存时即建立索引，只有存量题目需要回填）
+    knowledge_points_indexed = Column(Boolean, default=True, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # 关联关系
     learning_path = relationship("LearningPath", back_populates="interview_questions")
     statuses = relationship("QuestionStatus", back_populates="question", cascade="all, delete-orphan")
-
+    knowledge_point_links = relationship("QuestionKnowledgePoint", back_populates="question", cascade="all, delete-orphan")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from ..core.database import Base
 import datetime
 
@@ -13,7 +13,7 @@ class InterviewSession(Base):
     
     # 面试信息
     position = Column(String(100))  # 面试职位
-    status = Column(String(20), default="in_progress")  # in_progress, completed
+    status = Column(String(20), default="in_progress")  # in_progress, evaluating, completed, evaluation_failed
     
     # 对话历史（JSON 存储）
     conversation = Column(JSON, default=list)
@@ -21,10 +21,22 @@ class InterviewSession(Base):
     # 评价结果
     evaluation = Column(JSON, nullable=True)
     
+    # 评分冗余列（评价完成时写入，历史记录和趋势查询不必加载 JSON）
+    overall_score = Column(Integer, nullable=True, index=True)
+    technical_depth_score = Column(Integer, nullable=True)
+    expression_score = Column(Integer, nullable=True)
+    problem_solving_score = Column(Integer, nullable=True)
+    experience_score = Column(Integer, nullable=True)
+    
     # 时间记录
     started_at = Column(DateTime, default=datetime.datetime.utcnow)
     ended_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True, index=True)  # 评价完成时间
     duration_seconds = Column(Integer, nullable=True)
     
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    
+    __table_args__ = (
+        Index("idx_interview_sessions_user_status_created", "user_id", "status", "created_at"),
+    )
 
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+
+class KnowledgePoint(Base):
+    """知识点（按规范化名称去重）"""
+    __tablename__ = "knowledge_points"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    canonical_name = Column(String(200), nullable=False, unique=True, index=True)  # 规范化名称：NFKC、小写、合并空白
+    name = Column(String(200), nullable=False)  # 首次出现时的原始写法，用于展示
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # 关联关系
+    question_links = relationship("QuestionKnowledgePoint", back_populates="knowledge_point", cascade="all, delete-orphan")
+
+
+class QuestionKnowledgePoint(Base):
+    """面试题与知识点的关联（由 interview_questions.knowledge_points 派生）"""
+    __tablename__ = "question_knowledge_points"
+    
+    question_id = Column(Integer, ForeignKey("interview_questions.id", ondelete="CASCADE"), primary_key=True)
+    knowledge_point_id = Column(Integer, ForeignKey("knowledge_points.id", ondelete="CASCADE"), primary_key=True)
+    
+    # 关联关系
+    question = relationship("InterviewQuestion", back_populates="knowledge_point_links")
+    knowledge_point = relationship("KnowledgePoint", back_populates="question_links")
+    
+    # 按知识点反查题目
+    __table_args__ = (
+        Index('idx_question_knowledge_points_kp', 'knowledge_point_id', 'question_id'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, Boolean
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -11,11 +11,30 @@ class LearningPath(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     position = Column(String(200), nullable=False)
     job_description = Column(Text)
-    generated_content = Column(JSON)  # 存储完整的AI生成内容
+    generated_content = Column(JSON)  # 首次生成的思维导图等基础内容；按需生成的内容见 learning_path_sections
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # 异步生成任务：pending(排队中) -> calling_workflow(调用工作流) -> saving(保存中) -> completed / failed
+    generation_status = Column(String(20), default="completed", nullable=False, index=True)
+    generation_error = Column(Text)
+    generation_attempts = Column(Integer, default=0)
+    content_types = Column(JSON)  # 生成时请求的内容类型，任务恢复时使用
+    generation_claimed_at = Column(DateTime(timezone=True))  # 任务被领取的时间（租约）
+    
+    # 资源搜索关键词：生成时提取一次，keywords_digest 为提取时内容的摘要，内容变化后重新提取
+    keywords = Column(JSON)
+    keywords_digest = Column(String(64))
+    
+    # 旧版 generated_content 中的分区内容是否已迁移到分区表（新建的学习路线无需迁移）
+    sections_migrated = Column(Boolean, default=True, nullable=False)
+    
     # 关联关系
     user = relationship("User", back_populates="learning_paths")
     progress = relationship("LearningProgress", back_populates="learning_path", cascade="all, delete-orphan")
     interview_questions = relationship("InterviewQuestion", back_populates="learning_path", cascade="all, delete-orphan")
-
+    sections = relationship("LearningPathSection", back_populates="learning_path", cascade="all, delete-orphan")
+    
+    # 用户学习路线列表（按 id 倒序的游标分页）
+    __table_args__ = (
+        Index('idx_learning_paths_user', 'user_id', 'id'),
+    )
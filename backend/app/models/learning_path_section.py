@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+
+class LearningPathSection(Base):
+    """学习路线按需生成的内容，每种内容类型一行（knowledge, interview, courses, books, certifications）"""
+    __tablename__ = "learning_path_sections"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    learning_path_id = Column(Integer, ForeignKey("learning_paths.id", ondelete="CASCADE"), nullable=False)
+    content_type = Column(String(30), nullable=False)
+    content = Column(Text)  # AI生成的Markdown（资源类型为空，资源存放在 learning_path_resources）
+    generation_count = Column(Integer, default=0)  # 资源类型的"加载更多"次数（即已搜索的页数）
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # 关联关系
+    learning_path = relationship("LearningPath", back_populates="sections")
+    resources = relationship(
+        "LearningPathResource",
+        back_populates="section",
+        cascade="all, delete-orphan",
+        order_by="LearningPathResource.id"
+    )
+    
+    __table_args__ = (
+        UniqueConstraint('learning_path_id', 'content_type', name='uq_learning_path_sections_path_type'),
+    )
+
+
+class LearningPathResource(Base):
+    """推荐资源（只追加，按 id 保持推荐顺序，同一分区内按 URL 去重）"""
+    __tablename__ = "learning_path_resources"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    section_id = Column(Integer, ForeignKey("learning_path_sections.id", ondelete="CASCADE"), nullable=False)
+    url = Column(String(1000))
+    data = Column(JSON, nullable=False)  # 资源完整信息（标题、平台、封面等）
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # 关联关系
+    section = relationship("LearningPathSection", back_populates="resources")
+    
+    __table_args__ = (
+        UniqueConstraint('section_id', 'url', name='uq_learning_path_resources_section_url'),
+        Index('idx_learning_path_resources_section', 'section_id', 'id'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -20,6 +20,10 @@ class QuestionStatus(Base):
     status = Column(String(20), default="not_seen", nullable=False)
     last_reviewed_at = Column(DateTime(timezone=True))
     review_count = Column(Integer, default=0)
+    # 间隔复习（SM-2）调度
+    ease = Column(Float, default=2.5)  # 难度系数
+    interval_days = Column(Float, default=0)  # 当前复习间隔（天）
+    due_at = Column(DateTime(timezone=True))  # 下次复习时间，为空表示不在复习队列中
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -30,5 +34,9 @@ class QuestionStatus(Base):
     # 唯一约束：每个用户对每道题只能有一个状态记录
     __table_args__ = (
         UniqueConstraint('user_id', 'question_id', name='uq_user_question'),
+        # 错题本按最近复习时间游标分页
+        Index('idx_question_statuses_user_status_reviewed', 'user_id', 'status', 'last_reviewed_at', 'id'),
+        # 复习队列按到期时间取卡片
+        Index('idx_question_statuses_user_due', 'user_id', 'due_at'),
     )
 
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class SharedQuestion(Base):
+    """共享题库：同一职位的用户共用已生成并去重的面试题（不含用户数据）"""
+    __tablename__ = "shared_questions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    position_key = Column(String(200), nullable=False)  # 规范化后的职位指纹
+    position = Column(String(200), nullable=False)  # 首次入池时的原始职位名称
+    category_key = Column(String(100))  # 规范化后的题目类别
+    question = Column(Text, nullable=False)
+    question_hash = Column(String(64))  # 规范化题干的 SHA-256，同一职位内唯一
+    answer = Column(Text, nullable=False)
+    category = Column(String(100))
+    difficulty = Column(String(20), default="medium")
+    knowledge_points = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_shared_questions_position_category', 'position_key', 'category_key'),
+        Index('idx_shared_questions_position_difficulty', 'position_key', 'difficulty'),
+        Index('uq_shared_questions_position_question', 'position_key', 'question_hash', unique=True),
+    )
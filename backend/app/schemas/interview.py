@@ -23,12 +23,19 @@ class InterviewQuestionGenerate(BaseModel):
     count: int = Field(default=20, ge=1, le=100)
     category: Optional[str] = None
     based_on_weak_points: bool = False
+    use_shared_pool: bool = False  # 优先使用同职位的共享题库（模型只补齐缺少的题目）
 
 
 class QuestionStatusUpdate(BaseModel):
     """更新题目状态请求"""
     question_id: int
     status: QuestionStatusEnum
+    quality: Optional[int] = Field(default=None, ge=0, le=5)  # 复习评分（SM-2），不传时按状态取默认值
+
+
+class QuestionStatusBatchUpdate(BaseModel):
+    """批量更新题目状态请求（同一题目出现多次时以最后一次为准，复习次数按出现次数累加）"""
+    items: List[QuestionStatusUpdate] = Field(..., min_length=1, max_length=200)
 
 
 # 响应模型
@@ -76,6 +83,15 @@ class InterviewQuestionsListResponse(BaseModel):
     statistics: InterviewStatistics
     total: int
     has_more: bool
+    next_cursor: Optional[str] = None  # 游标分页时下一页的游标
+
+
+class InterviewSearchResponse(BaseModel):
+    """面试题检索响应（按相关度排序）"""
+    query: str
+    questions: List[InterviewQuestionResponse]
+    total: int
+    has_more: bool
 
 
 class GenerateQuestionsResponse(BaseModel):
@@ -85,3 +101,40 @@ class GenerateQuestionsResponse(BaseModel):
     questions: List[InterviewQuestionResponse]
     count: int
 
+
+class QuestionStatusResult(BaseModel):
+    """单道题目更新后的状态"""
+    question_id: int
+    status: QuestionStatusEnum
+    review_count: int
+    due_at: Optional[datetime] = None
+
+
+class QuestionStatusBatchResponse(BaseModel):
+    """批量更新题目状态响应"""
+    success: bool
+    message: str
+    statuses: List[QuestionStatusResult]
+
+
+class ReviewCard(InterviewQuestionResponse):
+    """复习卡片（面试题 + 调度信息）"""
+    due_at: datetime
+    ease: float
+    interval_days: float
+
+
+class ReviewQueueResponse(BaseModel):
+    """复习队列响应（按到期时间升序）"""
+    cards: List[ReviewCard]
+    has_more: bool
+
+
+class QuestionImportResponse(BaseModel):
+    """题库导入结果"""
+    success: bool
+    message: str
+    imported: int  # 新增题目数
+    duplicates: int  # 与题库或文件内其他题目近似重复而跳过的数量
+    invalid: int  # 无法解析或缺少题干/答案的行数
+    statuses: int  # 导入的刷题状态数
@@ -8,6 +8,7 @@ class LearningPathCreate(BaseModel):
     position: str
     job_description: str
     content_types: Optional[List[str]] = ['mindmap']  # 默认只生成思维导图
+    use_cache: bool = True  # 相同职位和JD优先复用已生成的结果，False 时强制重新生成
 
 
 class ContentGenerationRequest(BaseModel):
@@ -23,13 +24,45 @@ class LearningPathResponse(BaseModel):
     job_description: Optional[str] = None
     generated_content: Optional[Any] = None
     created_at: datetime
+    generation_status: str = "completed"  # pending / calling_workflow / saving / completed / failed
+    generation_error: Optional[str] = None
     
     class Config:
         from_attributes = True
 
 
+class LearningPathSummary(BaseModel):
+    """学习路线列表项（不含 generated_content；通过 fields 参数选择字段时只返回所选字段）"""
+    id: int
+    user_id: Optional[int] = None
+    position: Optional[str] = None
+    job_description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    generation_status: Optional[str] = None
+    generation_error: Optional[str] = None
+
+
 class LearningPathList(BaseModel):
     """学习路线列表"""
     total: int
-    items: List[LearningPathResponse]
+    items: List[LearningPathSummary]
+    has_more: bool = False
+    next_cursor: Optional[str] = None  # 游标分页时下一页的游标
+
+
+class GenerationJobResponse(BaseModel):
+    """学习路线生成任务状态"""
+    job_id: int  # 任务ID，即学习路线ID
+    learning_path_id: int
+    status: str  # pending / calling_workflow / saving / completed / failed
+    error: Optional[str] = None
+    attempts: int = 0
+    from_cache: bool = False  # 是否直接复用了缓存的生成结果
+
 
+class LearningPathSectionResponse(BaseModel):
+    """学习路线单个分区内容"""
+    content_type: str
+    content: Optional[Any] = None  # knowledge / interview 为Markdown，资源类型为资源列表
+    generation_count: int = 0  # 资源类型已加载的页数
+    updated_at: Optional[datetime] = None
@@ -4,11 +4,14 @@ AI助手的Custom Tools - 用于访问用户学习数据
 from langchain.tools import BaseTool
 from typing import Type, Optional, List, Dict, Any
 from pydantic import BaseModel, Field
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..models.question_status import QuestionStatus
 from ..models.interview_question import InterviewQuestion
 from ..models.learning_path import LearningPath
 from ..core.database import SessionLocal
+from .knowledge_point_index import knowledge_point_index
+from .learning_path_sections import learning_path_section_store
 
 
 # Tool Input Schemas (simplified - no user_id needed)
@@ -87,6 +90,7 @@ class GetLearningPathTool(BaseTool):
             if not paths:
                 return "用户还没有创建学习路线。"
             
+            generated_sections = learning_path_section_store.generated_types(db, [p.id for p in paths])
             result = f"用户的学习路线（最近{len(paths)}个）：\n\n"
             for i, path in enumerate(paths, 1):
                 result += f"{i}. **目标职位**: {path.position}\n"
@@ -94,16 +98,16 @@ class GetLearningPathTool(BaseTool):
                     result += f"   **职位描述**: {path.job_description[:100]}...\n"
                 
                 # 分析已生成的内容
-                if path.generated_content:
-                    content_types = []
-                    if path.generated_content.get('mindmap'):
-                        content_types.append('思维导图')
-                    if path.generated_content.get('knowledge'):
-                        content_types.append('知识点详解')
-                    if path.generated_content.get('interview'):
-                        content_types.append('面试题库')
-                    if content_types:
-                        result += f"   **已生成内容**: {', '.join(content_types)}\n"
+                content_types = []
+                if path.generated_content and path.generated_content.get('output'):
+                    content_types.append('思维导图')
+                section_types = generated_sections.get(path.id, [])
+                if 'knowledge' in section_types:
+                    content_types.append('知识点详解')
+                if 'interview' in section_types:
+                    content_types.append('面试题库')
+                if content_types:
+                    result += f"   **已生成内容**: {', '.join(content_types)}\n"
                 
                 result += f"   **创建时间**: {path.created_at.strftime('%Y-%m-%d')}\n\n"
             
@@ -177,45 +181,40 @@ class AnalyzeMistakesTool(BaseTool):
         """分析错题知识点分布"""
         db = SessionLocal()
         try:
-            # 获取所有错题
-            mistakes = db.query(QuestionStatus).filter(
+            # 总数与各项分布使用同一个关联题目表的查询，题目已删除的状态记录都不计入
+            mistakes = db.query(QuestionStatus).join(
+                InterviewQuestion, InterviewQuestion.id == QuestionStatus.question_id
+            ).filter(
                 QuestionStatus.user_id == self.user_id,
                 QuestionStatus.status == "not_mastered"
-            ).join(InterviewQuestion).all()
+            )
+            total_mistakes = mistakes.with_entities(func.count(QuestionStatus.id)).scalar() or 0
             
-            if not mistakes:
+            if not total_mistakes:
                 return "用户目前没有错题，无需分析。"
             
-            # 统计知识点分布
-            knowledge_points_count = {}
-            category_count = {}
-            difficulty_count = {}
+            # 知识点、分类、难度分布均由分组查询统计
+            sorted_kp = knowledge_point_index.top_weak_knowledge_points(db, self.user_id, limit=5)
             
-            for mistake in mistakes:
-                q = mistake.question
-                
-                # 统计知识点
-                if q.knowledge_points:
-                    for kp in q.knowledge_points:
-                        knowledge_points_count[kp] = knowledge_points_count.get(kp, 0) + 1
-                
-                # 统计分类
-                category = q.category or "未分类"
-                category_count[category] = category_count.get(category, 0) + 1
-                
-                # 统计难度
-                difficulty_count[q.difficulty] = difficulty_count.get(q.difficulty, 0) + 1
+            category = func.coalesce(InterviewQuestion.category, "未分类")
+            category_count = dict(
+                mistakes.with_entities(category, func.count(QuestionStatus.id)).group_by(category).all()
+            )
+            difficulty_count = dict(
+                mistakes.with_entities(
+                    InterviewQuestion.difficulty, func.count(QuestionStatus.id)
+                ).group_by(InterviewQuestion.difficulty).all()
+            )
             
             # 生成分析报告
             result = f"🔍 **错题深度分析报告**\n\n"
-            result += f"总错题数: {len(mistakes)}\n\n"
+            result += f"总错题数: {total_mistakes}\n\n"
             
             # Top薄弱知识点
-            if knowledge_points_count:
+            if sorted_kp:
                 result += "### 📌 薄弱知识点 Top 5\n\n"
-                sorted_kp = sorted(knowledge_points_count.items(), key=lambda x: x[1], reverse=True)[:5]
                 for i, (kp, count) in enumerate(sorted_kp, 1):
-                    percentage = count / len(mistakes) * 100
+                    percentage = count / total_mistakes * 100
                     result += f"{i}. **{kp}**: {count}道错题 ({percentage:.1f}%)\n"
                 result += "\n"
             
@@ -223,7 +222,7 @@ class AnalyzeMistakesTool(BaseTool):
             if category_count:
                 result += "### 📂 错题分类分布\n\n"
                 for category, count in sorted(category_count.items(), key=lambda x: x[1], reverse=True):
-                    percentage = count / len(mistakes) * 100
+                    percentage = count / total_mistakes * 100
                     result += f"- {category}: {count}道 ({percentage:.1f}%)\n"
                 result += "\n"
             
@@ -231,13 +230,13 @@ class AnalyzeMistakesTool(BaseTool):
             if difficulty_count:
                 result += "### 📊 错题难度分布\n\n"
                 for difficulty, count in sorted(difficulty_count.items(), key=lambda x: x[1], reverse=True):
-                    percentage = count / len(mistakes) * 100
+                    percentage = count / total_mistakes * 100
                     result += f"- {difficulty}: {count}道 ({percentage:.1f}%)\n"
                 result += "\n"
             
             # 学习建议
             result += "### 💡 学习建议\n\n"
-            if knowledge_points_count:
+            if sorted_kp:
                 top_weak = sorted_kp[0][0]
                 result += f"1. 重点复习「{top_weak}」相关知识点\n"
                 result += f"2. 建议针对薄弱点做专项练习\n"
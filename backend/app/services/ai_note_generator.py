@@ -12,6 +12,8 @@ from ..core.config import settings
 from ..models.learning_path import LearningPath
 from ..models.interview_question import InterviewQuestion
 from ..models.question_status import QuestionStatus
+from ..models.knowledge_point import KnowledgePoint, QuestionKnowledgePoint
+from .knowledge_point_index import knowledge_point_index
 from ..prompts.note_templates import build_prompt
 
 
@@ -279,48 +281,49 @@ class AINoteGenerator:
             func.count(InterviewQuestion.id).desc()
         ).limit(5).all()
         
-        result = {}
-        for category, count in weak_categories:
-            # 获取该分类下的具体知识点
-            questions = self.db.query(InterviewQuestion).join(
-                QuestionStatus,
-                (QuestionStatus.question_id == InterviewQuestion.id) &
-                (QuestionStatus.user_id == user_id)
-            ).filter(
-                InterviewQuestion.learning_path_id == learning_path_id,
-                InterviewQuestion.category == category,
-                QuestionStatus.status == 'not_mastered'
-            ).limit(3).all()
-            
-            # knowledge_points 是 JSON 字段，可能包含多个知识点
-            knowledge_points_list = []
-            for q in questions:
-                if q.knowledge_points:
-                    if isinstance(q.knowledge_points, list):
-                        knowledge_points_list.extend(q.knowledge_points)
-                    elif isinstance(q.knowledge_points, str):
-                        knowledge_points_list.append(q.knowledge_points)
-            result[category] = knowledge_points_list[:5]  # 最多5个
+        categories = [category for category, _ in weak_categories]
+        result = {category: [] for category in categories}
+        if not categories:
+            return result
+        
+        # 一次分组查询取出这些分类下未掌握题目的知识点，按出现次数排序
+        kp_count = func.count(QuestionKnowledgePoint.question_id)
+        rows = self.db.query(
+            InterviewQuestion.category,
+            KnowledgePoint.name,
+            kp_count
+        ).join(
+            QuestionStatus,
+            (QuestionStatus.question_id == InterviewQuestion.id) &
+            (QuestionStatus.user_id == user_id)
+        ).join(
+            QuestionKnowledgePoint,
+            QuestionKnowledgePoint.question_id == InterviewQuestion.id
+        ).join(
+            KnowledgePoint,
+            KnowledgePoint.id == QuestionKnowledgePoint.knowledge_point_id
+        ).filter(
+            InterviewQuestion.learning_path_id == learning_path_id,
+            InterviewQuestion.category.in_([c for c in categories if c is not None]),
+            QuestionStatus.status == 'not_mastered'
+        ).group_by(
+            InterviewQuestion.category, KnowledgePoint.id, KnowledgePoint.name
+        ).order_by(
+            kp_count.desc(), KnowledgePoint.name
+        ).all()
+        
+        for category, point, _ in rows:
+            if len(result[category]) < 5:  # 最多5个
+                result[category].append(point)
         
         return result
     
     def _analyze_interview_weak_points(self, questions: List[InterviewQuestion]) -> Dict[str, List[str]]:
-        """分析面试题知识点分布"""
-        result = {}
-        for q in questions:
-            category = q.category or "其他"
-            if category not in result:
-                result[category] = []
-            
-            # knowledge_points 是 JSON 字段，可能包含多个知识点
-            if q.knowledge_points:
-                if isinstance(q.knowledge_points, list):
-                    for kp in q.knowledge_points:
-                        if kp and kp not in result[category]:
-                            result[category].append(kp)
-                elif isinstance(q.knowledge_points, str):
-                    if q.knowledge_points not in result[category]:
-                        result[category].append(q.knowledge_points)
+        """分析面试题知识点分布（从知识点关联表查询）"""
+        result = {q.category or "其他": [] for q in questions}
+        result.update(
+            knowledge_point_index.knowledge_points_by_category(self.db, [q.id for q in questions])
+        )
         return result
     
     def _build_learning_progress(self, user_id: int, learning_path_id: int) -> str:
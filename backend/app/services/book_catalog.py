@@ -0,0 +1,110 @@
+"""
+预设技术书籍目录
+
+书籍数据保存在 app/data/books.json 中，首次使用时加载一次，构建为只读结构：
+- 书籍：id → 书籍字段（MappingProxyType）
+- 倒排索引：规范化的分类名 → 书籍 id（按文件中的顺序）
+- 分类匹配正则：一次扫描查询文本找出其中出现的分类名（长的优先）
+
+查找的开销与命中的书籍数成正比，与目录大小无关；同一组分类的排序结果固定，分页结果确定。
+"""
+import json
+import re
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from .resource_cache import normalize_query
+
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "books.json"
+
+
+class _CatalogData(NamedTuple):
+    books: Mapping[int, Mapping[str, Any]]
+    index: Mapping[str, Tuple[int, ...]]
+    categories: Tuple[str, ...]  # 按文件中首次出现的顺序
+    pattern: Optional["re.Pattern"]
+
+
+class BookCatalog:
+    """预设技术书籍目录（延迟加载，只读）"""
+
+    def __init__(self, path: Path = CATALOG_PATH):
+        self.path = path
+        self._data: Optional[_CatalogData] = None
+        self._lock = threading.Lock()
+
+    def _get_data(self) -> _CatalogData:
+        # 书籍搜索在线程池中执行，加载过程加锁
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._load()
+        return self._data
+
+    def _load(self) -> _CatalogData:
+        with open(self.path, encoding="utf-8") as f:
+            raw_books = json.load(f)["books"]
+
+        books: Dict[int, Mapping[str, Any]] = {}
+        index: Dict[str, List[int]] = {}
+        for raw in raw_books:
+            book_id = int(raw["id"])
+            if book_id in books:
+                raise ValueError(f"书籍目录中的 id 重复: {book_id}")
+            books[book_id] = MappingProxyType(
+                {k: v for k, v in raw.items() if k not in ("id", "categories")}
+            )
+            for category in raw.get("categories", []):
+                index.setdefault(normalize_query(category), []).append(book_id)
+
+        categories = tuple(index)
+        pattern = None
+        if categories:
+            alternatives = sorted(categories, key=len, reverse=True)
+            pattern = re.compile("|".join(re.escape(c) for c in alternatives))
+
+        print(f"[DEBUG] 书籍目录已加载: {len(books)} 本书，{len(categories)} 个分类")
+        return _CatalogData(
+            books=MappingProxyType(books),
+            index=MappingProxyType({k: tuple(v) for k, v in index.items()}),
+            categories=categories,
+            pattern=pattern,
+        )
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return self._get_data().categories
+
+    def lookup(self, category: str) -> Tuple[int, ...]:
+        """分类下的书籍 id"""
+        return self._get_data().index.get(normalize_query(category), ())
+
+    def match_categories(self, text: str) -> List[str]:
+        """查询文本中出现的分类名（按目录中的分类顺序）"""
+        data = self._get_data()
+        if data.pattern is None:
+            return []
+        found = {m.group(0) for m in data.pattern.finditer(normalize_query(text))}
+        return [c for c in data.categories if c in found]
+
+    def rank(self, categories: Sequence[str]) -> Tuple[int, ...]:
+        """按分类顺序合并书籍 id（去重），同一组分类总是得到相同的排序"""
+        seen = set()
+        ranked = []
+        for category in categories:
+            for book_id in self.lookup(category):
+                if book_id not in seen:
+                    seen.add(book_id)
+                    ranked.append(book_id)
+        return tuple(ranked)
+
+    def get_books(self, book_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """按 id 取书籍（返回可修改的副本）"""
+        books = self._get_data().books
+        return [dict(books[book_id]) for book_id in book_ids]
+
+
+# 单例实例
+book_catalog = BookCatalog()
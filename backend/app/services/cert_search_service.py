@@ -1,7 +1,7 @@
 """
 证书搜索服务 - 搜索职业认证证书
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from functools import lru_cache
 import openai
 import json
@@ -18,7 +18,7 @@ class CertSearchService:
             base_url=settings.OPENAI_BASE_URL
         )
     
-    def _ai_match_categories(self, keywords: str) -> List[str]:
+    def _ai_match_categories(self, keywords: str) -> Tuple[List[str], bool]:
         """
         使用AI智能分析关键词应该匹配哪些证书分类
         
@@ -26,7 +26,7 @@ class CertSearchService:
             keywords: 搜索关键词（如"AI工程师"、"Java工程师"等）
             
         Returns:
-            匹配的证书分类列表
+            (匹配的证书分类列表, AI调用是否成功)
         """
         available_categories = ['ai', 'java', 'python', 'aws', '数据库', '项目管理']
         
@@ -68,7 +68,7 @@ class CertSearchService:
             valid_categories = [cat for cat in categories if cat in available_categories]
             
             print(f"[DEBUG] AI推荐的证书分类: {valid_categories}")
-            return valid_categories
+            return valid_categories, True
             
         except Exception as e:
             print(f"[ERROR] AI匹配证书分类失败: {e}")
@@ -77,9 +77,9 @@ class CertSearchService:
             for cat in available_categories:
                 if cat in keywords_lower:
                     matched.append(cat)
-            return matched if matched else ['python']
+            return (matched if matched else ['python']), False
     
-    def _ai_generate_certifications(self, keywords: str) -> List[Dict[str, Any]]:
+    def _ai_generate_certifications(self, keywords: str) -> Tuple[List[Dict[str, Any]], bool]:
         """
         使用AI生成证书推荐（当数据库没有匹配时）
         
@@ -87,7 +87,7 @@ class CertSearchService:
             keywords: 搜索关键词
             
         Returns:
-            AI生成的证书列表
+            (AI生成的证书列表, AI调用是否成功)，失败时返回搜索链接
         """
         import time
         
@@ -144,7 +144,7 @@ class CertSearchService:
             certs = result.get('certifications', [])
             
             print(f"[DEBUG] AI生成了 {len(certs)} 个证书")
-            return certs
+            return certs, True
             
         except Exception as e:
             print(f"[ERROR] AI生成证书失败: {e}")
@@ -157,14 +157,14 @@ class CertSearchService:
                     'level': '各级别',
                     'validity': '查看详情',
                 }
-            ]
+            ], False
     
     def search_certifications(
         self, 
         keywords: str, 
         limit: int = 3,
         page: int = 1
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[List[Dict[str, Any]], bool]:
         """
         搜索职业认证证书
         
@@ -174,7 +174,7 @@ class CertSearchService:
             page: 页码（从1开始）
             
         Returns:
-            证书列表
+            (证书列表, 是否成功)；AI调用失败时结果中含降级的备选内容，返回 False
         """
         print(f"[DEBUG] 搜索职业证书: {keywords}, 页码: {page}")
         
@@ -288,7 +288,7 @@ class CertSearchService:
         
         # 使用AI智能匹配证书分类
         print(f"[DEBUG] 调用AI智能匹配证书分类: {keywords}")
-        matched_categories = self._ai_match_categories(keywords)
+        matched_categories, ok = self._ai_match_categories(keywords)
         
         # 根据AI推荐的分类查找证书
         all_matched_certs = []
@@ -310,7 +310,8 @@ class CertSearchService:
         # 如果还是没有匹配到，使用AI生成证书推荐
         if not all_matched_certs:
             print(f"[DEBUG] 数据库无匹配，调用AI生成证书推荐")
-            all_matched_certs = self._ai_generate_certifications(keywords)
+            all_matched_certs, ai_ok = self._ai_generate_certifications(keywords)
+            ok = ok and ai_ok
         
         # 根据页码返回不同的证书子集
         start_idx = (page - 1) * limit
@@ -319,9 +320,9 @@ class CertSearchService:
         # 如果数据库证书已经用完，调用AI生成新证书
         if start_idx >= len(all_matched_certs):
             print(f"[DEBUG] 数据库证书已耗尽（共{len(all_matched_certs)}个，请求索引{start_idx}），调用AI生成新证书")
-            ai_certs = self._ai_generate_certifications(keywords)
+            ai_certs, ai_ok = self._ai_generate_certifications(keywords)
             print(f"[DEBUG] AI生成了 {len(ai_certs)} 个新证书")
-            return ai_certs
+            return ai_certs, ok and ai_ok
         
         matched_certs = all_matched_certs[start_idx:end_idx]
         
@@ -332,12 +333,13 @@ class CertSearchService:
                 matched_certs.extend(all_matched_certs[end_idx:end_idx + remaining_from_db])
             else:
                 print(f"[DEBUG] 数据库剩余证书不足，调用AI生成 {remaining_from_db} 个补充")
-                ai_certs = self._ai_generate_certifications(keywords)
+                ai_certs, ai_ok = self._ai_generate_certifications(keywords)
+                ok = ok and ai_ok
                 matched_certs.extend(ai_certs[:remaining_from_db])
         
         print(f"[DEBUG] 证书库共 {len(all_matched_certs)} 个，返回索引 {start_idx}-{end_idx}，实际 {len(matched_certs)} 个")
         
-        return matched_certs
+        return matched_certs, ok
 
 
 # 单例实例
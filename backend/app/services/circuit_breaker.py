@@ -0,0 +1,204 @@
+"""
+外部平台熔断器
+
+每个平台一个熔断器，按最近 window_size 次调用统计失败率和慢调用率：
+- closed：正常请求；最近调用数达到 minimum_calls 且失败率或慢调用率超过阈值时打开
+- open：不再请求该平台，直接返回备选结果；open_seconds 后转为 half_open
+- half_open：放行 half_open_max_calls 个探测请求，全部成功则关闭，任一失败或过慢则重新打开
+
+同时记录每个平台的耗时直方图，供管理后台的系统状态接口展示。
+熔断器只在事件循环中使用，不需要加锁。
+
+配置项（config.json → resource_search.circuit_breaker）：
+- failure_rate_threshold：失败率阈值（0-1）
+- slow_call_threshold：超过该耗时（秒）的调用视为慢调用
+- slow_call_rate_threshold：慢调用率阈值（0-1）
+- window_size / minimum_calls：统计窗口大小与最少调用数
+- open_seconds：打开后多久开始探测
+- half_open_max_calls：半开状态的探测请求数
+"""
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from ..core.config_manager import config
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 耗时直方图的桶上界（秒），最后一个桶统计超过最大上界的调用
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """固定桶的耗时直方图"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.total,
+            "sum": round(self.sum, 3),
+        }
+
+
+class CircuitBreaker:
+    """单个平台的熔断器"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_threshold: float = 3.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.latency = LatencyHistogram()
+        # 最近调用：(是否失败, 是否过慢)
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes = 0  # 半开状态已放行、尚未返回的探测请求
+        self._probe_successes = 0
+        self._open_count = 0  # 打开次数（本进程启动以来）
+
+    def allow(self) -> bool:
+        """是否允许请求平台；返回 True 后必须调用 record（调用被取消时调用 release）"""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+            print(f"[DEBUG] {self.name} 熔断器进入半开状态，开始探测")
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                return False
+            self._probes += 1
+        return True
+
+    def release(self) -> None:
+        """放弃一次已放行的调用（调用方取消），不计入统计"""
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+
+    def record(self, success: bool, seconds: float) -> None:
+        """记录一次调用的结果和耗时"""
+        self.latency.observe(seconds)
+        slow = seconds > self.slow_call_threshold
+
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+            if not success or slow:
+                self._open("探测失败" if not success else f"探测耗时 {seconds:.2f}s")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self.state = CLOSED
+                self._window.clear()
+                print(f"[DEBUG] {self.name} 熔断器已关闭")
+            return
+
+        if self.state == OPEN:
+            # 打开前已发出的请求，结果不再影响状态
+            return
+
+        self._window.append((not success, slow))
+        if len(self._window) < self.minimum_calls:
+            return
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.failure_rate_threshold:
+            self._open(f"失败率 {failure_rate:.0%}")
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._open(f"慢调用率 {slow_rate:.0%}")
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._window:
+            return 0.0, 0.0
+        calls = len(self._window)
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / calls, slow / calls
+
+    def _open(self, reason: str) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._open_count += 1
+        self._window.clear()
+        print(f"[WARN] {self.name} 熔断器打开（{reason}），{self.open_seconds:.0f}s 内直接使用备选结果")
+
+    def snapshot(self) -> Dict[str, Any]:
+        failure_rate, slow_rate = self._rates()
+        retry_after: Optional[float] = None
+        if self.state == OPEN:
+            retry_after = round(max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0), 1)
+        return {
+            "platform": self.name,
+            "state": self.state,
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "window_calls": len(self._window),
+            "open_count": self._open_count,
+            "retry_after": retry_after,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class CircuitBreakerRegistry:
+    """按平台名管理熔断器，首次使用时按配置创建"""
+
+    def __init__(self):
+        settings = (config.get('resource_search', {}) or {}).get('circuit_breaker') or {}
+        self.settings = {
+            'failure_rate_threshold': float(settings.get('failure_rate_threshold', 0.5)),
+            'slow_call_threshold': float(settings.get('slow_call_threshold', 3.0)),
+            'slow_call_rate_threshold': float(settings.get('slow_call_rate_threshold', 0.8)),
+            'window_size': int(settings.get('window_size', 20)),
+            'minimum_calls': int(settings.get('minimum_calls', 5)),
+            'open_seconds': float(settings.get('open_seconds', 30)),
+            'half_open_max_calls': int(settings.get('half_open_max_calls', 1)),
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **self.settings)
+            self._breakers[name] = breaker
+        return breaker
+
+    def snapshot(self, names: List[str]) -> List[Dict[str, Any]]:
+        return [self.get(name).snapshot() for name in names]
+
+
+# 单例实例
+platform_breakers = CircuitBreakerRegistry()
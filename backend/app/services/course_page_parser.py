@@ -0,0 +1,168 @@
+"""
+课程搜索结果页解析
+
+慕课网搜索页只需要其中的课程卡片：先用正则定位第一个 .course-card-container，
+只解析从这里开始的片段（跳过 <head> 中的脚本样式和导航栏），再按卡片提取字段。
+
+解析后端可配置（config.json → resource_search.html_parser）：
+- lxml：lxml.html + 预编译 XPath（默认，lxml 已在 requirements 中）
+- selectolax：需要另外安装 selectolax，未安装时回退为 lxml
+- bs4：BeautifulSoup + html.parser，用 SoupStrainer 只构建课程卡片
+
+解析是纯 CPU 操作，由 CourseSearchService 放到线程池中执行，不阻塞事件循环。
+"""
+import re
+from typing import Callable, Dict, List, NamedTuple
+
+
+IMOOC_CARD_CLASS = "course-card-container"
+
+# 第一个课程卡片的开始标签（class 中可能还有其他类名）
+_IMOOC_CARD_START = re.compile(
+    r'<[a-zA-Z][^>]*\bclass\s*=\s*["\'][^"\']*\b' + IMOOC_CARD_CLASS + r'\b',
+    re.IGNORECASE
+)
+
+
+class CourseCard(NamedTuple):
+    """从搜索结果页解析出的课程卡片（原始字段）"""
+    title: str
+    href: str
+    cover: str
+    price: str
+
+
+# 解析函数：(页面HTML, 最多返回的卡片数) -> 课程卡片列表
+CardParser = Callable[[str, int], List[CourseCard]]
+
+
+def _result_region(html: str) -> str:
+    """截取从第一个课程卡片开始的片段，没有卡片时返回空字符串"""
+    match = _IMOOC_CARD_START.search(html)
+    return html[match.start():] if match else ""
+
+
+def _class_xpath(class_name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+_lxml_xpaths = None
+
+
+def _get_lxml_xpaths():
+    global _lxml_xpaths
+    if _lxml_xpaths is None:
+        from lxml import etree
+        _lxml_xpaths = {
+            "cards": etree.XPath(f"//*[{_class_xpath(IMOOC_CARD_CLASS)}]"),
+            "title": etree.XPath(f".//*[{_class_xpath('course-card-name')}]"),
+            "link": etree.XPath(".//a"),
+            "cover": etree.XPath(f".//*[{_class_xpath('course-card-top')}]//img"),
+            "price": etree.XPath(f".//*[{_class_xpath('course-card-price')}]"),
+        }
+    return _lxml_xpaths
+
+
+def parse_imooc_lxml(html: str, limit: int) -> List[CourseCard]:
+    from lxml import html as lxml_html
+
+    region = _result_region(html)
+    if not region:
+        return []
+
+    xpaths = _get_lxml_xpaths()
+    root = lxml_html.fromstring(region)
+    cards = []
+    for item in xpaths["cards"](root)[:limit]:
+        title = xpaths["title"](item)
+        link = xpaths["link"](item)
+        if not title or not link:
+            continue
+        cover = xpaths["cover"](item)
+        price = xpaths["price"](item)
+        cards.append(CourseCard(
+            title=title[0].text_content().strip(),
+            href=link[0].get("href", ""),
+            cover=cover[0].get("src", "") if cover else "",
+            price=price[0].text_content().strip() if price else "",
+        ))
+    return cards
+
+
+def parse_imooc_selectolax(html: str, limit: int) -> List[CourseCard]:
+    from selectolax.parser import HTMLParser
+
+    region = _result_region(html)
+    if not region:
+        return []
+
+    cards = []
+    for item in HTMLParser(region).css(f".{IMOOC_CARD_CLASS}")[:limit]:
+        title = item.css_first(".course-card-name")
+        link = item.css_first("a")
+        if title is None or link is None:
+            continue
+        cover = item.css_first(".course-card-top img")
+        price = item.css_first(".course-card-price")
+        cards.append(CourseCard(
+            title=title.text().strip(),
+            href=link.attributes.get("href") or "",
+            cover=(cover.attributes.get("src") or "") if cover is not None else "",
+            price=price.text().strip() if price is not None else "",
+        ))
+    return cards
+
+
+def parse_imooc_bs4(html: str, limit: int) -> List[CourseCard]:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    region = _result_region(html)
+    if not region:
+        return []
+
+    # 构建阶段 class 还是未拆分的字符串，需要按空白拆分后判断
+    strainer = SoupStrainer(class_=lambda value: bool(value) and IMOOC_CARD_CLASS in value.split())
+    soup = BeautifulSoup(region, "html.parser", parse_only=strainer)
+    cards = []
+    for item in soup.select(f".{IMOOC_CARD_CLASS}")[:limit]:
+        title = item.select_one(".course-card-name")
+        link = item.select_one("a")
+        if not title or not link:
+            continue
+        cover = item.select_one(".course-card-top img")
+        price = item.select_one(".course-card-price")
+        cards.append(CourseCard(
+            title=title.text.strip(),
+            href=link.get("href", ""),
+            cover=cover.get("src", "") if cover else "",
+            price=price.text.strip() if price else "",
+        ))
+    return cards
+
+
+# 解析后端及其依赖的模块
+IMOOC_PARSERS: Dict[str, CardParser] = {
+    "lxml": parse_imooc_lxml,
+    "selectolax": parse_imooc_selectolax,
+    "bs4": parse_imooc_bs4,
+}
+_BACKEND_MODULES = {"lxml": "lxml", "selectolax": "selectolax", "bs4": "bs4"}
+
+
+def resolve_imooc_parser(name: str) -> CardParser:
+    """
+    按名称获取解析函数；未知名称或依赖未安装时依次回退为 lxml、bs4
+    """
+    for candidate in (name, "lxml", "bs4"):
+        if candidate not in IMOOC_PARSERS:
+            print(f"[WARN] 未知的HTML解析后端: {candidate}")
+            continue
+        try:
+            __import__(_BACKEND_MODULES[candidate])
+        except ImportError:
+            print(f"[WARN] 未安装 {_BACKEND_MODULES[candidate]}，无法使用 {candidate} 解析后端")
+            continue
+        if candidate != name:
+            print(f"[WARN] HTML解析后端回退为 {candidate}")
+        return IMOOC_PARSERS[candidate]
+    raise RuntimeError("没有可用的HTML解析后端")
@@ -1,28 +1,145 @@
 """
 课程搜索服务 - 搜索B站、慕课网、极客时间等平台的课程
+
+各平台请求使用共享的 httpx.AsyncClient 并发执行；每个平台有独立超时，超时或失败的平台
+返回备选结果，不影响其他平台。同一主机的请求由 HostRateLimiter 控制最小间隔（异步等待，不阻塞事件循环），
+限速排队与平台请求共用该平台的超时时间（排到的时间槽已超时则直接返回备选结果），
+但本地排队时间不计入熔断器的耗时统计。
+每个平台有独立的熔断器（circuit_breaker.platform_breakers），平台持续失败或过慢时直接返回备选结果。
+抓取的页面在线程池中解析（course_page_parser），并发搜索不会在事件循环上排队等待 CPU。
 """
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
-import re
+import asyncio
 import time
-from functools import lru_cache
-import json
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, NamedTuple, Optional
+from urllib.parse import urlsplit
+import re
+from ..core.config_manager import config
+from .circuit_breaker import platform_breakers
+from .course_page_parser import CardParser, resolve_imooc_parser
+
+
+# 各平台的默认超时（秒），可在 config.json → resource_search.platform_timeouts 中覆盖
+DEFAULT_PLATFORM_TIMEOUTS = {'bilibili': 5.0, 'imooc': 6.0, 'geekbang': 2.0}
+# 各平台每次返回的课程数
+PLATFORM_LIMITS = {'bilibili': 5, 'imooc': 3, 'geekbang': 2}
+# 各平台的搜索地址（极客时间需要登录，不发请求）
+PLATFORM_SEARCH_URLS = {
+    'bilibili': "https://api.bilibili.com/x/web-interface/wbi/search/type",
+    'imooc': "https://www.imooc.com/search/",
+}
+
+
+class PlatformSearchError(Exception):
+    """平台搜索失败（请求失败、接口返回错误或页面无法解析），由 search_platform 转为备选结果"""
+
+
+class PlatformResult(NamedTuple):
+    """单个平台的搜索结果"""
+    courses: List[Dict[str, Any]]
+    ok: bool  # False 表示平台失败或超时，courses 为备选结果
+
+
+class HostRateLimiter:
+    """
+    按主机限制请求间隔
+
+    每次调用预约该主机的下一个时间槽，需要等待时用 asyncio.sleep 让出事件循环。
+    预约在同一事件循环内完成且中间没有 await，不需要加锁。等待中被取消时，
+    如果之后没有新的预约，归还该时间槽。
+    """
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+    
+    async def wait(self, url: str, deadline: Optional[float] = None) -> Optional[float]:
+        """
+        等待该主机的下一个时间槽
+
+        Returns:
+            排队等待的秒数；时间槽晚于 deadline（time.monotonic 时间）时不预约，立即返回 None
+        """
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        if deadline is not None and slot > deadline:
+            return None
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            try:
+                await asyncio.sleep(slot - now)
+            except asyncio.CancelledError:
+                if self._next_slot.get(host) == slot + self.min_interval:
+                    self._next_slot[host] = slot
+                raise
+        return slot - now
 
 
 class CourseSearchService:
     """课程搜索服务"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        search_config = config.get('resource_search', {}) or {}
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-        })
+        }
         self.timeout = 10
+        self.platform_timeouts = {
+            **DEFAULT_PLATFORM_TIMEOUTS,
+            **(search_config.get('platform_timeouts') or {})
+        }
+        self.rate_limiter = HostRateLimiter(float(search_config.get('min_request_interval', 0.5)))
+        self.imooc_parser = resolve_imooc_parser(search_config.get('html_parser', 'lxml'))
+        self.parser_workers = int(search_config.get('parser_workers', 2))
+        
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._parser_pool: Optional[ThreadPoolExecutor] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取共享客户端（首次使用时在当前事件循环中创建）"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self) -> None:
+        """关闭共享客户端和解析线程池（应用关闭时调用）"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+        if self._parser_pool is not None:
+            self._parser_pool.shutdown(wait=False)
+            self._parser_pool = None
     
-    def search_bilibili_courses(
+    async def _parse(self, parser: CardParser, html: str, limit: int):
+        """在解析线程池中解析页面"""
+        if self._parser_pool is None:
+            self._parser_pool = ThreadPoolExecutor(
+                max_workers=self.parser_workers,
+                thread_name_prefix="course-parser"
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._parser_pool, parser, html, limit)
+    
+    async def _get(self, platform: str, url: str, params: Dict[str, Any] = None) -> httpx.Response:
+        """发起 GET 请求，超时取该平台的配置（限速等待由 search_platform 在计时前完成）"""
+        return await self._get_client().get(
+            url,
+            params=params,
+            timeout=self.platform_timeouts.get(platform, self.timeout)
+        )
+    
+    async def search_bilibili_courses(
         self, 
         keywords: str, 
         limit: int = 10,
@@ -38,6 +155,9 @@ class CourseSearchService:
             
         Returns:
             课程列表
+            
+        Raises:
+            PlatformSearchError: 请求失败或接口返回错误
         """
         print(f"[DEBUG] 搜索B站课程: {keywords}, 页码: {page}")
         
@@ -52,7 +172,7 @@ class CourseSearchService:
             print(f"[DEBUG] B站搜索策略: 排序={order}, 时长筛选={duration}")
             
             # B站搜索API（视频搜索）
-            search_url = "https://api.bilibili.com/x/web-interface/wbi/search/type"
+            search_url = PLATFORM_SEARCH_URLS['bilibili']
             params = {
                 'keyword': f'{keywords}',  # 不再固定加"教程"，让dynamic_resource_service控制
                 'search_type': 'video',
@@ -62,17 +182,15 @@ class CourseSearchService:
                 'duration': duration,
             }
             
-            response = self.session.get(search_url, params=params, timeout=self.timeout)
+            response = await self._get('bilibili', search_url, params=params)
             
             if response.status_code != 200:
-                print(f"[WARN] B站搜索请求失败: {response.status_code}")
-                return self._get_bilibili_fallback_results(keywords, limit)
+                raise PlatformSearchError(f"B站搜索请求失败: {response.status_code}")
             
             data = response.json()
             
             if data.get('code') != 0:
-                print(f"[WARN] B站API返回错误: {data.get('message')}")
-                return self._get_bilibili_fallback_results(keywords, limit)
+                raise PlatformSearchError(f"B站API返回错误: {data.get('message')}")
             
             results = data.get('data', {}).get('result', [])
             
@@ -100,9 +218,10 @@ class CourseSearchService:
             print(f"[DEBUG] B站搜索成功，找到 {len(courses)} 个结果")
             return courses
             
+        except PlatformSearchError:
+            raise
         except Exception as e:
-            print(f"[ERROR] B站搜索异常: {e}")
-            return self._get_bilibili_fallback_results(keywords, limit)
+            raise PlatformSearchError(f"B站搜索异常: {e}") from e
     
     def _get_bilibili_fallback_results(self, keywords: str, limit: int) -> List[Dict]:
         """B站搜索失败时的备选结果（预设优质课程）"""
@@ -121,7 +240,7 @@ class CourseSearchService:
         ]
         return fallback_courses[:limit]
     
-    def search_imooc_courses(
+    async def search_imooc_courses(
         self, 
         keywords: str, 
         limit: int = 5,
@@ -136,57 +255,49 @@ class CourseSearchService:
             
         Returns:
             课程列表
+            
+        Raises:
+            PlatformSearchError: 请求失败或页面中没有解析到课程
         """
         print(f"[DEBUG] 搜索慕课网课程: {keywords}")
         
         try:
             # 慕课网搜索页面
-            search_url = f"https://www.imooc.com/search/?words={keywords}"
+            search_url = PLATFORM_SEARCH_URLS['imooc']
             
-            response = self.session.get(search_url, timeout=self.timeout)
+            response = await self._get('imooc', search_url, params={'words': keywords})
             
             if response.status_code != 200:
-                return self._get_imooc_fallback_results(keywords, limit)
+                raise PlatformSearchError(f"慕课网搜索请求失败: {response.status_code}")
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # 只解析课程卡片所在的片段，在线程池中执行
+            cards = await self._parse(self.imooc_parser, response.text, limit)
             
-            courses = []
-            # 查找课程卡片
-            course_items = soup.select('.course-card-container')[:limit]
+            courses = [
+                {
+                    'title': card.title,
+                    'url': 'https://www.imooc.com' + card.href,
+                    'cover': card.cover,
+                    'platform': 'imooc',
+                    'author': '慕课网',
+                    'views': card.price or '查看详情',
+                    'description': f'{keywords}相关课程',
+                    'duration': None,
+                    'rating': None,
+                }
+                for card in cards
+            ]
             
-            for item in course_items:
-                try:
-                    title_elem = item.select_one('.course-card-name')
-                    url_elem = item.select_one('a')
-                    cover_elem = item.select_one('.course-card-top img')
-                    price_elem = item.select_one('.course-card-price')
-                    
-                    if title_elem and url_elem:
-                        course = {
-                            'title': title_elem.text.strip(),
-                            'url': 'https://www.imooc.com' + url_elem.get('href', ''),
-                            'cover': cover_elem.get('src', '') if cover_elem else '',
-                            'platform': 'imooc',
-                            'author': '慕课网',
-                            'views': price_elem.text.strip() if price_elem else '查看详情',
-                            'description': f'{keywords}相关课程',
-                            'duration': None,
-                            'rating': None,
-                        }
-                        courses.append(course)
-                except Exception as e:
-                    print(f"[WARN] 解析慕课网课程失败: {e}")
-                    continue
+            if not courses:
+                raise PlatformSearchError("慕课网页面中没有解析到课程")
             
-            if courses:
-                print(f"[DEBUG] 慕课网搜索成功，找到 {len(courses)} 个结果")
-                return courses
-            else:
-                return self._get_imooc_fallback_results(keywords, limit)
+            print(f"[DEBUG] 慕课网搜索成功，找到 {len(courses)} 个结果")
+            return courses
             
+        except PlatformSearchError:
+            raise
         except Exception as e:
-            print(f"[ERROR] 慕课网搜索异常: {e}")
-            return self._get_imooc_fallback_results(keywords, limit)
+            raise PlatformSearchError(f"慕课网搜索异常: {e}") from e
     
     def _get_imooc_fallback_results(self, keywords: str, limit: int) -> List[Dict]:
         """慕课网搜索失败时的备选结果"""
@@ -205,7 +316,7 @@ class CourseSearchService:
         ]
         return fallback_courses[:limit]
     
-    def search_geekbang_courses(
+    async def search_geekbang_courses(
         self, 
         keywords: str, 
         limit: int = 3,
@@ -243,37 +354,92 @@ class CourseSearchService:
         ]
         return fallback_courses[:limit]
     
-    def search_all_courses(
+    async def search_platform(self, platform: str, keywords: str, limit: int, page: int = 1) -> PlatformResult:
+        """
+        搜索单个平台，失败或超过该平台的超时时间时返回备选结果（ok=False）
+        """
+        searchers = {
+            'bilibili': (self.search_bilibili_courses, self._get_bilibili_fallback_results),
+            'imooc': (self.search_imooc_courses, self._get_imooc_fallback_results),
+            'geekbang': (self.search_geekbang_courses, self._get_geekbang_fallback_results),
+        }
+        if platform not in searchers:
+            return PlatformResult([], True)
+        
+        search, fallback = searchers[platform]
+        breaker = platform_breakers.get(platform)
+        if not breaker.allow():
+            print(f"[DEBUG] {platform} 熔断中，直接使用备选结果")
+            return PlatformResult(fallback(keywords, limit), False)
+        
+        timeout = self.platform_timeouts.get(platform, self.timeout)
+        # 限速排队和平台请求共用一个截止时间，整体耗时不超过该平台的超时时间
+        deadline = time.monotonic() + timeout
+        queued = 0.0
+        try:
+            if platform in PLATFORM_SEARCH_URLS:
+                queued = await self.rate_limiter.wait(PLATFORM_SEARCH_URLS[platform], deadline)
+                if queued is None:
+                    # 本地排队过长，不是平台的问题，不计入熔断器
+                    print(f"[WARN] {platform} 限速排队超过 {timeout}s，使用备选结果")
+                    breaker.release()
+                    return PlatformResult(fallback(keywords, limit), False)
+            # 熔断器只统计平台请求和解析的耗时，不含本地排队
+            started = time.monotonic()
+            courses = await asyncio.wait_for(search(keywords=keywords, limit=limit, page=page), timeout=deadline - started)
+        except asyncio.TimeoutError:
+            print(f"[WARN] {platform} 搜索超过 {timeout}s，使用备选结果")
+            if queued > 0:
+                # 排队占用了部分超时时间，平台未必过慢，不计入熔断器
+                breaker.release()
+                return PlatformResult(fallback(keywords, limit), False)
+        except PlatformSearchError as e:
+            print(f"[WARN] {e}，使用备选结果")
+        except asyncio.CancelledError:
+            # 调用方取消（如客户端断开），不是平台的失败，只归还熔断器的放行名额
+            breaker.release()
+            raise
+        else:
+            breaker.record(True, time.monotonic() - started)
+            return PlatformResult(courses, True)
+        breaker.record(False, time.monotonic() - started)
+        return PlatformResult(fallback(keywords, limit), False)
+    
+    def platform_health(self) -> List[Dict[str, Any]]:
+        """各平台的熔断器状态和耗时直方图"""
+        return platform_breakers.snapshot(list(PLATFORM_LIMITS))
+    
+    async def search_all_courses(
         self, 
         keywords: str,
-        platforms: List[str] = ['bilibili', 'imooc', 'geekbang']
+        platforms: List[str] = ['bilibili', 'imooc', 'geekbang'],
+        page: int = 1,
+        limits: Optional[Dict[str, int]] = None
     ) -> List[Dict[str, Any]]:
         """
-        搜索所有平台的课程
+        并发搜索所有平台的课程
         
         Args:
             keywords: 搜索关键词
             platforms: 平台列表
+            page: 页码（从1开始）
+            limits: 各平台返回数量，默认 PLATFORM_LIMITS
             
         Returns:
-            所有平台的课程列表
+            所有平台的课程列表（按 platforms 顺序合并；个别平台失败不影响其他平台）
         """
-        all_courses = []
-        
-        if 'bilibili' in platforms:
-            bilibili_courses = self.search_bilibili_courses(keywords, limit=10)
-            all_courses.extend(bilibili_courses)
-            time.sleep(0.5)  # 避免请求过快
-        
-        if 'imooc' in platforms:
-            imooc_courses = self.search_imooc_courses(keywords, limit=5)
-            all_courses.extend(imooc_courses)
-            time.sleep(0.5)
-        
-        if 'geekbang' in platforms:
-            geekbang_courses = self.search_geekbang_courses(keywords, limit=3)
-            all_courses.extend(geekbang_courses)
+        limits = {**PLATFORM_LIMITS, **(limits or {})}
+        results = await asyncio.gather(
+            *(self.search_platform(platform, keywords, limits.get(platform, 3), page) for platform in platforms),
+            return_exceptions=True
+        )
         
+        all_courses = []
+        for platform, result in zip(platforms, results):
+            if isinstance(result, Exception):
+                print(f"[ERROR] {platform} 搜索失败: {result}")
+                continue
+            all_courses.extend(result.courses)
         return all_courses
     
     def _clean_html(self, html_text: str) -> str:
@@ -1,10 +1,17 @@
 """
 动态资源搜索服务 - 统一资源搜索接口
+
+搜索结果按（平台, 查询, 页码）缓存在 resource_cache 中，所有用户共享。
+返回第 N 页后可调用 prefetch 在后台预取第 N+1 页，下次"加载更多"直接命中缓存；
+预取队列有界，队列满时丢弃新的预取请求，由固定数量的后台任务依次执行。
 """
-from typing import List, Dict, Any
-from .course_search_service import course_search_service
+import asyncio
+from typing import List, Dict, Any, Optional, Set, Tuple
+from ..core.config_manager import config
+from .course_search_service import course_search_service, PLATFORM_LIMITS
 from .book_search_service import book_search_service
 from .cert_search_service import cert_search_service
+from .resource_cache import resource_cache
 
 
 class DynamicResourceService:
@@ -14,15 +21,25 @@ class DynamicResourceService:
         self.course_searcher = course_search_service
         self.book_searcher = book_search_service
         self.cert_searcher = cert_search_service
+        
+        search_config = config.get('resource_search', {}) or {}
+        self.prefetch_enabled = bool(search_config.get('prefetch_enabled', True))
+        self.prefetch_queue_size = int(search_config.get('prefetch_queue_size', 20))
+        self.prefetch_workers = int(search_config.get('prefetch_workers', 2))
+        
+        self._prefetch_queue: Optional[asyncio.Queue] = None
+        self._prefetch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prefetch_tasks: List[asyncio.Task] = []
+        self._prefetch_pending: Set[Tuple[str, Tuple[str, ...], int]] = set()
     
-    def search_courses(
+    async def search_courses(
         self, 
         keywords: List[str], 
         platforms: List[str] = ['bilibili', 'imooc', 'geekbang'],
         page: int = 1
     ) -> List[Dict[str, Any]]:
         """
-        搜索课程
+        搜索课程（各平台并发请求）
         
         Args:
             keywords: 关键词列表
@@ -51,38 +68,30 @@ class DynamicResourceService:
         
         print(f"[DEBUG] DynamicResourceService 搜索课程: {search_query}, 页码: {page}, 策略: {(page - 1) % len(search_strategies) + 1}")
         
-        # 搜索所有平台，并传递页码
-        all_courses = []
-        for platform in platforms:
-            try:
-                if platform == 'bilibili':
-                    courses = self.course_searcher.search_bilibili_courses(
-                        keywords=search_query,
-                        limit=5,
-                        page=page
-                    )
-                elif platform == 'imooc':
-                    courses = self.course_searcher.search_imooc_courses(
-                        keywords=search_query,
-                        limit=3,
-                        page=page
-                    )
-                elif platform == 'geekbang':
-                    courses = self.course_searcher.search_geekbang_courses(
-                        keywords=search_query,
-                        limit=2,
-                        page=page
-                    )
-                else:
-                    courses = []
-                
-                all_courses.extend(courses)
-            except Exception as e:
-                print(f"[ERROR] {platform} 搜索失败: {e}")
+        # 并发搜索所有平台（经过缓存），并传递页码
+        results = await asyncio.gather(
+            *(self._search_platform_cached(platform, search_query, page) for platform in platforms),
+            return_exceptions=True
+        )
         
+        all_courses = []
+        for platform, result in zip(platforms, results):
+            if isinstance(result, Exception):
+                print(f"[ERROR] {platform} 搜索失败: {result}")
+                continue
+            all_courses.extend(result)
         return all_courses
     
-    def search_books(self, keywords: List[str], page: int = 1) -> List[Dict[str, Any]]:
+    async def _search_platform_cached(self, platform: str, search_query: str, page: int) -> List[Dict[str, Any]]:
+        """单个平台的课程搜索（失败时的备选结果做负缓存）"""
+        async def fetch():
+            return await self.course_searcher.search_platform(
+                platform, search_query, PLATFORM_LIMITS.get(platform, 3), page
+            )
+        
+        return await resource_cache.get_or_fetch(platform, search_query, page, fetch)
+    
+    async def search_books(self, keywords: List[str], page: int = 1) -> List[Dict[str, Any]]:
         """
         搜索书籍
         
@@ -98,15 +107,18 @@ class DynamicResourceService:
         
         print(f"[DEBUG] DynamicResourceService 搜索书籍: {search_query}, 页码: {page}")
         
-        books = self.book_searcher.search_books(
-            keywords=search_query,
-            limit=5,
-            page=page  # 传递页码参数
-        )
+        async def fetch():
+            # 书籍搜索可能调用大模型（同步接口），放到线程中执行；大模型失败时的备选结果只做负缓存
+            return await asyncio.to_thread(
+                self.book_searcher.search_books,
+                keywords=search_query,
+                limit=5,
+                page=page  # 传递页码参数
+            )
         
-        return books
+        return await resource_cache.get_or_fetch('books', search_query, page, fetch)
     
-    def search_certifications(self, keywords: List[str], page: int = 1) -> List[Dict[str, Any]]:
+    async def search_certifications(self, keywords: List[str], page: int = 1) -> List[Dict[str, Any]]:
         """
         搜索证书
         
@@ -122,15 +134,82 @@ class DynamicResourceService:
         
         print(f"[DEBUG] DynamicResourceService 搜索证书: {search_query}, 页码: {page}")
         
-        certs = self.cert_searcher.search_certifications(
-            keywords=search_query,
-            limit=3,
-            page=page  # 传递页码参数
-        )
+        async def fetch():
+            return await asyncio.to_thread(
+                self.cert_searcher.search_certifications,
+                keywords=search_query,
+                limit=3,
+                page=page  # 传递页码参数
+            )
         
-        return certs
+        return await resource_cache.get_or_fetch('certifications', search_query, page, fetch)
+    
+    def prefetch(self, content_type: str, keywords: List[str], page: int) -> bool:
+        """
+        把第 page 页加入后台预取队列（须在事件循环中调用）
+        
+        Returns:
+            是否加入队列（未启用、重复或队列已满时返回 False）
+        """
+        if not self.prefetch_enabled or content_type not in ('courses', 'books', 'certifications'):
+            return False
+        
+        key = (content_type, tuple(keywords), page)
+        if key in self._prefetch_pending:
+            return False
+        
+        queue = self._get_prefetch_queue()
+        try:
+            queue.put_nowait(key)
+        except asyncio.QueueFull:
+            print(f"[DEBUG] 预取队列已满，跳过 {content_type} 第 {page} 页")
+            return False
+        self._prefetch_pending.add(key)
+        return True
+    
+    def _get_prefetch_queue(self) -> asyncio.Queue:
+        """获取预取队列，首次使用时在当前事件循环中启动后台任务"""
+        loop = asyncio.get_running_loop()
+        if self._prefetch_queue is None or self._prefetch_loop is not loop:
+            self._prefetch_queue = asyncio.Queue(maxsize=self.prefetch_queue_size)
+            self._prefetch_loop = loop
+            self._prefetch_pending.clear()
+            self._prefetch_tasks = [
+                loop.create_task(self._prefetch_worker(self._prefetch_queue))
+                for _ in range(self.prefetch_workers)
+            ]
+        return self._prefetch_queue
+    
+    async def _prefetch_worker(self, queue: asyncio.Queue) -> None:
+        searches = {
+            'courses': self.search_courses,
+            'books': self.search_books,
+            'certifications': self.search_certifications,
+        }
+        while True:
+            key = await queue.get()
+            content_type, keywords, page = key
+            try:
+                # 结果写入 resource_cache，这里不需要返回值
+                await searches[content_type](list(keywords), page=page)
+                print(f"[DEBUG] 已预取 {content_type} 第 {page} 页")
+            except Exception as e:
+                print(f"[WARN] 预取 {content_type} 第 {page} 页失败: {e}")
+            finally:
+                self._prefetch_pending.discard(key)
+                queue.task_done()
+    
+    async def stop_prefetch(self) -> None:
+        """停止后台预取任务（应用关闭时调用）"""
+        for task in self._prefetch_tasks:
+            task.cancel()
+        await asyncio.gather(*self._prefetch_tasks, return_exceptions=True)
+        self._prefetch_tasks = []
+        self._prefetch_queue = None
+        self._prefetch_loop = None
+        self._prefetch_pending.clear()
     
-    def search_all_resources(
+    async def search_all_resources(
         self, 
         keywords: List[str],
         platforms: List[str] = ['bilibili', 'imooc', 'geekbang']
@@ -146,9 +225,9 @@ class DynamicResourceService:
             包含courses, books, certifications的字典
         """
         return {
-            'courses': self.search_courses(keywords, platforms),
-            'books': self.search_books(keywords),
-            'certifications': self.search_certifications(keywords),
+            'courses': await self.search_courses(keywords, platforms),
+            'books': await self.search_books(keywords),
+            'certifications': await self.search_certifications(keywords),
         }
 
 
@@ -0,0 +1,158 @@
+"""
+学习路线生成结果缓存
+
+相同的（职位, JD, 内容类型）规范化后取 SHA-256 作为缓存键，命中时直接复制已生成的内容，
+不再调用 n8n 工作流。配置项（config.json → generation_cache）：
+- enabled：是否启用（默认 true）
+- ttl_hours：缓存有效期（默认 168 小时）
+"""
+import copy
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..core.config_manager import config
+from ..core.database import dialect_insert
+from ..models.generation_cache import GenerationCacheEntry
+
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    """NFKC 归一化、小写、合并空白"""
+    return _WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFKC", value or "").lower()).strip()
+
+
+def generation_cache_key(position: str, job_description: str, content_types: Optional[List[str]]) -> str:
+    """缓存键：规范化后的（职位, JD, 去重排序的内容类型）的 SHA-256"""
+    payload = json.dumps(
+        [
+            _normalize_text(position),
+            _normalize_text(job_description),
+            sorted({t.strip().lower() for t in (content_types or ["mindmap"]) if t and t.strip()})
+        ],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """学习路线生成结果缓存（命中/未命中计数为进程内统计）"""
+
+    def __init__(self):
+        cache_config = config.get("generation_cache", {}) or {}
+        self.enabled = bool(cache_config.get("enabled", True))
+        self.ttl = timedelta(hours=float(cache_config.get("ttl_hours", 168)))
+
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0}
+        self._since = datetime.now()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(
+        self,
+        db: Session,
+        position: str,
+        job_description: str,
+        content_types: Optional[List[str]]
+    ) -> Optional[Dict[str, Any]]:
+        """查找未过期的缓存，命中时返回 generated_content 的副本"""
+        if not self.enabled:
+            return None
+
+        entry = db.query(GenerationCacheEntry).filter(
+            GenerationCacheEntry.cache_key == generation_cache_key(position, job_description, content_types),
+            GenerationCacheEntry.expires_at > datetime.now()
+        ).first()
+        if entry is None:
+            self._count("misses")
+            return None
+
+        db.query(GenerationCacheEntry).filter(GenerationCacheEntry.id == entry.id).update(
+            {GenerationCacheEntry.hit_count: GenerationCacheEntry.hit_count + 1},
+            synchronize_session=False
+        )
+        self._count("hits")
+        return copy.deepcopy(entry.generated_content)
+
+    def put(
+        self,
+        db: Session,
+        position: str,
+        job_description: str,
+        content_types: Optional[List[str]],
+        generated_content: Dict[str, Any]
+    ) -> None:
+        """写入或刷新缓存（调用方负责提交），同时清理已过期的条目"""
+        if not self.enabled or not generated_content or not generated_content.get("output"):
+            return
+
+        now = datetime.now()
+        values = {
+            "cache_key": generation_cache_key(position, job_description, content_types),
+            "position": position,
+            "content_types": content_types or ["mindmap"],
+            "generated_content": generated_content,
+            "hit_count": 0,
+            "expires_at": now + self.ttl
+        }
+        insert = dialect_insert(db)
+        statement = insert(GenerationCacheEntry).values(**values)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[GenerationCacheEntry.cache_key],
+            set_={
+                "generated_content": statement.excluded.generated_content,
+                "content_types": statement.excluded.content_types,
+                "expires_at": statement.excluded.expires_at,
+                "hit_count": 0
+            }
+        ))
+        db.query(GenerationCacheEntry).filter(
+            GenerationCacheEntry.expires_at <= now
+        ).delete(synchronize_session=False)
+        self._count("stores")
+
+    def clear(self, db: Session) -> int:
+        """清空缓存，返回删除的条目数"""
+        deleted = db.query(GenerationCacheEntry).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """缓存统计：进程内命中/未命中计数 + 缓存表中的条目数"""
+        with self._lock:
+            counters = dict(self._counters)
+            since = self._since
+
+        lookups = counters["hits"] + counters["misses"]
+        now = datetime.now()
+        entries, total_hits = db.query(
+            func.count(GenerationCacheEntry.id),
+            func.coalesce(func.sum(GenerationCacheEntry.hit_count), 0)
+        ).filter(GenerationCacheEntry.expires_at > now).one()
+
+        return {
+            "enabled": self.enabled,
+            "ttl_hours": self.ttl.total_seconds() / 3600,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "stores": counters["stores"],
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries or 0,
+            "entry_hits": int(total_hits or 0),
+            "since": since
+        }
+
+
+# 单例实例
+generation_cache = GenerationCache()
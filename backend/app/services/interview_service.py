@@ -1,13 +1,32 @@
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert, case, Row
 from collections import Counter
 from openai import OpenAI
-from ..models.interview_question import InterviewQuestion
+from ..models.interview_question import (
+    InterviewQuestion,
+    QUESTION_SOURCE_GENERATED,
+    QUESTION_SOURCE_SHARED,
+    QUESTION_SOURCE_WEAK_POINTS,
+)
 from ..models.question_status import QuestionStatus
 from ..models.learning_path import LearningPath
 from ..core.config import settings
+from ..core.database import dialect_insert
+from .question_sampler import question_sampler
+from .question_dedup import question_deduplicator
+from .knowledge_point_index import knowledge_point_index
+from .review_scheduler import review_scheduler
+from .question_pool import question_pool
+
+
+VALID_DIFFICULTIES = ("easy", "medium", "hard")
+
+# 近似去重后数量不足时最多补题轮数，以及补题提示词中回避题目的数量上限
+MAX_TOPUP_ROUNDS = 2
+AVOID_LIST_SIZE = 30
 
 
 class InterviewService:
@@ -27,8 +46,9 @@ class InterviewService:
         count: int = 20,
         category: Optional[str] = None,
         based_on_weak_points: bool = False,
-        weak_points: Optional[List[str]] = None
-    ) -> List[InterviewQuestion]:
+        weak_points: Optional[List[str]] = None,
+        use_shared_pool: bool = False
+    ) -> List[Row]:
         """
         生成面试题
         
@@ -39,6 +59,7 @@ class InterviewService:
             category: 题目类型
             based_on_weak_points: 是否基于薄弱点生成
             weak_points: 薄弱知识点列表
+            use_shared_pool: 优先从同职位的共享题库取题，只让模型补齐缺少的难度
         """
         # 获取学习路线信息
         learning_path = db.query(LearningPath).filter(
@@ -48,25 +69,77 @@ class InterviewService:
         if not learning_path:
             raise ValueError("学习路线不存在")
         
-        # 构建生成提示词
-        if based_on_weak_points and weak_points:
-            prompt = self._build_weak_points_prompt(
-                learning_path.position,
-                weak_points,
-                count
+        weak_mode = bool(based_on_weak_points and weak_points)
+        # 针对个人薄弱点的题目不走共享题库
+        use_pool = use_shared_pool and not weak_mode
+        
+        questions_data: List[Dict[str, Any]] = []
+        if use_pool:
+            questions_data = question_pool.draw(
+                db, learning_path_id, learning_path.position, count, category
             )
-        else:
-            prompt = self._build_normal_prompt(
-                learning_path.position,
-                category,
-                count
+            print(f"[DEBUG] 共享题库命中 {len(questions_data)}/{count} 道题")
+        pooled_count = len(questions_data)
+        
+        # 首轮生成 + 去重后数量不足时让模型补题（附上需要回避的题目）
+        for round_no in range(0, MAX_TOPUP_ROUNDS + 1):
+            missing = count - len(questions_data)
+            if missing <= 0:
+                break
+            
+            if weak_mode:
+                prompt = self._build_weak_points_prompt(learning_path.position, weak_points, missing)
+            else:
+                prompt = self._build_normal_prompt(learning_path.position, category, missing)
+            if use_pool:
+                prompt = self._append_difficulty_hint(
+                    prompt, question_pool.missing_difficulties(count, questions_data)
+                )
+            if questions_data or round_no > 0:
+                print(f"[DEBUG] 缺少 {missing} 道题，第 {round_no} 轮补题")
+                prompt = self._append_avoid_list(
+                    prompt,
+                    self._avoid_questions(db, learning_path_id, questions_data)
+                )
+            else:
+                print(f"[DEBUG] 开始调用OpenAI生成面试题")
+                print(f"[DEBUG] 职位: {learning_path.position}")
+                print(f"[DEBUG] 题目数量: {count}")
+            
+            try:
+                more = self._request_questions(prompt)
+            except Exception:
+                # 首次生成失败直接报错；补题失败时保留已有题目
+                if round_no == 0 and not questions_data:
+                    raise
+                break
+            # 过滤与题库或本批次近似重复的题目
+            questions_data += question_deduplicator.filter_new(
+                db, learning_path_id, more, accepted=questions_data
             )
         
-        print(f"[DEBUG] 开始调用OpenAI生成面试题")
-        print(f"[DEBUG] 职位: {learning_path.position}")
-        print(f"[DEBUG] 题目数量: {count}")
+        # 批量保存到数据库
+        if weak_mode:
+            source = QUESTION_SOURCE_WEAK_POINTS
+        elif use_pool:
+            source = QUESTION_SOURCE_SHARED
+        else:
+            source = QUESTION_SOURCE_GENERATED
+        saved_questions = self.bulk_save_questions(db, learning_path_id, questions_data[:count], source=source)
+        
+        question_sampler.invalidate(learning_path_id)
+        question_deduplicator.add_saved(learning_path_id, saved_questions)
+        
+        if use_pool and len(questions_data) > pooled_count:
+            # 模型新生成的题目回流到共享题库
+            question_pool.contribute(
+                db, learning_path.position, self.normalize_questions(questions_data[pooled_count:count])
+            )
         
-        # 直接调用OpenAI API生成题目
+        return saved_questions
+    
+    def _request_questions(self, prompt: str) -> List[Dict[str, Any]]:
+        """调用OpenAI生成并解析一批题目"""
         try:
             response = self.openai_client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
@@ -89,42 +162,220 @@ class InterviewService:
             print(f"[DEBUG] OpenAI返回内容预览: {ai_output[:300]}")
             
             # 解析AI返回的题目
-            questions_data = self._parse_ai_response({"output": ai_output})
+            return self._parse_ai_response({"output": ai_output})
             
         except Exception as e:
             print(f"[ERROR] ❌ OpenAI调用失败: {type(e).__name__}: {e}")
             raise Exception(f"面试题生成失败: {str(e)}")
+    
+    def _avoid_questions(
+        self,
+        db: Session,
+        learning_path_id: int,
+        accepted: List[Dict[str, Any]]
+    ) -> List[str]:
+        """补题时需要回避的题干：本批次已接受的题目 + 题库中最近的题目"""
+        recent = db.query(InterviewQuestion.question).filter(
+            InterviewQuestion.learning_path_id == learning_path_id
+        ).order_by(InterviewQuestion.id.desc()).limit(AVOID_LIST_SIZE).all()
         
-        # 保存到数据库
-        saved_questions = []
-        for q_data in questions_data[:count]:  # 限制数量
-            # 规范化difficulty值（转为小写）
-            raw_difficulty = q_data.get("difficulty", "medium")
-            normalized_difficulty = raw_difficulty.lower() if isinstance(raw_difficulty, str) else "medium"
+        avoid = [q.get("question", "") for q in accepted] + [row[0] for row in recent]
+        return [q for q in avoid if q][:AVOID_LIST_SIZE]
+    
+    def _append_avoid_list(self, prompt: str, avoid_questions: List[str]) -> str:
+        """在提示词末尾追加需要回避的题目"""
+        if not avoid_questions:
+            return prompt
+        avoid_str = "\n".join(f"- {q}" for q in avoid_questions)
+        return prompt + f"""
+以下题目已经存在，请不要重复出题，也不要换一种说法改写它们：
+{avoid_str}
+"""
+    
+    def _append_difficulty_hint(self, prompt: str, missing: Dict[str, int]) -> str:
+        """在提示词末尾追加需要补齐的难度分布"""
+        if not missing:
+            return prompt
+        labels = {"easy": "简单(easy)", "medium": "中等(medium)", "hard": "困难(hard)"}
+        hint = "、".join(f"{labels.get(d, d)} {n}道" for d, n in missing.items())
+        return prompt + f"""
+难度分布要求：{hint}
+"""
+    
+    def normalize_questions(self, questions_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        校验并规范化一批AI生成的题目
+        
+        - 丢弃缺少题干或答案的条目
+        - difficulty 转小写，非法值回退为 medium
+        - knowledge_points 统一为去重后的字符串列表
+        """
+        rows = []
+        for q_data in questions_data:
+            if not isinstance(q_data, dict):
+                continue
             
-            # 验证difficulty值是否有效
-            if normalized_difficulty not in ['easy', 'medium', 'hard']:
+            question = str(q_data.get("question") or "").strip()
+            answer = str(q_data.get("answer") or "").strip()
+            if not question or not answer:
+                print(f"[WARN] 跳过缺少题干或答案的题目: {str(q_data)[:100]}")
+                continue
+            
+            raw_difficulty = q_data.get("difficulty", "medium")
+            difficulty = raw_difficulty.strip().lower() if isinstance(raw_difficulty, str) else "medium"
+            if difficulty not in VALID_DIFFICULTIES:
                 print(f"[WARN] 无效的difficulty值: {raw_difficulty}，使用默认值medium")
-                normalized_difficulty = "medium"
+                difficulty = "medium"
             
-            print(f"[DEBUG] difficulty转换: {raw_difficulty} -> {normalized_difficulty}")
+            raw_points = q_data.get("knowledge_points") or []
+            if isinstance(raw_points, str):
+                raw_points = [raw_points]
+            knowledge_points = []
+            for point in raw_points if isinstance(raw_points, list) else []:
+                point = str(point).strip()
+                if point and point not in knowledge_points:
+                    knowledge_points.append(point)
             
-            question = InterviewQuestion(
-                learning_path_id=learning_path_id,
-                question=q_data.get("question", ""),
-                answer=q_data.get("answer", ""),
-                category=q_data.get("category"),
-                difficulty=normalized_difficulty,  # 直接使用字符串
-                knowledge_points=q_data.get("knowledge_points", [])
+            category = q_data.get("category")
+            category = str(category).strip()[:100] if category else None
+            
+            rows.append({
+                "question": question,
+                "answer": answer,
+                "category": category or None,
+                "difficulty": difficulty,
+                "knowledge_points": knowledge_points
+            })
+        return rows
+    
+    def batch_update_statuses(
+        self,
+        db: Session,
+        user_id: int,
+        items: List[Tuple[int, str, Optional[int]]]
+    ) -> List[Row]:
+        """
+        批量更新题目状态并安排下次复习
+        
+        一次查询校验题目归属并取出已有的复习调度，一条
+        INSERT ... ON CONFLICT (uq_user_question) DO UPDATE 写入全部状态，
+        review_count 在数据库中原子累加。
+        
+        Args:
+            items: [(question_id, status, quality)]，同一题目出现多次时按顺序依次调度，状态以最后一次为准
+        
+        Returns:
+            更新后的 (question_id, status, review_count, due_at) 行
+        
+        Raises:
+            PermissionError: 存在不属于该用户（或不存在）的题目
+        """
+        question_ids = list(dict.fromkeys(question_id for question_id, _, _ in items))
+        rows = db.query(
+            InterviewQuestion.id,
+            QuestionStatus.ease,
+            QuestionStatus.interval_days
+        ).join(
+            LearningPath,
+            LearningPath.id == InterviewQuestion.learning_path_id
+        ).outerjoin(
+            QuestionStatus,
+            (QuestionStatus.question_id == InterviewQuestion.id) &
+            (QuestionStatus.user_id == user_id)
+        ).filter(
+            InterviewQuestion.id.in_(question_ids),
+            LearningPath.user_id == user_id
+        ).all()
+        
+        schedules = {row.id: (row.ease, row.interval_days, None) for row in rows}
+        forbidden_ids = [qid for qid in question_ids if qid not in schedules]
+        if forbidden_ids:
+            raise PermissionError(f"题目不存在或无权限访问: {forbidden_ids}")
+        
+        now = datetime.now()
+        latest: Dict[int, str] = {}
+        review_counts: Counter = Counter()
+        for question_id, status, quality in items:
+            ease, interval_days, _ = schedules[question_id]
+            schedule = review_scheduler.schedule(
+                ease, interval_days, review_scheduler.quality_for_status(status, quality), now
             )
-            db.add(question)
-            saved_questions.append(question)
+            schedules[question_id] = (schedule.ease, schedule.interval_days, schedule.due_at)
+            latest[question_id] = status
+            review_counts[question_id] += 1
+        
+        upsert = dialect_insert(db)
+        stmt = upsert(QuestionStatus).values([
+            {
+                "user_id": user_id,
+                "question_id": question_id,
+                "status": status,
+                "review_count": review_counts[question_id],
+                "last_reviewed_at": now,
+                "updated_at": now,
+                "ease": schedules[question_id][0],
+                "interval_days": schedules[question_id][1],
+                "due_at": schedules[question_id][2]
+            }
+            for question_id, status in latest.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "question_id"],
+            set_={
+                "status": stmt.excluded.status,
+                "review_count": func.coalesce(QuestionStatus.review_count, 0) + stmt.excluded.review_count,
+                "last_reviewed_at": stmt.excluded.last_reviewed_at,
+                "updated_at": stmt.excluded.updated_at,
+                "ease": stmt.excluded.ease,
+                "interval_days": stmt.excluded.interval_days,
+                "due_at": stmt.excluded.due_at
+            }
+        ).returning(
+            QuestionStatus.question_id,
+            QuestionStatus.status,
+            QuestionStatus.review_count,
+            QuestionStatus.due_at
+        )
+        
+        result = db.execute(stmt).all()
+        db.commit()
+        
+        print(f"[DEBUG] 批量更新 {len(result)} 道题目状态")
+        return result
+    
+    def bulk_save_questions(
+        self,
+        db: Session,
+        learning_path_id: int,
+        questions_data: List[Dict[str, Any]],
+        source: Optional[str] = None
+    ) -> List[Row]:
+        """
+        规范化并批量插入题目（INSERT ... RETURNING，无逐行 refresh）
+        
+        Args:
+            source: 题目来源（QUESTION_SOURCE_*），决定题目能否进入共享题库
         
-        print(f"[DEBUG] 准备提交 {len(saved_questions)} 道题目到数据库")
+        Returns:
+            已插入题目的行（包含id和created_at，可按属性访问各列）
+        """
+        rows = self.normalize_questions(questions_data)
+        if not rows:
+            return []
+        
+        for row in rows:
+            row["learning_path_id"] = learning_path_id
+            row["source"] = source
         
+        print(f"[DEBUG] 批量插入 {len(rows)} 道题目")
+        
+        # 返回列而不是ORM实体：commit 后不会因过期而逐行重新查询；返回顺序与传入顺序一致
+        saved_questions = db.execute(
+            insert(InterviewQuestion).returning(*InterviewQuestion.__table__.columns, sort_by_parameter_order=True),
+            rows
+        ).all()
+        knowledge_point_index.index_questions(db, saved_questions)
         db.commit()
-        for q in saved_questions:
-            db.refresh(q)
         
         return saved_questions
     
@@ -282,34 +533,34 @@ class InterviewService:
             "not_mastered_count": 10
         }
         """
-        # 查询所有未掌握的题目
-        not_mastered_questions = db.query(InterviewQuestion).join(
-            QuestionStatus,
-            (QuestionStatus.question_id == InterviewQuestion.id) &
-            (QuestionStatus.user_id == user_id) &
-            (QuestionStatus.status == "not_mastered")
+        not_mastered_count = db.query(func.count(QuestionStatus.id)).join(
+            InterviewQuestion,
+            InterviewQuestion.id == QuestionStatus.question_id
         ).filter(
+            QuestionStatus.user_id == user_id,
+            QuestionStatus.status == "not_mastered",
             InterviewQuestion.learning_path_id == learning_path_id
-        ).all()
-        
-        # 统计薄弱知识点
-        all_knowledge_points = []
-        all_categories = []
+        ).scalar() or 0
         
-        for q in not_mastered_questions:
-            if q.knowledge_points:
-                all_knowledge_points.extend(q.knowledge_points)
-            if q.category:
-                all_categories.append(q.category)
-        
-        # 统计频率
-        knowledge_counter = Counter(all_knowledge_points)
-        category_counter = Counter(all_categories)
+        if not_mastered_count == 0:
+            return {
+                "weak_knowledge_points": [],
+                "weak_categories": [],
+                "not_mastered_count": 0
+            }
         
         return {
-            "weak_knowledge_points": [k for k, _ in knowledge_counter.most_common(10)],
-            "weak_categories": [c for c, _ in category_counter.most_common(5)],
-            "not_mastered_count": len(not_mastered_questions)
+            "weak_knowledge_points": [
+                point for point, _ in knowledge_point_index.top_weak_knowledge_points(
+                    db, user_id, learning_path_id, limit=10
+                )
+            ],
+            "weak_categories": [
+                category for category, _ in self._top_weak_categories(
+                    db, user_id, 5, learning_path_id
+                )
+            ],
+            "not_mastered_count": not_mastered_count
         }
     
     def get_statistics(
@@ -318,13 +569,24 @@ class InterviewService:
         user_id: int,
         learning_path_id: int
     ) -> Dict[str, Any]:
-        """获取刷题统计"""
-        # 获取所有题目
-        questions = db.query(InterviewQuestion).filter(
+        """
+        获取刷题统计
+        
+        查询次数与题库大小无关：一次聚合查询得到总数和各状态数量，
+        有未掌握题目时再由分组查询得到薄弱分类和知识点排行。
+        """
+        total, mastered, not_mastered = db.query(
+            func.count(InterviewQuestion.id),
+            func.coalesce(func.sum(case((QuestionStatus.status == "mastered", 1), else_=0)), 0),
+            func.coalesce(func.sum(case((QuestionStatus.status == "not_mastered", 1), else_=0)), 0)
+        ).outerjoin(
+            QuestionStatus,
+            (QuestionStatus.question_id == InterviewQuestion.id) &
+            (QuestionStatus.user_id == user_id)
+        ).filter(
             InterviewQuestion.learning_path_id == learning_path_id
-        ).all()
+        ).one()
         
-        total = len(questions)
         if total == 0:
             return {
                 "total": 0,
@@ -336,52 +598,26 @@ class InterviewService:
                 "weak_knowledge_points": []
             }
         
-        # 统计各状态数量
-        status_counts = db.query(
-            QuestionStatus.status,
-            func.count(QuestionStatus.id)
-        ).join(
-            InterviewQuestion,
-            QuestionStatus.question_id == InterviewQuestion.id
-        ).filter(
-            QuestionStatus.user_id == user_id,
-            InterviewQuestion.learning_path_id == learning_path_id
-        ).group_by(QuestionStatus.status).all()
-        
-        status_dict = {status: count for status, count in status_counts}
-        
-        mastered = status_dict.get("mastered", 0)
-        not_mastered = status_dict.get("not_mastered", 0)
         seen = mastered + not_mastered
         not_seen = total - seen
         
         # 计算掌握率
         mastery_rate = (mastered / seen * 100) if seen > 0 else 0.0
         
-        # 分析薄弱点
-        weak_analysis = self.analyze_weak_points(db, user_id, learning_path_id)
-        
-        # 统计薄弱类别
+        # 统计薄弱分类和知识点
         weak_categories = []
-        if weak_analysis["weak_categories"]:
-            for category in weak_analysis["weak_categories"]:
-                count = db.query(func.count(InterviewQuestion.id)).join(
-                    QuestionStatus,
-                    (QuestionStatus.question_id == InterviewQuestion.id) &
-                    (QuestionStatus.user_id == user_id) &
-                    (QuestionStatus.status == "not_mastered")
-                ).filter(
-                    InterviewQuestion.learning_path_id == learning_path_id,
-                    InterviewQuestion.category == category
-                ).scalar()
-                
-                weak_categories.append({"category": category, "count": count})
-        
-        # 统计薄弱知识点
         weak_knowledge_points = []
-        if weak_analysis["weak_knowledge_points"]:
-            for point in weak_analysis["weak_knowledge_points"][:10]:
-                weak_knowledge_points.append({"point": point, "count": 0})  # 简化处理
+        if not_mastered > 0:
+            weak_categories = [
+                {"category": category, "count": count}
+                for category, count in self._top_weak_categories(db, user_id, 5, learning_path_id)
+            ]
+            weak_knowledge_points = [
+                {"point": point, "count": count}
+                for point, count in knowledge_point_index.top_weak_knowledge_points(
+                    db, user_id, learning_path_id, limit=10
+                )
+            ]
         
         return {
             "total": total,
@@ -393,6 +629,79 @@ class InterviewService:
             "weak_knowledge_points": weak_knowledge_points
         }
 
+    
+    def get_user_mistake_statistics(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """
+        用户所有学习路线的刷题统计（错题本）
+        
+        总数、各状态数量和薄弱分类/知识点排行均由数据库分组聚合得到，
+        查询次数和返回数据量与题库大小无关。掌握率沿用错题本的口径：已掌握 / 题目总数。
+        """
+        total, mastered, not_mastered = db.query(
+            func.count(InterviewQuestion.id),
+            func.coalesce(func.sum(case((QuestionStatus.status == "mastered", 1), else_=0)), 0),
+            func.coalesce(func.sum(case((QuestionStatus.status == "not_mastered", 1), else_=0)), 0)
+        ).join(
+            LearningPath,
+            LearningPath.id == InterviewQuestion.learning_path_id
+        ).outerjoin(
+            QuestionStatus,
+            (QuestionStatus.question_id == InterviewQuestion.id) &
+            (QuestionStatus.user_id == user_id)
+        ).filter(
+            LearningPath.user_id == user_id
+        ).one()
+        
+        weak_categories = []
+        weak_knowledge_points = []
+        if not_mastered > 0:
+            weak_categories = [
+                {"category": category, "count": count}
+                for category, count in self._top_weak_categories(db, user_id, 5)
+            ]
+            weak_knowledge_points = [
+                {"point": point, "count": count}
+                for point, count in knowledge_point_index.top_weak_knowledge_points(db, user_id, limit=10)
+            ]
+        
+        return {
+            "total": total,
+            "not_seen": total - mastered - not_mastered,
+            "mastered": mastered,
+            "not_mastered": not_mastered,
+            "mastery_rate": mastered / total if total > 0 else 0.0,
+            "weak_categories": weak_categories,
+            "weak_knowledge_points": weak_knowledge_points
+        }
+    
+    def _top_weak_categories(
+        self,
+        db: Session,
+        user_id: int,
+        limit: int,
+        learning_path_id: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """按分类分组统计用户未掌握的题目数，取前limit个（不传学习路线时统计全部）"""
+        count = func.count(QuestionStatus.id)
+        query = db.query(
+            InterviewQuestion.category, count
+        ).join(
+            QuestionStatus,
+            QuestionStatus.question_id == InterviewQuestion.id
+        ).filter(
+            QuestionStatus.user_id == user_id,
+            QuestionStatus.status == "not_mastered",
+            InterviewQuestion.category.isnot(None)
+        )
+        if learning_path_id is not None:
+            query = query.filter(InterviewQuestion.learning_path_id == learning_path_id)
+        
+        return [
+            (row[0], row[1]) for row in query.group_by(
+                InterviewQuestion.category
+            ).order_by(count.desc(), InterviewQuestion.category).limit(limit).all()
+        ]
+
 
 interview_service = InterviewService()
 
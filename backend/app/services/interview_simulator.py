@@ -2,16 +2,33 @@ from langchain_openai import ChatOpenAI
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.schema import HumanMessage, AIMessage, SystemMessage
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from ..core.config_manager import config
+from ..core.database import SessionLocal
 from ..models.interview_session import InterviewSession
 from ..models.learning_path import LearningPath
-from ..models.interview_question import InterviewQuestion
-import random
+from .question_sampler import question_sampler
 import json
 import datetime
 
 
+# 评价报告维度 -> InterviewSession 冗余评分列
+DIMENSION_SCORE_COLUMNS = {
+    "technical_depth": "technical_depth_score",
+    "expression": "expression_score",
+    "problem_solving": "problem_solving_score",
+    "experience": "experience_score",
+}
+
+
+def _to_score(value: Any) -> Optional[int]:
+    """模型返回的分数可能是字符串或小数，统一为整数"""
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
 class InterviewSimulator:
     """基于 LangChain 的面试模拟器"""
     
@@ -27,9 +44,16 @@ class InterviewSimulator:
             temperature=0.7  # 稍高温度使对话更自然
         )
     
-    def _create_interviewer_prompt(self, position: str) -> str:
+    # 开场题之外预选的候选题数量，写入面试官 Prompt
+    CANDIDATE_QUESTION_COUNT = 3
+    
+    def _create_interviewer_prompt(
+        self,
+        position: str,
+        candidate_questions: Optional[List[str]] = None
+    ) -> str:
         """创建面试官 System Prompt"""
-        return f"""你是一位经验丰富的{position}面试官。你的任务是：
+        prompt = f"""你是一位经验丰富的{position}面试官。你的任务是：
 
 1. 根据候选人回答质量，灵活决定是否追问或提出新问题
 2. 追问策略：
@@ -46,6 +70,15 @@ class InterviewSimulator:
 - 对比分析："为什么选择这个方案而不是其他方案？"
 
 请根据对话历史，给出合适的追问或新问题。"""
+        
+        if candidate_questions:
+            candidates = "\n".join(f"- {q}" for q in candidate_questions)
+            prompt += f"""
+
+需要提出新问题时，优先从以下题库候选题中选择（可根据对话自然改写）：
+{candidates}"""
+        
+        return prompt
     
     def start_session(self, user_id: int, learning_path_id: int) -> Dict[str, Any]:
         """开始新的面试会话"""
@@ -58,18 +91,24 @@ class InterviewSimulator:
         if not path:
             raise ValueError("学习路径不存在")
         
-        # 随机选择开场题
-        questions = self.db.query(InterviewQuestion).filter(
-            InterviewQuestion.learning_path_id == learning_path_id
-        ).all()
+        # 抽取开场题和候选题（对未掌握的题目加权，只加载被选中的行）
+        questions = question_sampler.sample_questions(
+            self.db,
+            learning_path_id,
+            k=1 + self.CANDIDATE_QUESTION_COUNT,
+            user_id=user_id
+        )
         
         if not questions:
             raise ValueError("该学习路径下没有面试题")
         
-        first_q = random.choice(questions)
+        first_q, candidates = questions[0], questions[1:]
         
         # 创建会话
-        system_prompt = self._create_interviewer_prompt(path.position)
+        system_prompt = self._create_interviewer_prompt(
+            path.position,
+            [q.question for q in candidates]
+        )
         first_message = f"你好，欢迎参加{path.position}岗位的面试。让我们开始吧。\n\n{first_q.question}"
         
         session = InterviewSession(
@@ -171,36 +210,82 @@ class InterviewSimulator:
             return "excellent"
     
     def end_session(self, session_id: int, user_id: int) -> Dict[str, Any]:
-        """结束面试 - 使用 LangChain 生成评价报告"""
+        """结束面试 - 立即返回，评价报告由后台任务生成"""
         session = self.db.query(InterviewSession).filter(
             InterviewSession.id == session_id,
-            InterviewSession.user_id == user_id
+            InterviewSession.user_id == user_id,
+            InterviewSession.status == "in_progress"
         ).first()
         
         if not session:
-            raise ValueError("会话不存在")
+            raise ValueError("会话不存在或已结束")
         
         # 计算时长
         duration = (datetime.datetime.utcnow() - session.started_at).seconds
         session.ended_at = datetime.datetime.utcnow()
         session.duration_seconds = duration
-        session.status = "completed"
+        session.status = "evaluating"
         
-        # 使用 LangChain 生成评价
-        evaluation = self._generate_evaluation_with_langchain(
-            session.conversation,
-            session.position
-        )
-        session.evaluation = evaluation
+        self.db.commit()
         
+        return {
+            "session_id": session.id,
+            "status": session.status,
+            "duration_minutes": duration // 60
+        }
+    
+    def retry_evaluation(self, session_id: int, user_id: int) -> Dict[str, Any]:
+        """重新提交评价失败的会话"""
+        session = self.db.query(InterviewSession).filter(
+            InterviewSession.id == session_id,
+            InterviewSession.user_id == user_id,
+            InterviewSession.status == "evaluation_failed"
+        ).first()
+        
+        if not session:
+            raise ValueError("会话不存在或无需重新评价")
+        
+        session.status = "evaluating"
+        session.evaluation = None
         self.db.commit()
         
         return {
             "session_id": session.id,
-            "duration_minutes": duration // 60,
-            "evaluation": evaluation
+            "status": session.status
         }
     
+    def evaluate_session(self, session_id: int) -> None:
+        """生成评价报告（后台任务），失败时记录为 evaluation_failed"""
+        session = self.db.query(InterviewSession).filter(
+            InterviewSession.id == session_id,
+            InterviewSession.status == "evaluating"
+        ).first()
+        
+        if not session:
+            return
+        
+        try:
+            evaluation = self._generate_evaluation_with_langchain(
+                session.conversation,
+                session.position
+            )
+            session.evaluation = evaluation
+            
+            # 写入评分冗余列，供历史记录和趋势查询使用
+            session.overall_score = _to_score(evaluation.get("overall_score"))
+            dimension_scores = evaluation.get("dimension_scores") or {}
+            for dimension, column in DIMENSION_SCORE_COLUMNS.items():
+                setattr(session, column, _to_score(dimension_scores.get(dimension)))
+            
+            session.completed_at = datetime.datetime.utcnow()
+            session.status = "completed"
+        except Exception as e:
+            print(f"[ERROR] 评价生成失败（会话 {session_id}）：{type(e).__name__}: {e}")
+            session.evaluation = {"error": f"评价生成失败：{str(e)}"}
+            session.status = "evaluation_failed"
+        
+        self.db.commit()
+    
     def _generate_evaluation_with_langchain(
         self,
         conversation: List[Dict],
@@ -253,31 +338,57 @@ class InterviewSimulator:
 - problem_solving: 问题解决思路
 - experience: 实践经验与项目经历"""
         
-        # 调用 LangChain 生成
-        try:
-            response = self.llm.invoke([
-                SystemMessage(content="你是一位专业的面试评估专家，擅长客观评价候选人表现。"),
-                HumanMessage(content=evaluation_prompt)
-            ])
-            
-            # 解析 JSON
-            evaluation = json.loads(response.content)
-        except Exception as e:
-            # 容错处理
-            print(f"评价生成失败：{e}")
-            evaluation = {
-                "overall_score": 70,
-                "dimension_scores": {
-                    "technical_depth": 70,
-                    "expression": 70,
-                    "problem_solving": 70,
-                    "experience": 70
-                },
-                "strengths": ["表达清晰"],
-                "weaknesses": ["需要更多实践"],
-                "suggestions": ["继续学习，多做项目"],
-                "summary": "面试表现良好，继续努力。"
-            }
+        # 调用 LangChain 生成（异常由调用方记录）
+        response = self.llm.invoke([
+            SystemMessage(content="你是一位专业的面试评估专家，擅长客观评价候选人表现。"),
+            HumanMessage(content=evaluation_prompt)
+        ])
         
-        return evaluation
+        return json.loads(self._strip_code_fence(response.content))
+    
+    @staticmethod
+    def _strip_code_fence(text: str) -> str:
+        """去掉模型可能包裹的 ```json 代码块标记"""
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+            if text.rstrip().endswith("```"):
+                text = text.rstrip()[:-3]
+        return text.strip()
+
+
+def fail_interrupted_evaluations() -> int:
+    """
+    把重启前未完成的评价标记为 evaluation_failed（应用启动时调用）
+    
+    评价任务只在进程内执行，重启后不会继续；标记失败后客户端不再一直等待，可通过重新评价接口重试。
+    
+    Returns:
+        标记的会话数
+    """
+    db = SessionLocal()
+    try:
+        count = db.query(InterviewSession).filter(
+            InterviewSession.status == "evaluating"
+        ).update(
+            {
+                InterviewSession.status: "evaluation_failed",
+                InterviewSession.evaluation: {"error": "服务重启，评价已中断，请重新生成"}
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        if count:
+            print(f"[WARN] {count} 个面试评价因服务重启中断，已标记为失败")
+        return count
+    finally:
+        db.close()
+
 
+def run_evaluation_job(session_id: int) -> None:
+    """后台评价任务入口，使用独立的数据库会话"""
+    db = SessionLocal()
+    try:
+        InterviewSimulator(db).evaluate_session(session_id)
+    finally:
+        db.close()
@@ -0,0 +1,215 @@
+"""
+知识点索引服务 - 把面试题 JSON 中的知识点规范化到 knowledge_points / question_knowledge_points 两张表，
+薄弱点排行等统计直接在数据库中分组聚合
+"""
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal, dialect_insert
+from ..models.interview_question import InterviewQuestion
+from ..models.question_status import QuestionStatus
+from ..models.knowledge_point import KnowledgePoint, QuestionKnowledgePoint
+
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_NAME_MAX_LENGTH = 200
+_CHUNK_SIZE = 500  # IN 列表和批量插入的分块大小
+
+
+def canonicalize_knowledge_point(name: Any) -> str:
+    """知识点名称规范化：NFKC 归一化（全角转半角）、小写、合并空白"""
+    text = unicodedata.normalize("NFKC", str(name or ""))
+    return _WHITESPACE_PATTERN.sub(" ", text).strip().lower()[:_NAME_MAX_LENGTH]
+
+
+def _as_list(knowledge_points: Any) -> List[Any]:
+    if not knowledge_points:
+        return []
+    if isinstance(knowledge_points, str):
+        return [knowledge_points]
+    return list(knowledge_points)
+
+
+def _chunks(items: List[Any]) -> Iterable[List[Any]]:
+    for i in range(0, len(items), _CHUNK_SIZE):
+        yield items[i:i + _CHUNK_SIZE]
+
+
+class KnowledgePointIndex:
+    """知识点索引维护与查询"""
+
+    def index_questions(self, db: Session, rows: Iterable[Any]) -> int:
+        """
+        为题目建立知识点关联（不提交事务，由调用方提交）
+
+        Args:
+            rows: 带 id 和 knowledge_points 属性的题目行
+
+        Returns:
+            写入的关联数量
+        """
+        names: Dict[str, str] = {}  # 规范化名称 -> 展示名称
+        pairs = set()
+        for row in rows:
+            for raw in _as_list(row.knowledge_points):
+                canonical = canonicalize_knowledge_point(raw)
+                if not canonical:
+                    continue
+                names.setdefault(canonical, _WHITESPACE_PATTERN.sub(" ", str(raw)).strip()[:_NAME_MAX_LENGTH])
+                pairs.add((row.id, canonical))
+
+        if not pairs:
+            return 0
+
+        id_map = self._ensure_knowledge_points(db, names)
+        links = [
+            {"question_id": question_id, "knowledge_point_id": id_map[canonical]}
+            for question_id, canonical in sorted(pairs)
+        ]
+        insert = dialect_insert(db)
+        for chunk in _chunks(links):
+            db.execute(insert(QuestionKnowledgePoint).values(chunk).on_conflict_do_nothing())
+        return len(links)
+
+    def _ensure_knowledge_points(self, db: Session, names: Dict[str, str]) -> Dict[str, int]:
+        """查找或创建知识点，返回 规范化名称 -> id"""
+        canonicals = list(names)
+        id_map = self._lookup_ids(db, canonicals)
+
+        missing = [c for c in canonicals if c not in id_map]
+        if missing:
+            insert = dialect_insert(db)
+            for chunk in _chunks(missing):
+                db.execute(
+                    insert(KnowledgePoint).values(
+                        [{"canonical_name": c, "name": names[c]} for c in chunk]
+                    ).on_conflict_do_nothing(index_elements=["canonical_name"])
+                )
+            # 并发写入时可能被其他事务抢先插入，统一重新查询
+            id_map.update(self._lookup_ids(db, missing))
+        return id_map
+
+    def _lookup_ids(self, db: Session, canonicals: List[str]) -> Dict[str, int]:
+        id_map = {}
+        for chunk in _chunks(canonicals):
+            id_map.update(
+                db.query(KnowledgePoint.canonical_name, KnowledgePoint.id).filter(
+                    KnowledgePoint.canonical_name.in_(chunk)
+                ).all()
+            )
+        return id_map
+
+    def backfill(self, db: Session, batch_size: int = 500) -> int:
+        """
+        为尚未标记为已建立索引的存量题目回填知识点索引（幂等，按id分批提交）
+
+        每道题只处理一次，没有知识点的题目也会被标记，下次启动不再扫描。
+
+        Returns:
+            回填的题目数量
+        """
+        indexed = 0
+        last_id = 0
+        while True:
+            rows = db.query(
+                InterviewQuestion.id, InterviewQuestion.knowledge_points
+            ).filter(
+                InterviewQuestion.id > last_id,
+                InterviewQuestion.knowledge_points_indexed.is_(False)
+            ).order_by(InterviewQuestion.id).limit(batch_size).all()
+            if not rows:
+                break
+            self.index_questions(db, rows)
+            indexed += len(rows)
+            db.query(InterviewQuestion).filter(
+                InterviewQuestion.id.in_([row.id for row in rows])
+            ).update({InterviewQuestion.knowledge_points_indexed: True}, synchronize_session=False)
+            db.commit()
+            last_id = rows[-1].id
+        return indexed
+
+    def ensure_backfilled(self) -> None:
+        """应用启动时回填存量题目，失败只记录日志"""
+        db = SessionLocal()
+        try:
+            indexed = self.backfill(db)
+            if indexed:
+                print(f"[DEBUG] 已为 {indexed} 道存量题目回填知识点索引")
+        except Exception as e:
+            db.rollback()
+            print(f"[ERROR] 回填知识点索引失败: {e}")
+        finally:
+            db.close()
+
+    def remove_questions(self, db: Session, question_ids: List[int]) -> None:
+        """删除题目的知识点关联（批量删除题目时调用，不提交事务）"""
+        for chunk in _chunks(list(question_ids)):
+            db.query(QuestionKnowledgePoint).filter(
+                QuestionKnowledgePoint.question_id.in_(chunk)
+            ).delete(synchronize_session=False)
+
+    def top_weak_knowledge_points(
+        self,
+        db: Session,
+        user_id: int,
+        learning_path_id: Optional[int] = None,
+        limit: int = 10
+    ) -> List[Tuple[str, int]]:
+        """
+        用户未掌握题目的知识点排行
+
+        关联表主键为 (question_id, knowledge_point_id)，同一道题内重复的知识点只计一次。
+
+        Returns:
+            [(知识点, 未掌握题目数)]，按数量降序
+        """
+        count = func.count(QuestionKnowledgePoint.question_id)
+        query = db.query(KnowledgePoint.name, count).join(
+            QuestionKnowledgePoint,
+            QuestionKnowledgePoint.knowledge_point_id == KnowledgePoint.id
+        ).join(
+            QuestionStatus,
+            QuestionStatus.question_id == QuestionKnowledgePoint.question_id
+        ).filter(
+            QuestionStatus.user_id == user_id,
+            QuestionStatus.status == "not_mastered"
+        )
+        if learning_path_id is not None:
+            query = query.join(
+                InterviewQuestion,
+                InterviewQuestion.id == QuestionKnowledgePoint.question_id
+            ).filter(InterviewQuestion.learning_path_id == learning_path_id)
+
+        rows = query.group_by(
+            KnowledgePoint.id, KnowledgePoint.name
+        ).order_by(count.desc(), KnowledgePoint.name).limit(limit).all()
+        return [(name, total) for name, total in rows]
+
+    def knowledge_points_by_category(
+        self,
+        db: Session,
+        question_ids: List[int]
+    ) -> Dict[str, List[str]]:
+        """按分类汇总给定题目的知识点（分类内去重，保持出现顺序）"""
+        result: Dict[str, List[str]] = {}
+        for chunk in _chunks(list(question_ids)):
+            rows = db.query(InterviewQuestion.category, KnowledgePoint.name).join(
+                QuestionKnowledgePoint,
+                QuestionKnowledgePoint.question_id == InterviewQuestion.id
+            ).join(
+                KnowledgePoint,
+                KnowledgePoint.id == QuestionKnowledgePoint.knowledge_point_id
+            ).filter(
+                InterviewQuestion.id.in_(chunk)
+            ).order_by(InterviewQuestion.id, KnowledgePoint.id).all()
+            for category, name in rows:
+                points = result.setdefault(category or "其他", [])
+                if name not in points:
+                    points.append(name)
+        return result
+
+
+# 单例实例
+knowledge_point_index = KnowledgePointIndex()
@@ -0,0 +1,266 @@
+"""
+学习路线异步生成任务
+
+任务状态保存在 learning_paths 行上（generation_status），进程重启后由 resume_pending 重新领取
+（重启时仍在租约内的执行中任务，在租约到期时再检查一次）：
+- pending：已提交，等待执行
+- calling_workflow：正在调用 n8n 工作流
+- saving：正在保存生成结果
+- completed / failed：结束
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal
+from ..models.learning_path import LearningPath
+from .n8n_client import n8n_client
+from .generation_cache import generation_cache
+from .learning_path_keywords import learning_path_keywords
+
+
+RUNNING_STATUSES = ("calling_workflow", "saving")
+ACTIVE_STATUSES = ("pending",) + RUNNING_STATUSES
+MAX_ATTEMPTS = 3
+
+
+def build_generated_content(position: str, generated_data: Dict[str, Any]) -> Dict[str, Any]:
+    """构建generated_content，只标记实际生成的内容类型"""
+    # 只有mindmap是首次生成时一定有的，其他内容需要单独生成
+    actually_generated_types = []
+    if generated_data.get("output"):
+        actually_generated_types.append("mindmap")
+
+    return {
+        "output": generated_data.get("output", ""),
+        "generated_types": actually_generated_types,
+        "metadata": {
+            "position": position,
+            "timestamp": generated_data.get("timestamp")
+        }
+    }
+
+
+class LearningPathJobRunner:
+    """学习路线生成任务执行器"""
+
+    def __init__(self):
+        # 租约超过工作流超时一倍仍未结束，视为执行进程已退出，允许重新领取
+        self.lease = timedelta(seconds=float(n8n_client.timeout) * 2 + 60)
+        self._tasks = set()
+
+    def create_job(
+        self,
+        db: Session,
+        user_id: int,
+        position: str,
+        job_description: str,
+        content_types: Optional[List[str]] = None,
+        generated_content: Optional[Dict[str, Any]] = None
+    ) -> LearningPath:
+        """
+        创建 pending 状态的学习路线作为生成任务
+
+        传入 generated_content（缓存命中）时直接创建为 completed，不需要调度执行。
+        """
+        learning_path = LearningPath(
+            user_id=user_id,
+            position=position,
+            job_description=job_description,
+            generated_content=generated_content,
+            generation_status="completed" if generated_content is not None else "pending",
+            generation_attempts=0,
+            content_types=content_types or ["mindmap"]
+        )
+        if generated_content is not None:
+            learning_path_keywords.refresh(learning_path)
+        db.add(learning_path)
+        db.commit()
+        db.refresh(learning_path)
+        return learning_path
+
+    def _claim(self, db: Session, path_id: int) -> bool:
+        """原子领取任务：pending，或租约已过期的执行中任务"""
+        now = datetime.now()
+        claimed = db.query(LearningPath).filter(
+            LearningPath.id == path_id,
+            LearningPath.generation_attempts < MAX_ATTEMPTS,
+            or_(
+                LearningPath.generation_status == "pending",
+                and_(
+                    LearningPath.generation_status.in_(RUNNING_STATUSES),
+                    LearningPath.generation_claimed_at < now - self.lease
+                )
+            )
+        ).update({
+            LearningPath.generation_status: "calling_workflow",
+            LearningPath.generation_claimed_at: now,
+            LearningPath.generation_attempts: LearningPath.generation_attempts + 1,
+            LearningPath.generation_error: None
+        }, synchronize_session=False)
+        db.commit()
+        return claimed == 1
+
+    async def run(self, path_id: int) -> None:
+        """执行生成任务（在后台任务中调用，使用独立的数据库会话）"""
+        db = SessionLocal()
+        try:
+            if not self._claim(db, path_id):
+                self._fail_if_exhausted(db, path_id)
+                print(f"[DEBUG] 学习路线 {path_id} 的生成任务已被领取或已结束，跳过")
+                return
+
+            learning_path = db.query(LearningPath).filter(LearningPath.id == path_id).first()
+            print(f"[DEBUG] 开始生成学习路线 {path_id}（第 {learning_path.generation_attempts} 次）")
+
+            result = await n8n_client.generate_learning_path(
+                user_id=str(learning_path.user_id),
+                position=learning_path.position,
+                job_description=learning_path.job_description,
+                content_types=learning_path.content_types
+            )
+
+            if not result.get("success", False):
+                learning_path.generation_status = "failed"
+                learning_path.generation_error = result.get("error", "学习路线生成失败")
+                db.commit()
+                print(f"[ERROR] 学习路线 {path_id} 生成失败: {learning_path.generation_error}")
+                return
+
+            learning_path.generation_status = "saving"
+            db.commit()
+
+            learning_path.generated_content = build_generated_content(
+                learning_path.position, result.get("data", {})
+            )
+            learning_path_keywords.refresh(learning_path)
+            learning_path.generation_status = "completed"
+            db.commit()
+            print(f"[DEBUG] 学习路线 {path_id} 生成完成")
+
+            self._store_in_cache(db, learning_path)
+        except Exception as e:
+            db.rollback()
+            print(f"[ERROR] 学习路线 {path_id} 生成任务异常: {e}")
+            db.query(LearningPath).filter(LearningPath.id == path_id).update({
+                LearningPath.generation_status: "failed",
+                LearningPath.generation_error: f"生成任务异常: {str(e)}"
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _fail_if_exhausted(self, db: Session, path_id: int) -> None:
+        """租约过期且重试次数耗尽的执行中任务标记为失败"""
+        failed = db.query(LearningPath).filter(
+            LearningPath.id == path_id,
+            LearningPath.generation_status.in_(RUNNING_STATUSES),
+            LearningPath.generation_attempts >= MAX_ATTEMPTS,
+            LearningPath.generation_claimed_at < datetime.now() - self.lease
+        ).update({
+            LearningPath.generation_status: "failed",
+            LearningPath.generation_error: "生成任务多次中断，已停止重试"
+        }, synchronize_session=False)
+        db.commit()
+        if failed:
+            print(f"[WARN] 学习路线 {path_id} 的生成任务多次中断，已标记为失败")
+
+    def _store_in_cache(self, db: Session, learning_path: LearningPath) -> None:
+        """写入生成结果缓存（失败不影响已完成的任务）"""
+        try:
+            generation_cache.put(
+                db,
+                learning_path.position,
+                learning_path.job_description,
+                learning_path.content_types,
+                learning_path.generated_content
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[WARN] 学习路线 {learning_path.id} 写入生成缓存失败: {e}")
+
+    def retry(self, db: Session, learning_path: LearningPath) -> None:
+        """失败的任务重新排队（重置重试次数）"""
+        if learning_path.generation_status != "failed":
+            raise ValueError("只有生成失败的学习路线可以重试")
+        learning_path.generation_status = "pending"
+        learning_path.generation_attempts = 0
+        learning_path.generation_error = None
+        db.commit()
+
+    def resume_pending(self) -> int:
+        """
+        应用启动时恢复未完成的任务
+
+        pending 任务和租约过期的执行中任务重新调度；重试次数耗尽的标记为失败。
+        仍在租约内的执行中任务（重启前刚被领取）在租约到期后再尝试领取，
+        若原执行进程已退出，任务会在那时恢复。
+
+        Returns:
+            立即重新调度的任务数
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.now()
+            stale_before = now - self.lease
+            rows = db.query(
+                LearningPath.id,
+                LearningPath.generation_status,
+                LearningPath.generation_attempts,
+                LearningPath.generation_claimed_at
+            ).filter(
+                LearningPath.generation_status.in_(ACTIVE_STATUSES)
+            ).all()
+
+            # 租约内的执行中任务：到期后再检查
+            leased = {
+                row.id: (row.generation_claimed_at + self.lease - now).total_seconds()
+                for row in rows
+                if row.generation_status in RUNNING_STATUSES
+                and row.generation_claimed_at is not None
+                and row.generation_claimed_at >= stale_before
+            }
+            rows = [row for row in rows if row.id not in leased]
+
+            exhausted = [row.id for row in rows if (row.generation_attempts or 0) >= MAX_ATTEMPTS]
+            if exhausted:
+                db.query(LearningPath).filter(LearningPath.id.in_(exhausted)).update({
+                    LearningPath.generation_status: "failed",
+                    LearningPath.generation_error: "生成任务多次中断，已停止重试"
+                }, synchronize_session=False)
+                db.commit()
+
+            resumable = [row.id for row in rows if row.id not in exhausted]
+        except Exception as e:
+            print(f"[ERROR] 恢复学习路线生成任务失败: {e}")
+            return 0
+        finally:
+            db.close()
+
+        for path_id in resumable:
+            self.schedule(path_id)
+        for path_id, remaining in leased.items():
+            # 多等 1 秒，保证再次领取时租约已过期
+            self.schedule(path_id, delay=max(remaining, 0.0) + 1)
+        if resumable:
+            print(f"[DEBUG] 恢复 {len(resumable)} 个学习路线生成任务")
+        if leased:
+            print(f"[DEBUG] {len(leased)} 个学习路线生成任务仍在租约内，租约到期后再检查")
+        return len(resumable)
+
+    def schedule(self, path_id: int, delay: float = 0.0) -> None:
+        """在当前事件循环中调度任务（保留引用，避免任务被回收），delay 秒后执行"""
+        task = asyncio.get_running_loop().create_task(self._run_after(path_id, delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_after(self, path_id: int, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.run(path_id)
+
+
+# 单例实例
+learning_path_jobs = LearningPathJobRunner()
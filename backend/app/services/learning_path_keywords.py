@@ -0,0 +1,120 @@
+"""
+学习路线关键词提取（用于课程、书籍、证书搜索）
+
+关键词在生成学习路线时提取一次并保存在 learning_paths.keywords，keywords_digest 记录提取时
+内容的摘要，内容变化后才重新提取。学习路线内容只在创建和生成任务中写入，"加载更多"资源时
+直接读取已保存的关键词，只为从未提取过的旧数据补提取。提取结果是确定的：职位名称在前，其余按词频加权排序，
+词频相同时按首次出现的位置排序。
+"""
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List
+from ..models.learning_path import LearningPath
+
+
+MAX_KEYWORDS = 5
+MAX_KEYWORD_LENGTH = 30  # 更长的加粗文本一般是句子，不作为关键词
+BOLD_WEIGHT = 2  # 加粗出现一次的额外权重
+
+TECH_TERMS = (
+    "Java", "Python", "JavaScript", "React", "Vue", "Angular", "Node.js", "Spring", "Django", "Flask",
+    "MySQL", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "Azure", "Git", "Linux",
+    "HTTP", "TCP", "SQL", "NoSQL", "RESTful", "GraphQL", "微服务", "前端", "后端", "全栈",
+)
+_CANONICAL_TECH_TERMS = {term.lower(): term for term in TECH_TERMS}
+
+_BOLD_PATTERN = re.compile(r"\*\*([^\*]+)\*\*")
+# 只以英文字母数字作为词边界，中文术语在中文句子里也能匹配（\b 会把汉字当作单词字符）
+_TECH_PATTERN = re.compile(
+    r"(?<![A-Za-z0-9.])(" + "|".join(re.escape(t) for t in sorted(TECH_TERMS, key=len, reverse=True)) + r")(?![A-Za-z0-9])",
+    re.IGNORECASE
+)
+_TRIM_CHARS = " \t\r\n:：,，.。;；、-*`"
+
+
+def _normalize_term(term: str) -> str:
+    term = term.strip(_TRIM_CHARS)
+    return _CANONICAL_TECH_TERMS.get(term.lower(), term)
+
+
+def extract_keywords(position: str, output: str, limit: int = MAX_KEYWORDS) -> List[str]:
+    """
+    从职位名称和 Markdown 内容中提取关键词
+
+    候选词为加粗的术语和常见技术名词，权重 = 全文出现次数 + 加粗次数 × BOLD_WEIGHT。
+    """
+    position = (position or "").strip()
+    output = output or ""
+    lowered_output = output.lower()
+
+    display: Dict[str, str] = {}
+    first_offset: Dict[str, int] = {}
+    bold_counts: Counter = Counter()
+    tech_counts: Counter = Counter()
+
+    def candidate(term: str, offset: int):
+        term = _normalize_term(term)
+        key = term.lower()
+        if not term or len(term) > MAX_KEYWORD_LENGTH or key == position.lower():
+            return None
+        display.setdefault(key, term)
+        first_offset.setdefault(key, offset)
+        return key
+
+    for match in _BOLD_PATTERN.finditer(output):
+        key = candidate(match.group(1), match.start())
+        if key:
+            bold_counts[key] += 1
+    for match in _TECH_PATTERN.finditer(output):
+        key = candidate(match.group(1), match.start())
+        if key:
+            tech_counts[key] += 1
+
+    def score(key: str) -> int:
+        # 技术名词按词边界计数（避免 Java 计入 JavaScript），其他术语按子串计数
+        mentions = tech_counts[key] if key in _CANONICAL_TECH_TERMS else lowered_output.count(key)
+        return mentions + bold_counts[key] * BOLD_WEIGHT
+
+    ranked = sorted(display, key=lambda key: (-score(key), first_offset[key]))
+    keywords = ([position] if position else []) + [display[key] for key in ranked]
+    return keywords[:limit]
+
+
+def _content_digest(position: str, output: str) -> str:
+    return hashlib.sha256(f"{position}\n{output}".encode("utf-8")).hexdigest()
+
+
+class LearningPathKeywords:
+    """学习路线关键词缓存"""
+
+    def refresh(self, learning_path: LearningPath) -> bool:
+        """
+        内容变化（或从未提取）时重新提取并写入学习路线（不提交事务）
+
+        Returns:
+            是否重新提取
+        """
+        output = (learning_path.generated_content or {}).get("output", "") or ""
+        digest = _content_digest(learning_path.position or "", output)
+        if learning_path.keywords is not None and learning_path.keywords_digest == digest:
+            return False
+
+        learning_path.keywords = extract_keywords(learning_path.position, output)
+        learning_path.keywords_digest = digest
+        return True
+
+    def ensure(self, learning_path: LearningPath) -> bool:
+        """
+        从未提取过关键词（旧数据）时提取并写入学习路线（不提交事务），已提取时不计算摘要
+
+        Returns:
+            是否重新提取
+        """
+        if learning_path.keywords is not None:
+            return False
+        return self.refresh(learning_path)
+
+
+# 单例实例
+learning_path_keywords = LearningPathKeywords()
@@ -0,0 +1,265 @@
+"""
+学习路线分区存储
+
+按需生成的内容按类型存放在 learning_path_sections（每种类型一行），推荐资源只追加到
+learning_path_resources。"加载更多"只更新对应分区的计数并插入新资源，不再整体重写
+learning_paths.generated_content。
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal, dialect_insert
+from ..models.learning_path import LearningPath
+from ..models.learning_path_section import LearningPathSection, LearningPathResource
+
+
+TEXT_SECTION_TYPES = ("knowledge", "interview")
+RESOURCE_SECTION_TYPES = ("courses", "books", "certifications")
+SECTION_TYPES = TEXT_SECTION_TYPES + RESOURCE_SECTION_TYPES
+_COUNT_SUFFIX = "_generation_count"
+
+
+class LearningPathSectionStore:
+    """学习路线分区内容读写"""
+
+    def _section_id(self, db: Session, learning_path_id: int, content_type: str) -> int:
+        """获取分区ID，不存在时创建（并发创建时由唯一约束去重）"""
+        upsert = dialect_insert(db)
+        db.execute(
+            upsert(LearningPathSection).values(
+                learning_path_id=learning_path_id,
+                content_type=content_type,
+                generation_count=0
+            ).on_conflict_do_nothing(index_elements=["learning_path_id", "content_type"])
+        )
+        return db.query(LearningPathSection.id).filter(
+            LearningPathSection.learning_path_id == learning_path_id,
+            LearningPathSection.content_type == content_type
+        ).scalar()
+
+    def get_text(self, db: Session, learning_path_id: int, content_type: str) -> Optional[str]:
+        """读取文本分区（knowledge / interview）的内容"""
+        return db.query(LearningPathSection.content).filter(
+            LearningPathSection.learning_path_id == learning_path_id,
+            LearningPathSection.content_type == content_type
+        ).scalar()
+
+    def save_text(self, db: Session, learning_path_id: int, content_type: str, content: str) -> None:
+        """写入文本分区（不提交事务）"""
+        section_id = self._section_id(db, learning_path_id, content_type)
+        db.query(LearningPathSection).filter(LearningPathSection.id == section_id).update(
+            {LearningPathSection.content: content, LearningPathSection.updated_at: func.now()},
+            synchronize_session=False
+        )
+
+    def get_generation_count(self, db: Session, learning_path_id: int, content_type: str) -> int:
+        """资源分区已搜索的页数"""
+        return db.query(LearningPathSection.generation_count).filter(
+            LearningPathSection.learning_path_id == learning_path_id,
+            LearningPathSection.content_type == content_type
+        ).scalar() or 0
+
+    def advance_page(self, db: Session, learning_path_id: int, content_type: str) -> None:
+        """资源分区的搜索页数加一（不提交事务，调用方决定是否保留）"""
+        section_id = self._section_id(db, learning_path_id, content_type)
+        db.query(LearningPathSection).filter(LearningPathSection.id == section_id).update(
+            {
+                LearningPathSection.generation_count: func.coalesce(LearningPathSection.generation_count, 0) + 1,
+                LearningPathSection.updated_at: func.now()
+            },
+            synchronize_session=False
+        )
+
+    def get_resources(self, db: Session, learning_path_id: int, content_type: str) -> List[Dict[str, Any]]:
+        """按推荐顺序读取资源分区"""
+        rows = db.query(LearningPathResource.data).join(
+            LearningPathSection, LearningPathSection.id == LearningPathResource.section_id
+        ).filter(
+            LearningPathSection.learning_path_id == learning_path_id,
+            LearningPathSection.content_type == content_type
+        ).order_by(LearningPathResource.id).all()
+        return [row.data for row in rows]
+
+    def append_resources(
+        self,
+        db: Session,
+        learning_path_id: int,
+        content_type: str,
+        resources: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        追加资源（不提交事务），同一分区内已存在的 URL 跳过
+
+        Returns:
+            实际新增的资源
+        """
+        section_id = self._section_id(db, learning_path_id, content_type)
+        existing_urls = {
+            row.url for row in db.query(LearningPathResource.url).filter(
+                LearningPathResource.section_id == section_id,
+                LearningPathResource.url.isnot(None)
+            )
+        }
+
+        new_resources = []
+        for resource in resources:
+            if not isinstance(resource, dict):
+                continue
+            url = resource.get("url")
+            if url and url in existing_urls:
+                continue
+            new_resources.append(resource)
+            if url:
+                existing_urls.add(url)
+
+        if new_resources:
+            db.execute(
+                dialect_insert(db)(LearningPathResource).on_conflict_do_nothing(
+                    index_elements=["section_id", "url"]
+                ),
+                [{"section_id": section_id, "url": r.get("url"), "data": r} for r in new_resources]
+            )
+        return new_resources
+
+    def get_section(self, db: Session, learning_path_id: int, content_type: str) -> Optional[Dict[str, Any]]:
+        """读取单个分区"""
+        section = db.query(LearningPathSection).filter(
+            LearningPathSection.learning_path_id == learning_path_id,
+            LearningPathSection.content_type == content_type
+        ).first()
+        if section is None:
+            return None
+
+        if content_type in RESOURCE_SECTION_TYPES:
+            content = self.get_resources(db, learning_path_id, content_type)
+        else:
+            content = section.content
+        return {
+            "content_type": content_type,
+            "content": content,
+            "generation_count": section.generation_count or 0,
+            "updated_at": section.updated_at
+        }
+
+    def generated_types(self, db: Session, learning_path_ids: List[int]) -> Dict[int, List[str]]:
+        """批量查询学习路线已生成内容的分区类型"""
+        if not learning_path_ids:
+            return {}
+        resource_sections = db.query(LearningPathResource.section_id).filter(
+            LearningPathResource.section_id == LearningPathSection.id
+        ).exists()
+        rows = db.query(LearningPathSection.learning_path_id, LearningPathSection.content_type).filter(
+            LearningPathSection.learning_path_id.in_(learning_path_ids),
+            (LearningPathSection.content.isnot(None) & (LearningPathSection.content != "")) | resource_sections
+        ).all()
+
+        types: Dict[int, List[str]] = {}
+        for row in rows:
+            types.setdefault(row.learning_path_id, []).append(row.content_type)
+        return types
+
+    def assemble(self, db: Session, learning_path: LearningPath) -> Dict[str, Any]:
+        """
+        组装兼容旧结构的 generated_content（详情接口使用）
+
+        基础内容 + 各分区内容 + {类型}_generation_count + generated_types
+        """
+        content = dict(learning_path.generated_content or {})
+        generated_types = list(content.get("generated_types", []))
+
+        sections = db.query(LearningPathSection).filter(
+            LearningPathSection.learning_path_id == learning_path.id
+        ).all()
+        resources: Dict[int, List[Dict[str, Any]]] = {}
+        if any(s.content_type in RESOURCE_SECTION_TYPES for s in sections):
+            rows = db.query(LearningPathResource.section_id, LearningPathResource.data).filter(
+                LearningPathResource.section_id.in_([s.id for s in sections])
+            ).order_by(LearningPathResource.id).all()
+            for row in rows:
+                resources.setdefault(row.section_id, []).append(row.data)
+
+        for section in sections:
+            if section.content_type in RESOURCE_SECTION_TYPES:
+                value = resources.get(section.id, [])
+                content[f"{section.content_type}{_COUNT_SUFFIX}"] = section.generation_count or 0
+            else:
+                value = section.content
+            if value:
+                content[section.content_type] = value
+                if section.content_type not in generated_types:
+                    generated_types.append(section.content_type)
+
+        content["generated_types"] = generated_types
+        return content
+
+    def migrate_legacy_content(self, db: Session, learning_path: LearningPath) -> bool:
+        """
+        把旧版 generated_content 中的分区内容迁移到分区表，并从 JSON 中移除（不提交事务）
+
+        Returns:
+            是否有内容被迁移
+        """
+        content = dict(learning_path.generated_content or {})
+        legacy_keys = [
+            key for key in content
+            if key in SECTION_TYPES or (key.endswith(_COUNT_SUFFIX) and key[:-len(_COUNT_SUFFIX)] in RESOURCE_SECTION_TYPES)
+        ]
+        if not legacy_keys:
+            return False
+
+        for content_type in TEXT_SECTION_TYPES:
+            if content.get(content_type):
+                self.save_text(db, learning_path.id, content_type, content[content_type])
+
+        for content_type in RESOURCE_SECTION_TYPES:
+            if content.get(content_type):
+                self.append_resources(db, learning_path.id, content_type, content[content_type])
+            count = content.get(f"{content_type}{_COUNT_SUFFIX}")
+            if count:
+                section_id = self._section_id(db, learning_path.id, content_type)
+                db.query(LearningPathSection).filter(LearningPathSection.id == section_id).update(
+                    {LearningPathSection.generation_count: count}, synchronize_session=False
+                )
+
+        for key in legacy_keys:
+            content.pop(key, None)
+        content["generated_types"] = [t for t in content.get("generated_types", []) if t not in SECTION_TYPES]
+        learning_path.generated_content = content
+        return True
+
+    def backfill(self, db: Session, batch_size: int = 200) -> int:
+        """迁移所有旧版学习路线的分区内容，返回迁移的学习路线数"""
+        # 只加载尚未标记为已迁移的学习路线，每条只处理一次
+        migrated = 0
+        last_id = 0
+        while True:
+            paths = db.query(LearningPath).filter(
+                LearningPath.id > last_id,
+                LearningPath.sections_migrated.is_(False)
+            ).order_by(LearningPath.id).limit(batch_size).all()
+            if not paths:
+                break
+            for learning_path in paths:
+                if self.migrate_legacy_content(db, learning_path):
+                    migrated += 1
+                learning_path.sections_migrated = True
+            last_id = paths[-1].id
+            db.commit()
+        return migrated
+
+    def ensure_backfilled(self) -> None:
+        """应用启动时迁移旧版内容，失败只记录日志"""
+        db = SessionLocal()
+        try:
+            migrated = self.backfill(db)
+            if migrated:
+                print(f"[DEBUG] 已将 {migrated} 条学习路线的内容迁移到分区表")
+        except Exception as e:
+            db.rollback()
+            print(f"[ERROR] 迁移学习路线分区内容失败: {e}")
+        finally:
+            db.close()
+
+
+# 单例实例
+learning_path_section_store = LearningPathSectionStore()
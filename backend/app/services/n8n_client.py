@@ -1,17 +1,65 @@
+import asyncio
 import httpx
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from ..core.config_manager import config
 
 
 class N8NClient:
-    """n8n工作流客户端"""
+    """
+    n8n工作流客户端
+
+    复用一个带连接池的 httpx.AsyncClient（keep-alive），避免每次调用重新建立 TCP/TLS 连接；
+    应用关闭时调用 aclose() 释放连接。
+    """
     
     def __init__(self):
         # 从配置文件加载n8n配置
         n8n_config = config.get_n8n_config()
         
         self.webhook_url = n8n_config.get('webhook_url', '')
-        self.timeout = n8n_config.get('timeout', 120)
+        self.timeout = n8n_config.get('timeout', 120)  # 读取超时
+        self.connect_timeout = n8n_config.get('connect_timeout', 10)
+        self.http2 = bool(n8n_config.get('http2', False))
+        self.limits = httpx.Limits(
+            max_connections=n8n_config.get('max_connections', 20),
+            max_keepalive_connections=n8n_config.get('max_keepalive_connections', 10),
+            keepalive_expiry=n8n_config.get('keepalive_expiry', 30)
+        )
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _timeout(self, read_timeout: float) -> httpx.Timeout:
+        """连接超时与读取超时分开配置"""
+        return httpx.Timeout(read_timeout, connect=self.connect_timeout)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取共享客户端（首次使用时在当前事件循环中创建）"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            http2 = self.http2
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    print("[WARN] 未安装 h2，n8n客户端回退为 HTTP/1.1（pip install 'httpx[http2]'）")
+                    http2 = False
+
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout(self.timeout),
+                limits=self.limits,
+                http2=http2,
+                trust_env=False  # 忽略环境变量中的代理，直接连接
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭共享客户端（应用关闭时调用）"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
     
     async def generate_learning_path(
         self, 
@@ -36,22 +84,17 @@ class N8NClient:
             content_types = ['mindmap']
         
         try:
-            # 禁用代理，直接连接
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                proxies={}  # 显式设置为空字典以禁用代理
-            ) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json={
-                        "user_id": user_id,
-                        "position": position,
-                        "job_description": job_description,
-                        "content_types": content_types
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._get_client().post(
+                self.webhook_url,
+                json={
+                    "user_id": user_id,
+                    "position": position,
+                    "job_description": job_description,
+                    "content_types": content_types
+                }
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPError as e:
             print(f"[ERROR] n8n HTTP错误: {type(e).__name__}: {str(e)}")
             return {
@@ -85,28 +128,24 @@ class N8NClient:
             Dict containing success status and generated content
         """
         try:
-            # 禁用代理，直接连接到localhost
-            async with httpx.AsyncClient(
-                timeout=60.0,
-                proxies={}  # 显式设置为空字典以禁用代理
-            ) as client:
-                # 构建请求数据
-                request_data = {
-                    "user_id": user_id,
-                    "position": position,
-                    "content_type": content_type,
-                    "content_types": [content_type]  # 兼容现有工作流
-                }
+            # 构建请求数据
+            request_data = {
+                "user_id": user_id,
+                "position": position,
+                "content_type": content_type,
+                "content_types": [content_type]  # 兼容现有工作流
+            }
                 
-                if skills:
-                    request_data["skills"] = skills
+            if skills:
+                request_data["skills"] = skills
                 
-                response = await client.post(
-                    f"{self.base_url}{self.webhook_path}",
-                    json=request_data
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._get_client().post(
+                self.webhook_url,
+                json=request_data,
+                timeout=self._timeout(60.0)
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPError as e:
             print(f"[ERROR] n8n内容生成HTTP错误: {type(e).__name__}: {str(e)}")
             return {
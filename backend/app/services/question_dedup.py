@@ -0,0 +1,276 @@
+"""
+面试题近似去重服务 - 基于 MinHash + LSH 的题库近似重复检测
+"""
+import hashlib
+import itertools
+import random
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from ..models.interview_question import InterviewQuestion
+from ..models.question_status import QuestionStatus
+from .knowledge_point_index import knowledge_point_index
+
+
+# 题干中的模板化措辞，对判断“是否同一道题”没有信息量
+# 单字（的、是、中、在……）也会出现在真正的词语里（中间件、是否、在线），不能在任意位置删除：
+# - 多字短语和助词“的”在任意位置切开（排除 解释器、描述符、目的、的确 等词）
+# - 代词、请求语气只在段首删除，语气词、“是”、“中”只在段尾删除
+# - 切分后整段只剩一个虚词时删除（如 "HashMap和Hashtable" 中的 "和"）
+_FILLER_PATTERN = re.compile(
+    r"简单|详细|介绍一下|介绍|说说|谈谈|讲讲|说明|解释(?!器)|描述(?!符)|一下|你对|我们|"
+    r"什么是|什么|有哪些|哪些|怎样|怎么|如何|是否|为什么|(?<!目)的(?!确)"
+)
+_EDGE_PARTICLE_PATTERN = re.compile(r"^(?:[你它]|请(?!求))|[吗呢了是中]$")
+_FILLER_CHARS = frozenset("请你它了和与及是中对在吗呢")
+_ASCII_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_CJK_RUN_PATTERN = re.compile(r"[一-鿿]+")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def question_tokens(text: str) -> Set[str]:
+    """
+    题干规范化并切分为特征集合
+
+    - NFKC 归一化（全角转半角）并转小写
+    - 英文/数字按单词切分（Redis、HashMap、TCP 等）
+    - 中文去掉模板措辞（整段的单字虚词、段首段尾的虚词）后取二元组
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    tokens = set(_ASCII_TOKEN_PATTERN.findall(text))
+    for run in _CJK_RUN_PATTERN.findall(text):
+        for segment in _FILLER_PATTERN.sub(" ", run).split():
+            segment = _EDGE_PARTICLE_PATTERN.sub("", segment)
+            if not segment or segment in _FILLER_CHARS:
+                continue
+            if len(segment) == 1:
+                tokens.add(segment)
+            tokens.update(segment[i:i + 2] for i in range(len(segment) - 1))
+    return tokens
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard 相似度"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+class NearDuplicateIndex:
+    """
+    单个学习路线的近似重复索引
+
+    MinHash 签名按 band 分桶（LSH）召回候选，再用精确 Jaccard 确认。
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        rng = random.Random(20240601)  # 固定种子，保证签名在进程间一致
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+        self._tokens: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def _signature(self, tokens: Set[str]) -> List[int]:
+        hashes = [_token_hash(t) for t in tokens]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def _band_keys(self, tokens: Set[str]) -> List[Tuple[int, ...]]:
+        signature = self._signature(tokens)
+        r = self.rows_per_band
+        return [tuple(signature[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    def add(self, key: int, text: str) -> None:
+        """加入一道题目"""
+        tokens = question_tokens(text)
+        if not tokens:
+            return
+        self._tokens[key] = tokens
+        for band, band_key in zip(self._buckets, self._band_keys(tokens)):
+            band.setdefault(band_key, []).append(key)
+
+    def find_duplicate(self, text: str) -> Optional[int]:
+        """返回与给定题干近似重复的题目key，没有则返回None"""
+        tokens = question_tokens(text)
+        if not tokens:
+            return None
+
+        candidates = set()
+        for band, band_key in zip(self._buckets, self._band_keys(tokens)):
+            candidates.update(band.get(band_key, ()))
+
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            score = jaccard(tokens, self._tokens.get(key, set()))
+            if score >= self.threshold and score > best_score:
+                best_key, best_score = key, score
+        return best_key
+
+
+class QuestionDeduplicator:
+    """按学习路线维护近似重复索引（带TTL缓存），用于入库前过滤和存量去重"""
+
+    def __init__(self, threshold: float = 0.7, cache_ttl: int = 600):
+        self.threshold = threshold
+        self.cache_ttl = cache_ttl
+        self._indexes: Dict[int, Tuple[float, NearDuplicateIndex]] = {}
+
+    def _build_index(self, rows: Iterable[Tuple[int, str]]) -> NearDuplicateIndex:
+        index = NearDuplicateIndex(threshold=self.threshold)
+        for question_id, text in rows:
+            index.add(question_id, text)
+        return index
+
+    def get_index(self, db: Session, learning_path_id: int) -> NearDuplicateIndex:
+        """获取学习路线的索引（只查询 id 和题干两列）"""
+        cached = self._indexes.get(learning_path_id)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        rows = db.query(InterviewQuestion.id, InterviewQuestion.question).filter(
+            InterviewQuestion.learning_path_id == learning_path_id
+        ).all()
+        index = self._build_index(rows)
+        self._indexes[learning_path_id] = (time.monotonic(), index)
+        return index
+
+    def invalidate(self, learning_path_id: int) -> None:
+        """题库变更（删除等）后清除缓存"""
+        self._indexes.pop(learning_path_id, None)
+
+    def filter_new(
+        self,
+        db: Session,
+        learning_path_id: int,
+        candidates: List[Dict[str, Any]],
+        accepted: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        过滤与已有题库或本批次其他题目近似重复的候选题
+
+        Args:
+            candidates: AI生成的题目字典列表
+            accepted: 本批次此前已接受的题目（多轮补题时传入）
+
+        Returns:
+            保留下来的候选题
+        """
+        existing = self.get_index(db, learning_path_id)
+        batch = NearDuplicateIndex(threshold=self.threshold)
+        batch_keys = itertools.count(-1, -1)  # 本批次题目尚无id，使用负数key
+        for q_data in accepted or []:
+            batch.add(next(batch_keys), str(q_data.get("question") or ""))
+
+        kept = []
+        for q_data in candidates:
+            if not isinstance(q_data, dict):
+                continue
+            text = str(q_data.get("question") or "")
+            duplicate_of = existing.find_duplicate(text)
+            if duplicate_of is None:
+                duplicate_of = batch.find_duplicate(text)
+            if duplicate_of is not None:
+                print(f"[DEBUG] 丢弃近似重复题目: {text[:50]}")
+                continue
+            batch.add(next(batch_keys), text)
+            kept.append(q_data)
+        return kept
+
+    def add_saved(self, learning_path_id: int, rows: Iterable[Any]) -> None:
+        """新题目入库后加入已缓存的索引（未缓存时下次按需构建）"""
+        cached = self._indexes.get(learning_path_id)
+        if not cached:
+            return
+        for row in rows:
+            cached[1].add(row.id, row.question)
+
+    def dedupe_learning_path(
+        self,
+        db: Session,
+        learning_path_id: int,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        清理学习路线中已存在的近似重复题目
+
+        按id顺序保留最早的题目；被删除题目的刷题状态迁移到保留题目上
+        （用户在保留题目上已有状态时以已有状态为准）。
+
+        Returns:
+            {"learning_path_id", "total", "duplicates", "removed_ids"}
+        """
+        rows = db.query(InterviewQuestion.id, InterviewQuestion.question).filter(
+            InterviewQuestion.learning_path_id == learning_path_id
+        ).order_by(InterviewQuestion.id.asc()).all()
+
+        index = NearDuplicateIndex(threshold=self.threshold)
+        duplicates: Dict[int, int] = {}  # 重复题目id -> 保留题目id
+        for question_id, text in rows:
+            keep_id = index.find_duplicate(text)
+            if keep_id is None:
+                index.add(question_id, text)
+            else:
+                duplicates[question_id] = keep_id
+
+        if duplicates and not dry_run:
+            self._merge_statuses(db, duplicates)
+            knowledge_point_index.remove_questions(db, list(duplicates))
+            db.query(InterviewQuestion).filter(
+                InterviewQuestion.id.in_(list(duplicates))
+            ).delete(synchronize_session=False)
+            db.commit()
+            self.invalidate(learning_path_id)
+
+        return {
+            "learning_path_id": learning_path_id,
+            "total": len(rows),
+            "duplicates": len(duplicates),
+            "removed_ids": sorted(duplicates) if not dry_run else [],
+        }
+
+    def _merge_statuses(self, db: Session, duplicates: Dict[int, int]) -> None:
+        """把重复题目上的刷题状态迁移到保留题目"""
+        statuses = db.query(QuestionStatus).filter(
+            QuestionStatus.question_id.in_(list(duplicates))
+        ).all()
+        if not statuses:
+            return
+
+        kept_ids = set(duplicates.values())
+        occupied = {
+            (user_id, question_id)
+            for user_id, question_id in db.query(
+                QuestionStatus.user_id, QuestionStatus.question_id
+            ).filter(QuestionStatus.question_id.in_(kept_ids)).all()
+        }
+
+        for status in statuses:
+            target = (status.user_id, duplicates[status.question_id])
+            if target in occupied:
+                db.delete(status)
+            else:
+                status.question_id = target[1]
+                occupied.add(target)
+        db.flush()
+
+
+# 单例实例
+question_deduplicator = QuestionDeduplicator()
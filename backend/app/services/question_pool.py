@@ -0,0 +1,301 @@
+"""
+共享题库服务 - 同一职位的学习路线共用已生成的面试题，只在题目不足时调用大模型补题
+"""
+import hashlib
+import itertools
+import re
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal, dialect_insert
+from ..models.interview_question import InterviewQuestion, QUESTION_SOURCE_SHARED
+from ..models.learning_path import LearningPath
+from ..models.shared_question import SharedQuestion
+from .question_dedup import NearDuplicateIndex, question_deduplicator
+
+
+# 一组题目的目标难度分布
+DIFFICULTY_MIX = {"easy": 0.3, "medium": 0.5, "hard": 0.2}
+# 每个难度按配额的倍数随机抽取候选题，去重后仍有余量
+DRAW_OVERSAMPLE = 3
+
+_PUNCTUATION_PATTERN = re.compile(r"[\s\-_/|·、，,。.()（）【】\[\]]+")
+_POSITION_SUFFIXES = ("工程师", "岗位", "职位")
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def position_key(position: str) -> str:
+    """
+    职位指纹：NFKC 归一化、小写、去掉空白和标点、去掉通用后缀
+
+    例如 "Java 后端开发工程师" 与 "java后端开发" 得到相同的指纹。
+    """
+    key = _PUNCTUATION_PATTERN.sub("", unicodedata.normalize("NFKC", position or "").lower())
+    for suffix in _POSITION_SUFFIXES:
+        if key.endswith(suffix) and len(key) > len(suffix):
+            key = key[:-len(suffix)]
+    return key[:200]
+
+
+def question_hash(question: str) -> str:
+    """题干摘要：NFKC 归一化、小写、去掉空白和标点后的 SHA-256（共享题库唯一索引使用）"""
+    text = _NON_WORD_PATTERN.sub("", unicodedata.normalize("NFKC", question or "").lower())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def category_key(category: Optional[str]) -> Optional[str]:
+    """题目类别规范化（空值保持为 None）"""
+    if not category:
+        return None
+    return _PUNCTUATION_PATTERN.sub("", unicodedata.normalize("NFKC", category).lower())[:100] or None
+
+
+def difficulty_quotas(count: int) -> Dict[str, int]:
+    """按 DIFFICULTY_MIX 把题目数量分配到各难度（余数给 medium）"""
+    quotas = {difficulty: int(count * ratio) for difficulty, ratio in DIFFICULTY_MIX.items()}
+    quotas["medium"] += count - sum(quotas.values())
+    return quotas
+
+
+def _as_question_dict(row: Any) -> Dict[str, Any]:
+    return {
+        "question": row.question,
+        "answer": row.answer,
+        "category": row.category,
+        "difficulty": row.difficulty,
+        "knowledge_points": row.knowledge_points or [],
+    }
+
+
+class QuestionPool:
+    """按职位指纹组织的共享题库"""
+
+    def __init__(self, cache_ttl: int = 600):
+        self.cache_ttl = cache_ttl
+        self._indexes: Dict[str, Tuple[float, NearDuplicateIndex]] = {}
+
+    def draw(
+        self,
+        db: Session,
+        learning_path_id: int,
+        position: str,
+        count: int,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        从共享题库为学习路线取题
+
+        按目标难度分布取题，同一难度内在各类别间轮流选取；
+        每个难度在数据库中随机抽取配额 DRAW_OVERSAMPLE 倍的候选题，只对候选题去重，
+        与该学习路线已有题目近似重复的题不会被选中。
+
+        Returns:
+            题目字典列表（可直接交给 bulk_save_questions）
+        """
+        quotas = difficulty_quotas(count)
+        query = db.query(
+            SharedQuestion.question,
+            SharedQuestion.answer,
+            SharedQuestion.category,
+            SharedQuestion.difficulty,
+            SharedQuestion.knowledge_points
+        ).filter(SharedQuestion.position_key == position_key(position))
+        if category:
+            query = query.filter(SharedQuestion.category_key == category_key(category))
+
+        candidates = []
+        for difficulty, quota in quotas.items():
+            if quota <= 0:
+                continue
+            rows = query.filter(
+                SharedQuestion.difficulty == difficulty
+            ).order_by(func.random()).limit(quota * DRAW_OVERSAMPLE).all()
+            candidates += [_as_question_dict(row) for row in rows]
+        if not candidates:
+            return []
+        candidates = question_deduplicator.filter_new(db, learning_path_id, candidates)
+
+        # 难度 -> 类别 -> 题目
+        buckets: Dict[str, Dict[Optional[str], List[Dict[str, Any]]]] = {}
+        for q in candidates:
+            buckets.setdefault(q["difficulty"], {}).setdefault(category_key(q["category"]), []).append(q)
+
+        chosen: List[Dict[str, Any]] = []
+        for difficulty, quota in quotas.items():
+            chosen += self._round_robin(buckets.get(difficulty, {}), quota)
+        return chosen
+
+    def missing_difficulties(self, count: int, questions: List[Dict[str, Any]]) -> Dict[str, int]:
+        """已有题目相对目标难度分布还缺的数量（用于提示模型补哪些难度）"""
+        have = Counter(q.get("difficulty") for q in questions)
+        return {
+            difficulty: quota - have.get(difficulty, 0)
+            for difficulty, quota in difficulty_quotas(count).items()
+            if quota > have.get(difficulty, 0)
+        }
+
+    def _round_robin(self, by_category: Dict[Optional[str], List[Dict[str, Any]]], quota: int) -> List[Dict[str, Any]]:
+        """在各类别间轮流取题，最多取 quota 道"""
+        queues = [list(questions) for questions in by_category.values()]
+        picked = []
+        while queues and len(picked) < quota:
+            for queue in list(queues):
+                if len(picked) >= quota:
+                    break
+                picked.append(queue.pop())
+                if not queue:
+                    queues.remove(queue)
+        return picked
+
+    def _get_index(self, db: Session, key: str) -> NearDuplicateIndex:
+        cached = self._indexes.get(key)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        index = NearDuplicateIndex(threshold=question_deduplicator.threshold)
+        for question_id, text in db.query(SharedQuestion.id, SharedQuestion.question).filter(
+            SharedQuestion.position_key == key
+        ).all():
+            index.add(question_id, text)
+        self._indexes[key] = (time.monotonic(), index)
+        return index
+
+    def contribute(self, db: Session, position: str, questions: Iterable[Any]) -> int:
+        """
+        把大模型新生成的题目加入共享题库（与池中题目近似重复的跳过）
+
+        只应传入按职位生成的通用题目，针对个人薄弱点生成的题目不入池。
+        入池是尽力而为的：在独立的会话中写入，失败只记录日志，不影响调用方已保存的题目。
+
+        Returns:
+            新入池的题目数量
+        """
+        key = position_key(position)
+        if not key:
+            return 0
+
+        pool_db = SessionLocal(bind=db.get_bind())
+        try:
+            return self._contribute(pool_db, key, position, questions)
+        except Exception as e:
+            pool_db.rollback()
+            self._indexes.pop(key, None)
+            print(f"[WARN] 题目加入共享题库失败（{key}）: {e}")
+            return 0
+        finally:
+            pool_db.close()
+
+    def _contribute(self, db: Session, key: str, position: str, questions: Iterable[Any]) -> int:
+        index = self._get_index(db, key)
+        # 本批次题目之间也要去重，入库前尚无id，使用负数key
+        batch = NearDuplicateIndex(threshold=question_deduplicator.threshold)
+        batch_keys = itertools.count(-1, -1)
+        rows = []
+        for row in questions:
+            data = row if isinstance(row, dict) else _as_question_dict(row)
+            text = str(data.get("question") or "")
+            if not text or index.find_duplicate(text) is not None or batch.find_duplicate(text) is not None:
+                continue
+            batch.add(next(batch_keys), text)
+            rows.append({
+                "position_key": key,
+                "position": position,
+                "category_key": category_key(data.get("category")),
+                "question": text,
+                "question_hash": question_hash(text),
+                "answer": data.get("answer") or "",
+                "category": data.get("category"),
+                "difficulty": data.get("difficulty") or "medium",
+                "knowledge_points": data.get("knowledge_points") or []
+            })
+
+        if not rows:
+            return 0
+
+        # 并发入池的相同题目由唯一索引拦下
+        upsert = dialect_insert(db)
+        added = db.execute(
+            upsert(SharedQuestion).on_conflict_do_nothing(
+                index_elements=["position_key", "question_hash"]
+            ).returning(SharedQuestion.id, SharedQuestion.question),
+            rows
+        ).all()
+        db.commit()
+        for question_id, text in added:
+            index.add(question_id, text)
+        print(f"[DEBUG] {len(added)} 道题目加入共享题库（{key}）")
+        return len(added)
+
+    def backfill_hashes(self, db: Session, batch_size: int = 500) -> Tuple[int, int]:
+        """
+        补齐存量题目的 question_hash（同一职位内规范化题干相同的题目只保留最早的一道）
+
+        Returns:
+            (补齐的题目数, 删除的重复题目数)
+        """
+        seen = {
+            (key, digest)
+            for key, digest in db.query(SharedQuestion.position_key, SharedQuestion.question_hash).filter(
+                SharedQuestion.question_hash.isnot(None)
+            ).all()
+        }
+        filled = removed = 0
+        while True:
+            rows = db.query(SharedQuestion).filter(
+                SharedQuestion.question_hash.is_(None)
+            ).order_by(SharedQuestion.id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                digest = question_hash(row.question)
+                if (row.position_key, digest) in seen:
+                    db.delete(row)
+                    removed += 1
+                    continue
+                seen.add((row.position_key, digest))
+                row.question_hash = digest
+                filled += 1
+            db.commit()
+        if removed:
+            self._indexes.clear()
+        return filled, removed
+
+    def seed_from_existing(self, db: Session, position: Optional[str] = None) -> Dict[str, int]:
+        """
+        用已有学习路线中的题目初始化共享题库
+
+        只取用户选择使用共享题库时按职位生成的题目（source 为 shared）；
+        针对个人薄弱点生成的、导入的、以及未选择共享的题目都不入池，来源未记录的旧题目也跳过。
+
+        Returns:
+            {职位指纹: 新入池题目数}
+        """
+        query = db.query(LearningPath.position).distinct()
+        if position:
+            query = query.filter(LearningPath.position == position)
+
+        result: Dict[str, int] = {}
+        for (path_position,) in query.all():
+            rows = db.query(
+                InterviewQuestion.question,
+                InterviewQuestion.answer,
+                InterviewQuestion.category,
+                InterviewQuestion.difficulty,
+                InterviewQuestion.knowledge_points
+            ).join(
+                LearningPath,
+                LearningPath.id == InterviewQuestion.learning_path_id
+            ).filter(
+                LearningPath.position == path_position,
+                InterviewQuestion.source == QUESTION_SOURCE_SHARED
+            ).order_by(InterviewQuestion.id.asc()).all()
+            key = position_key(path_position)
+            result[key] = result.get(key, 0) + self.contribute(db, path_position, rows)
+        return result
+
+
+# 单例实例
+question_pool = QuestionPool()
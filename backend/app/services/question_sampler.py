@@ -0,0 +1,126 @@
+"""
+面试题抽样服务 - 随机/加权抽题，不加载整张题库
+"""
+import heapq
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.interview_question import InterviewQuestion
+from ..models.question_status import QuestionStatus
+
+
+class QuestionSampler:
+    """
+    面试题抽样器
+
+    每个学习路线只缓存题目ID列表（带TTL），抽样在ID上完成，
+    最后只按主键加载被选中的几行题目。
+    """
+
+    def __init__(self, cache_ttl: int = 300, not_mastered_weight: float = 3.0):
+        self.cache_ttl = cache_ttl
+        self.not_mastered_weight = not_mastered_weight
+        self._id_cache: Dict[int, Tuple[float, List[int]]] = {}
+
+    def get_question_ids(self, db: Session, learning_path_id: int) -> List[int]:
+        """获取学习路线下的题目ID列表（走 learning_path_id 索引，只取主键）"""
+        cached = self._id_cache.get(learning_path_id)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        ids = [
+            row[0] for row in db.query(InterviewQuestion.id).filter(
+                InterviewQuestion.learning_path_id == learning_path_id
+            ).all()
+        ]
+        self._id_cache[learning_path_id] = (time.monotonic(), ids)
+        return ids
+
+    def invalidate(self, learning_path_id: int) -> None:
+        """题库变更后清除缓存"""
+        self._id_cache.pop(learning_path_id, None)
+
+    def sample_ids(
+        self,
+        db: Session,
+        learning_path_id: int,
+        k: int = 1,
+        user_id: Optional[int] = None,
+        exclude_ids: Optional[List[int]] = None
+    ) -> List[int]:
+        """
+        抽取k个题目ID
+
+        Args:
+            db: 数据库session
+            learning_path_id: 学习路线ID
+            k: 抽取数量
+            user_id: 传入时对该用户未掌握的题目加权
+            exclude_ids: 需要排除的题目ID
+
+        Returns:
+            不重复的题目ID列表（按抽中顺序）
+        """
+        ids = self.get_question_ids(db, learning_path_id)
+        if exclude_ids:
+            excluded = set(exclude_ids)
+            ids = [qid for qid in ids if qid not in excluded]
+
+        if not ids or k <= 0:
+            return []
+
+        if user_id is None:
+            return random.sample(ids, min(k, len(ids)))
+
+        weak_ids = self._get_not_mastered_ids(db, user_id, learning_path_id)
+        if not weak_ids:
+            return random.sample(ids, min(k, len(ids)))
+
+        # 加权无放回抽样（Efraimidis-Spirakis）：key = u^(1/w)，取最大的k个
+        def weighted_key(qid: int) -> float:
+            weight = self.not_mastered_weight if qid in weak_ids else 1.0
+            return random.random() ** (1.0 / weight)
+
+        return heapq.nlargest(k, ids, key=weighted_key)
+
+    def sample_questions(
+        self,
+        db: Session,
+        learning_path_id: int,
+        k: int = 1,
+        user_id: Optional[int] = None,
+        exclude_ids: Optional[List[int]] = None
+    ) -> List[InterviewQuestion]:
+        """抽取k道题目，只按主键加载被选中的行"""
+        chosen_ids = self.sample_ids(db, learning_path_id, k, user_id, exclude_ids)
+        if not chosen_ids:
+            return []
+
+        rows = db.query(InterviewQuestion).filter(
+            InterviewQuestion.id.in_(chosen_ids)
+        ).all()
+
+        if len(rows) < len(chosen_ids):
+            # 缓存中有已删除的题目，下次重新加载
+            self.invalidate(learning_path_id)
+
+        # 保持抽中顺序
+        row_map = {q.id: q for q in rows}
+        return [row_map[qid] for qid in chosen_ids if qid in row_map]
+
+    def _get_not_mastered_ids(self, db: Session, user_id: int, learning_path_id: int) -> set:
+        """查询用户在该学习路线下未掌握的题目ID"""
+        rows = db.query(QuestionStatus.question_id).join(
+            InterviewQuestion,
+            QuestionStatus.question_id == InterviewQuestion.id
+        ).filter(
+            QuestionStatus.user_id == user_id,
+            QuestionStatus.status == "not_mastered",
+            InterviewQuestion.learning_path_id == learning_path_id
+        ).all()
+        return {row[0] for row in rows}
+
+
+# 单例实例
+question_sampler = QuestionSampler()
@@ -0,0 +1,211 @@
+"""
+面试题全文检索服务
+
+- SQLite：FTS5 虚拟表（trigram 分词，支持中文子串匹配），由触发器与题目表同步
+- PostgreSQL：触发器维护的 tsvector + pg_trgm 三元组索引
+"""
+import re
+from typing import Dict, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+# trigram 分词器要求 MATCH 的词至少3个字符，更短的词退化为 LIKE 过滤
+_TRIGRAM_MIN_LENGTH = 3
+_MAX_TERMS = 8
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS interview_questions_fts USING fts5(
+        question, answer, knowledge_points, tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS interview_questions_fts_ai AFTER INSERT ON interview_questions BEGIN
+        INSERT INTO interview_questions_fts(rowid, question, answer, knowledge_points)
+        VALUES (new.id, new.question, new.answer,
+                (SELECT group_concat(value, ' ') FROM json_each(new.knowledge_points)));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS interview_questions_fts_ad AFTER DELETE ON interview_questions BEGIN
+        DELETE FROM interview_questions_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS interview_questions_fts_au AFTER UPDATE ON interview_questions BEGIN
+        DELETE FROM interview_questions_fts WHERE rowid = old.id;
+        INSERT INTO interview_questions_fts(rowid, question, answer, knowledge_points)
+        VALUES (new.id, new.question, new.answer,
+                (SELECT group_concat(value, ' ') FROM json_each(new.knowledge_points)));
+    END
+    """,
+    # 回填建索引之前已存在的题目
+    """
+    INSERT INTO interview_questions_fts(rowid, question, answer, knowledge_points)
+    SELECT id, question, answer,
+           (SELECT group_concat(value, ' ') FROM json_each(interview_questions.knowledge_points))
+    FROM interview_questions
+    WHERE id NOT IN (SELECT rowid FROM interview_questions_fts)
+    """,
+]
+
+_POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS search_text TEXT",
+    "ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+    """
+    CREATE OR REPLACE FUNCTION interview_questions_search_update() RETURNS trigger AS $$
+    DECLARE
+        kp TEXT;
+    BEGIN
+        SELECT string_agg(value, ' ') INTO kp
+        FROM json_array_elements_text(COALESCE(NEW.knowledge_points::json, '[]'::json));
+        NEW.search_text := COALESCE(NEW.question, '') || ' ' || COALESCE(kp, '') || ' ' || COALESCE(NEW.answer, '');
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', COALESCE(NEW.question, '')), 'A') ||
+            setweight(to_tsvector('simple', COALESCE(kp, '')), 'B') ||
+            setweight(to_tsvector('simple', COALESCE(NEW.answer, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS interview_questions_search_trigger ON interview_questions",
+    """
+    CREATE TRIGGER interview_questions_search_trigger
+    BEFORE INSERT OR UPDATE OF question, answer, knowledge_points ON interview_questions
+    FOR EACH ROW EXECUTE FUNCTION interview_questions_search_update()
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_interview_questions_search_vector ON interview_questions USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_interview_questions_search_trgm ON interview_questions USING GIN (search_text gin_trgm_ops)",
+    # 回填：触发器在 UPDATE 时计算检索列
+    "UPDATE interview_questions SET question = question WHERE search_text IS NULL",
+]
+
+
+def _split_terms(query: str) -> List[str]:
+    """按空白切分检索词，去重并限制数量"""
+    terms = []
+    for term in query.split():
+        term = term.strip()
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:_MAX_TERMS]
+
+
+def _like_pattern(term: str) -> str:
+    """转义 LIKE 通配符"""
+    return "%" + re.sub(r"([\\%_])", r"\\\1", term) + "%"
+
+
+class QuestionSearchService:
+    """面试题全文检索"""
+
+    def ensure_index(self, engine: Engine) -> None:
+        """创建检索索引、同步触发器并回填（幂等，应用启动时调用）"""
+        ddl = {"sqlite": _SQLITE_DDL, "postgresql": _POSTGRES_DDL}.get(engine.dialect.name)
+        if ddl is None:
+            print(f"[WARN] 数据库 {engine.dialect.name} 不支持全文检索索引，搜索将不可用")
+            return
+
+        try:
+            with engine.begin() as conn:
+                for statement in ddl:
+                    conn.execute(text(statement))
+        except Exception as e:
+            print(f"[ERROR] 创建面试题全文检索索引失败: {e}")
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        query: str,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[int], int]:
+        """
+        在用户所有学习路线的题目中检索
+
+        Returns:
+            (按相关度排序的题目ID列表, 命中总数)
+        """
+        terms = _split_terms(query)
+        if not terms:
+            return [], 0
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            where, rank, params = self._sqlite_clauses(terms)
+            from_clause = """
+                FROM interview_questions_fts f
+                JOIN interview_questions iq ON iq.id = f.rowid
+                JOIN learning_paths lp ON lp.id = iq.learning_path_id
+            """
+            order_by = "rank ASC, iq.id DESC"  # bm25 越小越相关
+        elif dialect == "postgresql":
+            where, rank, params = self._postgres_clauses(query, terms)
+            from_clause = """
+                FROM interview_questions iq
+                JOIN learning_paths lp ON lp.id = iq.learning_path_id
+            """
+            order_by = "rank DESC, iq.id DESC"
+        else:
+            raise ValueError(f"当前数据库（{dialect}）不支持全文检索")
+
+        params.update({"user_id": user_id, "limit": limit, "offset": offset})
+        where_sql = " AND ".join(["lp.user_id = :user_id", *where])
+
+        total = db.execute(
+            text(f"SELECT COUNT(*) {from_clause} WHERE {where_sql}"), params
+        ).scalar() or 0
+        if total == 0:
+            return [], 0
+
+        rows = db.execute(
+            text(
+                f"SELECT iq.id, {rank} AS rank {from_clause} WHERE {where_sql} "
+                f"ORDER BY {order_by} LIMIT :limit OFFSET :offset"
+            ),
+            params
+        ).all()
+        return [row[0] for row in rows], total
+
+    def _sqlite_clauses(self, terms: List[str]) -> Tuple[List[str], str, Dict]:
+        where, params = [], {}
+        match_terms = [t for t in terms if len(t) >= _TRIGRAM_MIN_LENGTH]
+        short_terms = [t for t in terms if len(t) < _TRIGRAM_MIN_LENGTH]
+
+        if match_terms:
+            # 每个词作为短语匹配，词之间为 AND
+            params["match"] = " AND ".join('"' + t.replace('"', '""') + '"' for t in match_terms)
+            where.append("interview_questions_fts MATCH :match")
+            # 权重：题干 > 知识点 > 答案
+            rank = "bm25(interview_questions_fts, 10.0, 2.0, 5.0)"
+        else:
+            rank = "0"
+
+        for i, term in enumerate(short_terms):
+            key = f"like_{i}"
+            params[key] = _like_pattern(term)
+            where.append(
+                f"(f.question LIKE :{key} ESCAPE '\\' OR f.knowledge_points LIKE :{key} ESCAPE '\\' "
+                f"OR f.answer LIKE :{key} ESCAPE '\\')"
+            )
+        return where, rank, params
+
+    def _postgres_clauses(self, query: str, terms: List[str]) -> Tuple[List[str], str, Dict]:
+        where, params = [], {"query": query}
+        for i, term in enumerate(terms):
+            key = f"like_{i}"
+            params[key] = _like_pattern(term)
+            where.append(f"iq.search_text ILIKE :{key}")
+        rank = (
+            "ts_rank(iq.search_vector, plainto_tsquery('simple', :query)) "
+            "+ word_similarity(:query, iq.search_text)"
+        )
+        return where, rank, params
+
+
+# 单例实例
+question_search_service = QuestionSearchService()
@@ -0,0 +1,260 @@
+"""
+面试题库导入导出服务 - JSONL 格式（每行一道题，可附带该用户的刷题状态）
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..core.database import dialect_insert
+from ..models.interview_question import InterviewQuestion, QUESTION_SOURCE_IMPORTED
+from ..models.question_status import QuestionStatus
+from .interview_service import interview_service
+from .question_dedup import question_deduplicator
+from .question_sampler import question_sampler
+from .question_pool import question_pool
+
+
+EXPORT_BATCH_SIZE = 500
+IMPORT_CHUNK_SIZE = 500
+
+_STATUS_FIELDS = ("status", "review_count", "last_reviewed_at", "ease", "interval_days", "due_at")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+VALID_STATUSES = ("not_seen", "mastered", "not_mastered")
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _parse_status(status: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    校验导入的刷题状态
+
+    Raises:
+        ValueError: 状态值或数值字段不合法
+    """
+    if status.get("status") not in VALID_STATUSES:
+        raise ValueError(f"无效的刷题状态: {status.get('status')}")
+    try:
+        return {
+            "status": status["status"],
+            "review_count": int(status.get("review_count") or 0),
+            "last_reviewed_at": _parse_datetime(status.get("last_reviewed_at")),
+            "ease": float(status.get("ease") or 2.5),
+            "interval_days": float(status.get("interval_days") or 0),
+            "due_at": _parse_datetime(status.get("due_at")),
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"无效的刷题状态字段: {e}") from e
+
+
+class QuestionTransferService:
+    """面试题库 JSONL 导入导出"""
+
+    def iter_export(
+        self,
+        db: Session,
+        learning_path_id: int,
+        user_id: Optional[int] = None,
+        include_statuses: bool = False
+    ) -> Iterator[str]:
+        """
+        逐行导出学习路线的题目
+
+        使用服务端游标（stream_results + yield_per）分批读取，内存占用与题库大小无关。
+
+        Args:
+            user_id: include_statuses 为 True 时导出该用户的刷题状态
+        """
+        columns = [
+            InterviewQuestion.question,
+            InterviewQuestion.answer,
+            InterviewQuestion.category,
+            InterviewQuestion.difficulty,
+            InterviewQuestion.knowledge_points,
+            InterviewQuestion.created_at,
+        ]
+        with_statuses = include_statuses and user_id is not None
+        if with_statuses:
+            columns += [getattr(QuestionStatus, field) for field in _STATUS_FIELDS]
+
+        query = db.query(*columns).filter(
+            InterviewQuestion.learning_path_id == learning_path_id
+        )
+        if with_statuses:
+            query = query.outerjoin(
+                QuestionStatus,
+                (QuestionStatus.question_id == InterviewQuestion.id) &
+                (QuestionStatus.user_id == user_id)
+            )
+
+        rows = query.order_by(InterviewQuestion.id.asc()).execution_options(
+            stream_results=True, yield_per=EXPORT_BATCH_SIZE
+        )
+        for row in rows:
+            record = {
+                "question": row.question,
+                "answer": row.answer,
+                "category": row.category,
+                "difficulty": row.difficulty,
+                "knowledge_points": row.knowledge_points or [],
+                "created_at": row.created_at,
+            }
+            if with_statuses and row.status:
+                record["user_status"] = {field: getattr(row, field) for field in _STATUS_FIELDS}
+            yield json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+
+    def import_lines(
+        self,
+        db: Session,
+        learning_path_id: int,
+        lines: Iterable[Any],
+        user_id: Optional[int] = None,
+        include_statuses: bool = False
+    ) -> Dict[str, int]:
+        """
+        从 JSONL 行导入题目到学习路线
+
+        每 IMPORT_CHUNK_SIZE 行做一次近似去重（对比题库和本批次）并批量插入，
+        去重索引随每批入库增量更新，内存占用与文件大小无关。
+
+        Returns:
+            {"imported", "duplicates", "invalid", "statuses"}
+        """
+        stats = {"imported": 0, "duplicates": 0, "invalid": 0, "statuses": 0}
+        chunk: List[Dict[str, Any]] = []
+        for line in lines:
+            record = self._parse_line(line)
+            if record is None:
+                if line and str(line).strip():
+                    stats["invalid"] += 1
+                continue
+            chunk.append(record)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                self._import_chunk(db, learning_path_id, chunk, user_id, include_statuses, stats)
+                chunk = []
+        if chunk:
+            self._import_chunk(db, learning_path_id, chunk, user_id, include_statuses, stats)
+
+        if stats["imported"]:
+            question_sampler.invalidate(learning_path_id)
+        print(f"[DEBUG] 导入学习路线 {learning_path_id}: {stats}")
+        return stats
+
+    def import_to_pool(self, db: Session, position: str, lines: Iterable[Any]) -> Dict[str, int]:
+        """从 JSONL 行导入题目到共享题库（忽略刷题状态）"""
+        stats = {"imported": 0, "duplicates": 0, "invalid": 0}
+        chunk: List[Dict[str, Any]] = []
+
+        def flush():
+            normalized = interview_service.normalize_questions(chunk)
+            stats["invalid"] += len(chunk) - len(normalized)
+            added = question_pool.contribute(db, position, normalized)
+            stats["imported"] += added
+            stats["duplicates"] += len(normalized) - added
+
+        for line in lines:
+            record = self._parse_line(line)
+            if record is None:
+                if line and str(line).strip():
+                    stats["invalid"] += 1
+                continue
+            chunk.append(record)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                flush()
+                chunk = []
+        if chunk:
+            flush()
+        return stats
+
+    def _parse_line(self, line: Any) -> Optional[Dict[str, Any]]:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = (line or "").strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return record if isinstance(record, dict) else None
+
+    def _import_chunk(
+        self,
+        db: Session,
+        learning_path_id: int,
+        chunk: List[Dict[str, Any]],
+        user_id: Optional[int],
+        include_statuses: bool,
+        stats: Dict[str, int]
+    ) -> None:
+        with_statuses = include_statuses and user_id is not None
+
+        # 先逐行规范化并校验刷题状态（在任何写入之前），状态不合法的行整行算作无效；
+        # 刷题状态按规范化后的题目对象关联，题干相同的行不会共用状态
+        normalized = []
+        statuses: Dict[int, Dict[str, Any]] = {}
+        for record in chunk:
+            rows = interview_service.normalize_questions([record])
+            if not rows:
+                stats["invalid"] += 1
+                continue
+            status = record.get("user_status") if with_statuses else None
+            if isinstance(status, dict) and status.get("status"):
+                try:
+                    statuses[id(rows[0])] = _parse_status(status)
+                except ValueError as e:
+                    print(f"[WARN] 跳过刷题状态不合法的题目: {e}")
+                    stats["invalid"] += 1
+                    continue
+            normalized.append(rows[0])
+
+        kept = question_deduplicator.filter_new(db, learning_path_id, normalized)
+        stats["duplicates"] += len(normalized) - len(kept)
+        if not kept:
+            return
+
+        saved = interview_service.bulk_save_questions(db, learning_path_id, kept, source=QUESTION_SOURCE_IMPORTED)
+        question_deduplicator.add_saved(learning_path_id, saved)
+        stats["imported"] += len(saved)
+
+        if statuses:
+            # bulk_save_questions 按传入顺序返回插入的行
+            pairs = [(row, statuses.get(id(q))) for row, q in zip(saved, kept)]
+            stats["statuses"] += self._insert_statuses(db, user_id, pairs)
+
+    def _insert_statuses(
+        self,
+        db: Session,
+        user_id: int,
+        pairs: List[Tuple[Any, Optional[Dict[str, Any]]]]
+    ) -> int:
+        """写入已校验的刷题状态：pairs 为（已插入的题目行, 状态）"""
+        values = [
+            {"user_id": user_id, "question_id": row.id, **status}
+            for row, status in pairs
+            if status
+        ]
+
+        if not values:
+            return 0
+        upsert = dialect_insert(db)
+        db.execute(upsert(QuestionStatus).on_conflict_do_nothing(), values)
+        db.commit()
+        return len(values)
+
+
+# 单例实例
+question_transfer_service = QuestionTransferService()
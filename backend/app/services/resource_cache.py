@@ -0,0 +1,172 @@
+"""
+资源搜索结果缓存（进程内，所有用户共享）
+
+按（平台, 规范化查询, 页码）缓存课程、书籍、证书的搜索结果：
+- 新鲜期内直接返回
+- 过期但仍在陈旧期内：先返回旧结果，同时在后台刷新（stale-while-revalidate）
+- 平台失败时返回的备选结果做负缓存（negative_ttl），避免每次点击都重新请求故障平台；
+  已有成功结果时保留旧结果并延长 negative_ttl，不用备选结果覆盖
+- 相同键的并发请求合并为一次上游请求
+
+配置项（config.json → resource_search）：
+- cache_ttl：各平台的新鲜期（秒）
+- stale_ttl：过期后仍可返回旧结果的时长（秒）
+- negative_ttl：失败结果的缓存时长（秒）
+- cache_max_entries：最多缓存的条目数（按最近使用淘汰）
+"""
+import asyncio
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from ..core.config_manager import config
+
+
+DEFAULT_CACHE_TTL = {
+    'bilibili': 1800,
+    'imooc': 3600,
+    'geekbang': 86400,
+    'books': 86400,
+    'certifications': 86400,
+}
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 上游查询：返回（结果, 是否成功），失败时结果为备选结果
+Fetcher = Callable[[], Awaitable[Tuple[List[Dict[str, Any]], bool]]]
+
+
+def normalize_query(query: str) -> str:
+    """NFKC 归一化、小写、合并空白"""
+    return _WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFKC", query or "").lower()).strip()
+
+
+@dataclass
+class CacheEntry:
+    value: List[Dict[str, Any]]
+    fresh_until: float
+    stale_until: float
+    negative: bool
+
+
+class ResourceCache:
+    """资源搜索结果缓存"""
+
+    def __init__(self):
+        search_config = config.get('resource_search', {}) or {}
+        self.ttl = {**DEFAULT_CACHE_TTL, **(search_config.get('cache_ttl') or {})}
+        self.stale_ttl = float(search_config.get('stale_ttl', 3600))
+        self.negative_ttl = float(search_config.get('negative_ttl', 300))
+        self.max_entries = int(search_config.get('cache_max_entries', 2000))
+
+        self._entries: "OrderedDict[Tuple[str, str, int], CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self._tasks = set()
+        self._counters = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0}
+
+    def _key(self, platform: str, query: str, page: int) -> Tuple[str, str, int]:
+        return platform, normalize_query(query), page
+
+    def peek(self, platform: str, query: str, page: int) -> Optional[CacheEntry]:
+        """查看缓存条目（不计数、不触发刷新），已完全过期的返回 None"""
+        entry = self._entries.get(self._key(platform, query, page))
+        if entry is None or entry.stale_until <= time.monotonic():
+            return None
+        return entry
+
+    async def get_or_fetch(self, platform: str, query: str, page: int, fetch: Fetcher) -> List[Dict[str, Any]]:
+        """读取缓存，未命中时调用 fetch 查询上游并写入缓存"""
+        key = self._key(platform, query, page)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self._counters["negative_hits" if entry.negative else "hits"] += 1
+            else:
+                # 陈旧结果先返回，后台刷新（失败结果过期后不再返回，重新请求）
+                self._counters["stale_hits"] += 1
+                self._schedule_refresh(key, fetch)
+            return list(entry.value)
+
+        self._counters["misses"] += 1
+        return list(await self._fetch(key, fetch))
+
+    async def _fetch(self, key: Tuple[str, str, int], fetch: Fetcher) -> List[Dict[str, Any]]:
+        """查询上游并写入缓存，相同键的并发请求共享同一次查询"""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 自己被取消时继续抛出；发起查询的请求被取消时由当前请求重新查询
+                if asyncio.current_task().cancelling() or not inflight.cancelled():
+                    raise
+            return await self._fetch(key, fetch)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value, ok = await fetch()
+        except asyncio.CancelledError:
+            # 发起查询的请求被取消（如停止预取、客户端断开），通知等待同一查询的请求
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 避免没有其他等待者时出现 "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        self._store(key, value, ok)
+        future.set_result(value)
+        return value
+
+    def _store(self, key: Tuple[str, str, int], value: List[Dict[str, Any]], ok: bool) -> None:
+        now = time.monotonic()
+        current = self._entries.get(key)
+        if ok:
+            fresh_until = now + float(self.ttl.get(key[0], 3600))
+            entry = CacheEntry(value, fresh_until, fresh_until + self.stale_ttl, False)
+        elif current is not None and not current.negative and now < current.stale_until:
+            # 刷新失败时保留仍可用的成功结果，negative_ttl 内不再请求故障平台
+            fresh_until = now + self.negative_ttl
+            entry = CacheEntry(current.value, fresh_until, max(current.stale_until, fresh_until), False)
+        else:
+            fresh_until = now + self.negative_ttl
+            entry = CacheEntry(value, fresh_until, fresh_until, True)
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_refresh(self, key: Tuple[str, str, int], fetch: Fetcher) -> None:
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._fetch(key, fetch)
+            except Exception as e:
+                print(f"[WARN] 后台刷新资源缓存失败 {key}: {e}")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, "entries": len(self._entries)}
+
+
+# 单例实例
+resource_cache = ResourceCache()
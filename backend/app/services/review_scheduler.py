@@ -0,0 +1,103 @@
+"""
+间隔复习调度服务 - SM-2 算法安排错题/已掌握题目的下次复习时间
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.interview_question import InterviewQuestion
+from ..models.question_status import QuestionStatus
+
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+PASS_QUALITY = 3  # 评分 >= 3 视为答对
+RELEARN_DELAY = timedelta(minutes=10)  # 答错后当天重学
+
+# 未显式评分时按状态给出的默认评分（0-5）
+STATUS_QUALITY = {
+    "mastered": 4,
+    "not_mastered": 2,
+}
+
+
+@dataclass
+class ReviewSchedule:
+    """一次复习后的调度结果"""
+    ease: float
+    interval_days: float
+    due_at: Optional[datetime]
+
+
+class ReviewScheduler:
+    """SM-2 间隔复习调度器"""
+
+    def quality_for_status(self, status: str, quality: Optional[int] = None) -> Optional[int]:
+        """复习评分：优先使用显式评分，否则按状态取默认值；not_seen 返回 None"""
+        if quality is not None:
+            return quality
+        return STATUS_QUALITY.get(status)
+
+    def schedule(
+        self,
+        ease: Optional[float],
+        interval_days: Optional[float],
+        quality: Optional[int],
+        now: Optional[datetime] = None
+    ) -> ReviewSchedule:
+        """
+        根据本次评分计算下次复习时间
+
+        - 答对：间隔 1天 -> 6天 -> 上次间隔 × ease
+        - 答错：间隔清零，RELEARN_DELAY 后重新复习
+        - ease 按 SM-2 公式调整，不低于 MIN_EASE
+        - quality 为 None（重置为未看过）时清除调度
+        """
+        if quality is None:
+            return ReviewSchedule(ease=DEFAULT_EASE, interval_days=0.0, due_at=None)
+
+        now = now or datetime.now()
+        ease = ease or DEFAULT_EASE
+        interval_days = interval_days or 0.0
+
+        miss = 5 - quality
+        ease = max(MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02))
+
+        if quality < PASS_QUALITY:
+            return ReviewSchedule(ease=ease, interval_days=0.0, due_at=now + RELEARN_DELAY)
+
+        if interval_days < 1:
+            interval_days = 1.0
+        elif interval_days < 6:
+            interval_days = 6.0
+        else:
+            interval_days = round(interval_days * ease, 1)
+        return ReviewSchedule(ease=ease, interval_days=interval_days, due_at=now + timedelta(days=interval_days))
+
+    def get_review_queue(
+        self,
+        db: Session,
+        user_id: int,
+        limit: int = 20,
+        now: Optional[datetime] = None
+    ) -> List[Tuple[InterviewQuestion, QuestionStatus]]:
+        """
+        取出已到期的复习卡片（按到期时间升序）
+
+        走 (user_id, due_at) 索引做范围扫描，只读取前limit条，与题库大小无关。
+        """
+        now = now or datetime.now()
+        return db.query(InterviewQuestion, QuestionStatus).join(
+            QuestionStatus,
+            QuestionStatus.question_id == InterviewQuestion.id
+        ).filter(
+            QuestionStatus.user_id == user_id,
+            QuestionStatus.due_at <= now
+        ).order_by(
+            QuestionStatus.due_at.asc(),
+            QuestionStatus.id.asc()
+        ).limit(limit).all()
+
+
+# 单例实例
+review_scheduler = ReviewScheduler()
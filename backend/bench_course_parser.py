@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+课程搜索结果页解析基准测试（CPU）
+
+在保存的慕课网搜索页（bench_fixtures/imooc_*.html）上对比：
+- 整页 BeautifulSoup + html.parser（旧实现）
+- course_page_parser 中的各解析后端（只解析课程卡片所在的片段）
+
+并检查各后端解析出的课程卡片与旧实现一致。
+
+用法:
+    python bench_course_parser.py                       # 默认每个页面解析 200 次
+    python bench_course_parser.py -n 500 --limit 3      # 500 次，每页取 3 个课程
+    python bench_course_parser.py --html saved.html     # 使用其他保存的页面
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bs4 import BeautifulSoup
+
+from app.services.course_page_parser import IMOOC_PARSERS, CourseCard
+
+FIXTURES_DIR = Path(__file__).parent / "bench_fixtures"
+
+
+def parse_full_page(html: str, limit: int) -> List[CourseCard]:
+    """旧实现：整页 html.parser 解析后按卡片执行 CSS 选择器"""
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = []
+    for item in soup.select('.course-card-container')[:limit]:
+        title = item.select_one('.course-card-name')
+        link = item.select_one('a')
+        if title and link:
+            cover = item.select_one('.course-card-top img')
+            price = item.select_one('.course-card-price')
+            cards.append(CourseCard(
+                title=title.text.strip(),
+                href=link.get('href', ''),
+                cover=cover.get('src', '') if cover else '',
+                price=price.text.strip() if price else '',
+            ))
+    return cards
+
+
+def measure(parser, html: str, limit: int, iterations: int) -> List[float]:
+    """返回每次解析的 CPU 耗时（毫秒）"""
+    parser(html, limit)  # 预热（导入模块、编译 XPath）
+    timings = []
+    for _ in range(iterations):
+        start = time.process_time()
+        parser(html, limit)
+        timings.append((time.process_time() - start) * 1000)
+    return timings
+
+
+def benchmark(paths: List[Path], iterations: int, limit: int) -> bool:
+    all_match = True
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+        expected = parse_full_page(html, limit)
+        print(f"{path.name}（{len(html) / 1024:.0f} KB，{len(expected)} 个课程，解析 {iterations} 次）")
+
+        baseline = statistics.mean(measure(parse_full_page, html, limit, iterations))
+        print(f"  {'整页 html.parser':<16} 平均 {baseline:7.3f} ms")
+
+        for name, parser in IMOOC_PARSERS.items():
+            try:
+                result = parser(html, limit)
+            except ImportError:
+                print(f"  {name:<16} 未安装，跳过")
+                continue
+            mean = statistics.mean(measure(parser, html, limit, iterations))
+            match = result == expected
+            all_match = all_match and match
+            print(f"  {name:<16} 平均 {mean:7.3f} ms  {baseline / mean:5.1f}x  "
+                  f"{'✓ 结果一致' if match else '✗ 结果不一致'}")
+    return all_match
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="对比慕课网搜索页各HTML解析后端的CPU耗时")
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="每个页面的解析次数（默认 200）")
+    parser.add_argument("--limit", type=int, default=20, help="每页解析的课程数（默认 20）")
+    parser.add_argument("--html", type=Path, action="append", help="保存的搜索页（可多次指定，默认 bench_fixtures/imooc_*.html）")
+    args = parser.parse_args()
+
+    paths = args.html or sorted(FIXTURES_DIR.glob("imooc_*.html"))
+    if not paths:
+        print(f"✗ 没有找到HTML页面：{FIXTURES_DIR}/imooc_*.html")
+        sys.exit(1)
+
+    sys.exit(0 if benchmark(paths, args.iterations, args.limit) else 1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+n8n客户端连接复用基准测试
+
+在本地启动一个模拟 n8n Webhook 的HTTP服务，对比：
+- 每次调用新建 httpx.AsyncClient（旧实现）
+- 复用 N8NClient 的连接池（keep-alive）
+
+用法:
+    python bench_n8n_client.py                  # 默认 200 次请求
+    python bench_n8n_client.py -n 500 -c 10     # 500 次请求，10 并发
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+
+from app.services.n8n_client import N8NClient
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """模拟 n8n Webhook：读取请求体并返回固定的 JSON"""
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive
+    disable_nagle_algorithm = True  # 避免响应头与响应体分包时触发延迟确认
+    body = json.dumps({"success": True, "data": {"mindmap": "# 学习路线"}}).encode()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_calls(call, total: int, concurrency: int):
+    """并发执行 total 次调用，返回每次调用的耗时（毫秒）和总耗时（秒）"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed():
+        async with semaphore:
+            start = time.perf_counter()
+            result = await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not result.get("success"):
+                raise RuntimeError(result.get("error"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(total)))
+    return latencies, time.perf_counter() - start
+
+
+def report(name: str, latencies, elapsed: float):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<10} 平均 {statistics.mean(ordered):7.2f} ms  "
+          f"中位 {statistics.median(ordered):7.2f} ms  p95 {p95:7.2f} ms  "
+          f"吞吐 {len(ordered) / elapsed:8.1f} req/s")
+
+
+async def benchmark(total: int, concurrency: int):
+    server = start_stand_in()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhook/learning-path"
+    payload = {"user_id": "bench", "position": "后端开发", "job_description": "", "content_types": ["mindmap"]}
+
+    async def per_call():
+        # 旧实现：每次调用新建客户端
+        async with httpx.AsyncClient(timeout=120, trust_env=False) as client:
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    client = N8NClient()
+    client.webhook_url = url
+
+    async def pooled():
+        return await client.generate_learning_path("bench", "后端开发", "")
+
+    try:
+        # 预热（建立连接池中的连接）
+        await run_calls(pooled, concurrency, concurrency)
+
+        per_call_latencies, per_call_elapsed = await run_calls(per_call, total, concurrency)
+        pooled_latencies, pooled_elapsed = await run_calls(pooled, total, concurrency)
+    finally:
+        await client.aclose()
+        server.shutdown()
+
+    print(f"请求数 {total}，并发 {concurrency}")
+    report("每次新建", per_call_latencies, per_call_elapsed)
+    report("连接池", pooled_latencies, pooled_elapsed)
+    saved = statistics.mean(per_call_latencies) - statistics.mean(pooled_latencies)
+    print(f"✓ 复用连接后每次调用平均节省 {saved:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="对比 n8n 客户端每次新建连接与连接池复用的调用延迟")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="请求次数（默认 200）")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="并发数（默认 1）")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.requests, args.concurrency))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+面试题库近似去重脚本
+
+用法:
+    python dedupe_questions.py                      # 清理所有学习路线
+    python dedupe_questions.py --learning-path 12   # 只清理指定学习路线
+    python dedupe_questions.py --dry-run            # 只统计，不删除
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.database import SessionLocal
+from app.models.user import User  # noqa: F401  注册关联模型
+from app.models.learning_path import LearningPath  # noqa: F401
+from app.models.learning_path_section import LearningPathSection  # noqa: F401
+from app.models.interview_question import InterviewQuestion
+from app.services.question_dedup import question_deduplicator
+
+
+def dedupe_questions(learning_path_ids=None, dry_run: bool = False):
+    db = SessionLocal()
+    try:
+        if not learning_path_ids:
+            learning_path_ids = [
+                row[0] for row in db.query(InterviewQuestion.learning_path_id).distinct().all()
+            ]
+
+        total_duplicates = 0
+        for learning_path_id in learning_path_ids:
+            result = question_deduplicator.dedupe_learning_path(db, learning_path_id, dry_run=dry_run)
+            total_duplicates += result["duplicates"]
+            if result["duplicates"]:
+                print(f"学习路线 {learning_path_id}: 共 {result['total']} 道题，近似重复 {result['duplicates']} 道")
+
+        action = "发现" if dry_run else "已删除"
+        print(f"✓ 检查 {len(learning_path_ids)} 条学习路线，{action} {total_duplicates} 道近似重复题目")
+    except Exception as e:
+        print(f"✗ 去重失败: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="清理面试题库中的近似重复题目")
+    parser.add_argument("--learning-path", type=int, action="append", dest="learning_path_ids",
+                        help="只处理指定学习路线（可重复指定）")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不删除")
+    args = parser.parse_args()
+
+    dedupe_questions(args.learning_path_ids, dry_run=args.dry_run)
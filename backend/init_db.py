@@ -11,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from app.core.database import Base, engine
 from app.models.user import User
 from app.models.learning_path import LearningPath
+from app.models.learning_path_section import LearningPathSection, LearningPathResource
 from app.models.learning_progress import LearningProgress
 from app.models.notebook import Notebook
 from app.models.note import Note
@@ -0,0 +1,15 @@
+-- 学习路线生成结果缓存（相同职位 + JD + 内容类型直接复用已生成的内容）
+
+CREATE TABLE IF NOT EXISTS generation_cache_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cache_key VARCHAR(64) NOT NULL UNIQUE,
+    position VARCHAR(200) NOT NULL,
+    content_types TEXT,  -- SQLite存储JSON为TEXT
+    generated_content TEXT NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    expires_at DATETIME NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_generation_cache_entries_cache_key ON generation_cache_entries(cache_key);
+CREATE INDEX IF NOT EXISTS ix_generation_cache_entries_expires_at ON generation_cache_entries(expires_at);
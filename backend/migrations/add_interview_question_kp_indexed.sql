@@ -0,0 +1,6 @@
+-- 标记面试题的知识点是否已写入 question_knowledge_points
+-- 存量题目标记为未建立索引，应用启动时回填一次后置为已建立；新保存的题目默认为已建立
+
+ALTER TABLE interview_questions ADD COLUMN knowledge_points_indexed BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE INDEX IF NOT EXISTS ix_interview_questions_knowledge_points_indexed ON interview_questions(knowledge_points_indexed);
@@ -0,0 +1,4 @@
+-- 面试题来源（generated / shared / weak_points / imported），共享题库只收录 shared 题目
+-- 旧数据来源未知，保持为空，不会被初始化脚本放入共享题库
+
+ALTER TABLE interview_questions ADD COLUMN source VARCHAR(20);
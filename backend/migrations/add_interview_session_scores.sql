@@ -0,0 +1,25 @@
+-- 面试会话评分冗余列与历史查询索引
+-- 评分从 evaluation JSON 中拆出，历史记录和趋势查询不再加载对话记录
+
+-- 1. 评分与完成时间列
+ALTER TABLE interview_sessions ADD COLUMN overall_score INTEGER;
+ALTER TABLE interview_sessions ADD COLUMN technical_depth_score INTEGER;
+ALTER TABLE interview_sessions ADD COLUMN expression_score INTEGER;
+ALTER TABLE interview_sessions ADD COLUMN problem_solving_score INTEGER;
+ALTER TABLE interview_sessions ADD COLUMN experience_score INTEGER;
+ALTER TABLE interview_sessions ADD COLUMN completed_at DATETIME;
+
+-- 2. 回填已完成会话
+UPDATE interview_sessions
+SET overall_score = CAST(json_extract(evaluation, '$.overall_score') AS INTEGER),
+    technical_depth_score = CAST(json_extract(evaluation, '$.dimension_scores.technical_depth') AS INTEGER),
+    expression_score = CAST(json_extract(evaluation, '$.dimension_scores.expression') AS INTEGER),
+    problem_solving_score = CAST(json_extract(evaluation, '$.dimension_scores.problem_solving') AS INTEGER),
+    experience_score = CAST(json_extract(evaluation, '$.dimension_scores.experience') AS INTEGER),
+    completed_at = COALESCE(ended_at, created_at)
+WHERE status = 'completed' AND evaluation IS NOT NULL;
+
+-- 3. 索引
+CREATE INDEX IF NOT EXISTS ix_interview_sessions_overall_score ON interview_sessions(overall_score);
+CREATE INDEX IF NOT EXISTS ix_interview_sessions_completed_at ON interview_sessions(completed_at);
+CREATE INDEX IF NOT EXISTS idx_interview_sessions_user_status_created ON interview_sessions(user_id, status, created_at);
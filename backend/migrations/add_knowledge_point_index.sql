@@ -0,0 +1,26 @@
+-- 面试题知识点规范化索引
+-- 知识点从 interview_questions.knowledge_points（JSON数组）拆到独立表，薄弱点排行直接分组查询
+-- 存量数据在应用启动时由 knowledge_point_index.ensure_backfilled() 回填
+-- （规范化规则包含 NFKC 归一化，SQL 中无法等价实现）
+
+-- 1. 知识点表
+CREATE TABLE IF NOT EXISTS knowledge_points (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    canonical_name VARCHAR(200) NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_knowledge_points_id ON knowledge_points(id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_knowledge_points_canonical_name ON knowledge_points(canonical_name);
+
+-- 2. 题目-知识点关联表
+CREATE TABLE IF NOT EXISTS question_knowledge_points (
+    question_id INTEGER NOT NULL,
+    knowledge_point_id INTEGER NOT NULL,
+    PRIMARY KEY (question_id, knowledge_point_id),
+    FOREIGN KEY (question_id) REFERENCES interview_questions(id) ON DELETE CASCADE,
+    FOREIGN KEY (knowledge_point_id) REFERENCES knowledge_points(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_question_knowledge_points_kp ON question_knowledge_points(knowledge_point_id, question_id);
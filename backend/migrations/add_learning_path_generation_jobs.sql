@@ -0,0 +1,10 @@
+-- 学习路线异步生成任务状态
+-- 已有的学习路线都是同步生成完成的，generation_status 默认 completed
+
+ALTER TABLE learning_paths ADD COLUMN generation_status VARCHAR(20) NOT NULL DEFAULT 'completed';
+ALTER TABLE learning_paths ADD COLUMN generation_error TEXT;
+ALTER TABLE learning_paths ADD COLUMN generation_attempts INTEGER DEFAULT 0;
+ALTER TABLE learning_paths ADD COLUMN content_types TEXT;  -- SQLite存储JSON为TEXT
+ALTER TABLE learning_paths ADD COLUMN generation_claimed_at DATETIME;
+
+CREATE INDEX IF NOT EXISTS ix_learning_paths_generation_status ON learning_paths(generation_status);
@@ -0,0 +1,4 @@
+-- 学习路线资源搜索关键词（生成时提取，存量数据在首次搜索资源时补提取）
+
+ALTER TABLE learning_paths ADD COLUMN keywords TEXT;  -- SQLite存储JSON为TEXT
+ALTER TABLE learning_paths ADD COLUMN keywords_digest VARCHAR(64);
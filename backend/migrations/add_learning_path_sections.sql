@@ -0,0 +1,29 @@
+-- 学习路线按需生成内容分区存储
+-- 每种内容类型一行（knowledge, interview, courses, books, certifications），推荐资源只追加
+-- 存量 generated_content 中的分区内容由应用启动时自动迁移
+
+CREATE TABLE IF NOT EXISTS learning_path_sections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    learning_path_id INTEGER NOT NULL,
+    content_type VARCHAR(30) NOT NULL,
+    content TEXT,
+    generation_count INTEGER DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (learning_path_id) REFERENCES learning_paths(id) ON DELETE CASCADE,
+    CONSTRAINT uq_learning_path_sections_path_type UNIQUE (learning_path_id, content_type)
+);
+
+CREATE TABLE IF NOT EXISTS learning_path_resources (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    section_id INTEGER NOT NULL,
+    url VARCHAR(1000),
+    data TEXT NOT NULL,  -- SQLite存储JSON为TEXT
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (section_id) REFERENCES learning_path_sections(id) ON DELETE CASCADE,
+    CONSTRAINT uq_learning_path_resources_section_url UNIQUE (section_id, url)
+);
+
+CREATE INDEX IF NOT EXISTS ix_learning_path_sections_id ON learning_path_sections(id);
+CREATE INDEX IF NOT EXISTS ix_learning_path_resources_id ON learning_path_resources(id);
+CREATE INDEX IF NOT EXISTS idx_learning_path_resources_section ON learning_path_resources(section_id, id);
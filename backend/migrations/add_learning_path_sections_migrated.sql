@@ -0,0 +1,4 @@
+-- 标记学习路线的旧版分区内容是否已迁移到分区表
+-- 存量学习路线标记为未迁移，应用启动时迁移一次后置为已迁移；新建的学习路线默认为已迁移
+
+ALTER TABLE learning_paths ADD COLUMN sections_migrated BOOLEAN NOT NULL DEFAULT FALSE;
@@ -0,0 +1,3 @@
+-- 学习路线列表按用户游标分页（user_id = ? AND id < ? ORDER BY id DESC）
+
+CREATE INDEX IF NOT EXISTS idx_learning_paths_user ON learning_paths(user_id, id);
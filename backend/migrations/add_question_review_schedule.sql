@@ -0,0 +1,22 @@
+-- 间隔复习（SM-2）调度字段与复习队列索引
+
+-- 1. 调度字段
+ALTER TABLE question_statuses ADD COLUMN ease REAL DEFAULT 2.5;
+ALTER TABLE question_statuses ADD COLUMN interval_days REAL DEFAULT 0;
+ALTER TABLE question_statuses ADD COLUMN due_at DATETIME;
+
+-- 2. 回填已有记录：错题立即到期，已掌握的题目在上次复习1天后到期
+UPDATE question_statuses
+SET ease = 2.5,
+    interval_days = 0,
+    due_at = COALESCE(last_reviewed_at, created_at)
+WHERE status = 'not_mastered' AND due_at IS NULL;
+
+UPDATE question_statuses
+SET ease = 2.5,
+    interval_days = 1,
+    due_at = datetime(COALESCE(last_reviewed_at, created_at), '+1 day')
+WHERE status = 'mastered' AND due_at IS NULL;
+
+-- 3. 复习队列索引
+CREATE INDEX IF NOT EXISTS idx_question_statuses_user_due ON question_statuses(user_id, due_at);
@@ -0,0 +1,5 @@
+-- 错题本游标分页索引
+-- 按 (user_id, status) 定位错题，按 (last_reviewed_at, id) 顺序翻页
+
+CREATE INDEX IF NOT EXISTS idx_question_statuses_user_status_reviewed
+    ON question_statuses(user_id, status, last_reviewed_at, id);
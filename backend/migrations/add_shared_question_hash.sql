@@ -0,0 +1,6 @@
+-- 共享题库按（职位指纹, 规范化题干摘要）唯一，并发入池时不会写入重复题目
+-- 存量题目的 question_hash 由 python seed_question_pool.py 补齐（重复的题目只保留最早的一道）
+
+ALTER TABLE shared_questions ADD COLUMN question_hash VARCHAR(64);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_shared_questions_position_question ON shared_questions(position_key, question_hash);
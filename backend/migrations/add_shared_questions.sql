@@ -0,0 +1,19 @@
+-- 共享题库：同一职位的用户共用已生成并去重的面试题
+-- 初始化数据：python seed_question_pool.py
+
+CREATE TABLE IF NOT EXISTS shared_questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position_key VARCHAR(200) NOT NULL,
+    position VARCHAR(200) NOT NULL,
+    category_key VARCHAR(100),
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    category VARCHAR(100),
+    difficulty VARCHAR(20) DEFAULT 'medium',
+    knowledge_points TEXT,  -- SQLite存储JSON为TEXT
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_shared_questions_id ON shared_questions(id);
+CREATE INDEX IF NOT EXISTS idx_shared_questions_position_category ON shared_questions(position_key, category_key);
+CREATE INDEX IF NOT EXISTS idx_shared_questions_position_difficulty ON shared_questions(position_key, difficulty);
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+面试题库 JSONL 导入导出脚本
+
+用法:
+    python question_bank.py export --learning-path 12 > bank.jsonl
+    python question_bank.py export --learning-path 12 --include-statuses -o bank.jsonl
+    python question_bank.py import --learning-path 34 bank.jsonl
+    python question_bank.py import --learning-path 34 --include-statuses bank.jsonl
+    python question_bank.py import --pool-position "Java后端开发" bank.jsonl   # 导入共享题库
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.database import SessionLocal
+from app.models.user import User  # noqa: F401  注册关联模型
+from app.models.learning_path import LearningPath
+from app.models.learning_path_section import LearningPathSection  # noqa: F401
+from app.services.question_transfer import question_transfer_service
+
+
+def export_bank(learning_path_id: int, include_statuses: bool, output: str = None):
+    db = SessionLocal()
+    out = open(output, "w", encoding="utf-8") if output else sys.stdout
+    try:
+        learning_path = db.query(LearningPath).filter(LearningPath.id == learning_path_id).first()
+        if not learning_path:
+            print(f"✗ 学习路线 {learning_path_id} 不存在", file=sys.stderr)
+            return
+
+        count = 0
+        for line in question_transfer_service.iter_export(
+            db,
+            learning_path_id,
+            user_id=learning_path.user_id,
+            include_statuses=include_statuses
+        ):
+            out.write(line)
+            count += 1
+        print(f"✓ 导出 {count} 道题目", file=sys.stderr)
+    finally:
+        if output:
+            out.close()
+        db.close()
+
+
+def import_bank(path: str, learning_path_id: int = None, include_statuses: bool = False, pool_position: str = None):
+    db = SessionLocal()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if pool_position:
+                result = question_transfer_service.import_to_pool(db, pool_position, f)
+            else:
+                learning_path = db.query(LearningPath).filter(LearningPath.id == learning_path_id).first()
+                if not learning_path:
+                    print(f"✗ 学习路线 {learning_path_id} 不存在")
+                    return
+                result = question_transfer_service.import_lines(
+                    db,
+                    learning_path_id,
+                    f,
+                    user_id=learning_path.user_id,
+                    include_statuses=include_statuses
+                )
+        print(f"✓ 导入 {result['imported']} 道题目，跳过重复 {result['duplicates']} 道，无效 {result['invalid']} 行")
+    except Exception as e:
+        print(f"✗ 导入失败: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="面试题库 JSONL 导入导出")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="导出学习路线的题库")
+    export_parser.add_argument("--learning-path", type=int, required=True, dest="learning_path_id")
+    export_parser.add_argument("--include-statuses", action="store_true", help="同时导出路线所属用户的刷题状态")
+    export_parser.add_argument("-o", "--output", help="输出文件（默认标准输出）")
+
+    import_parser = subparsers.add_parser("import", help="导入题库（近似重复的题目会被跳过）")
+    target = import_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--learning-path", type=int, dest="learning_path_id", help="导入到指定学习路线")
+    target.add_argument("--pool-position", help="导入到指定职位的共享题库")
+    import_parser.add_argument("--include-statuses", action="store_true", help="同时导入刷题状态（归属路线所属用户）")
+    import_parser.add_argument("file", help="JSONL 文件路径")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_bank(args.learning_path_id, args.include_statuses, args.output)
+    else:
+        import_bank(args.file, args.learning_path_id, args.include_statuses, args.pool_position)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+共享题库初始化脚本
+
+用法:
+    python seed_question_pool.py                          # 用所有选择共享题库的学习路线题目初始化
+    python seed_question_pool.py --position "Java后端开发"  # 只处理指定职位
+
+每次运行前先补齐存量题目的题干摘要（question_hash），同一职位内重复的题目只保留最早的一道。
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.database import SessionLocal
+from app.models.user import User  # noqa: F401  注册关联模型
+from app.models.learning_path import LearningPath  # noqa: F401
+from app.models.learning_path_section import LearningPathSection  # noqa: F401
+from app.services.question_pool import question_pool
+
+
+def seed_question_pool(position=None):
+    db = SessionLocal()
+    try:
+        filled, removed = question_pool.backfill_hashes(db)
+        if filled or removed:
+            print(f"补齐 {filled} 道存量题目的题干摘要，删除 {removed} 道重复题目")
+        result = question_pool.seed_from_existing(db, position=position)
+        for key, added in sorted(result.items()):
+            print(f"职位 {key}: 新入池 {added} 道题目")
+        print(f"✓ 处理 {len(result)} 个职位，共新入池 {sum(result.values())} 道题目")
+    except Exception as e:
+        print(f"✗ 初始化共享题库失败: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="用已有题目初始化共享题库")
+    parser.add_argument("--position", help="只处理指定职位（按原始职位名称匹配）")
+    args = parser.parse_args()
+
+    seed_question_pool(args.position)
@@ -0,0 +1,100 @@
+"""
+学习路线生成任务的重启恢复
+
+运行: cd backend && python -m pytest tests -q
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 使用临时数据库（须在导入应用模块之前设置），测试结束后删除
+_db_fd, _db_path = tempfile.mkstemp(suffix=".db")
+os.close(_db_fd)
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.main  # noqa: E402,F401  注册所有模型并建表
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.learning_path import LearningPath  # noqa: E402
+from app.services import learning_path_jobs as jobs_module  # noqa: E402
+
+
+def teardown_module(module):
+    engine.dispose()
+    os.remove(_db_path)
+
+
+def _create_running_job(claimed_ago: timedelta, attempts: int = 1) -> int:
+    db = SessionLocal()
+    try:
+        user = User(username=f"u{datetime.now().timestamp()}", email=f"{datetime.now().timestamp()}@x.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        learning_path = LearningPath(
+            user_id=user.id,
+            position="Java后端开发",
+            job_description="",
+            content_types=["mindmap"],
+            generation_status="calling_workflow",
+            generation_attempts=attempts,
+            generation_claimed_at=datetime.now() - claimed_ago
+        )
+        db.add(learning_path)
+        db.commit()
+        return learning_path.id
+    finally:
+        db.close()
+
+
+def _status(path_id: int) -> str:
+    db = SessionLocal()
+    try:
+        return db.query(LearningPath.generation_status).filter(LearningPath.id == path_id).scalar()
+    finally:
+        db.close()
+
+
+def test_resume_job_claimed_just_before_restart(monkeypatch):
+    """重启时仍在租约内的执行中任务，租约到期后恢复执行"""
+    runner = jobs_module.LearningPathJobRunner()
+    runner.lease = timedelta(seconds=1)
+    calls = []
+
+    async def fake_generate(**kwargs):
+        calls.append(kwargs)
+        return {"success": True, "data": {"output": "# Java\n**Redis**"}}
+
+    monkeypatch.setattr(jobs_module.n8n_client, "generate_learning_path", fake_generate)
+    monkeypatch.setattr(runner, "_store_in_cache", lambda db, learning_path: None)
+
+    path_id = _create_running_job(claimed_ago=timedelta(milliseconds=100))
+
+    async def restart():
+        assert runner.resume_pending() == 0  # 租约内，不立即重新执行
+        assert _status(path_id) == "calling_workflow"
+        await asyncio.gather(*list(runner._tasks))
+
+    asyncio.run(restart())
+
+    assert len(calls) == 1
+    assert _status(path_id) == "completed"
+
+
+def test_exhausted_job_inside_lease_is_failed_after_lease(monkeypatch):
+    """重试次数耗尽的任务在租约到期后标记为失败，而不是一直停留在执行中"""
+    runner = jobs_module.LearningPathJobRunner()
+    runner.lease = timedelta(seconds=1)
+
+    path_id = _create_running_job(claimed_ago=timedelta(milliseconds=100), attempts=jobs_module.MAX_ATTEMPTS)
+
+    async def restart():
+        runner.resume_pending()
+        await asyncio.gather(*list(runner._tasks))
+
+    asyncio.run(restart())
+
+    assert _status(path_id) == "failed"
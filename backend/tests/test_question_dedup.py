@@ -0,0 +1,31 @@
+"""
+面试题近似去重的题干切分
+
+运行: cd backend && python -m pytest tests -q
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.question_dedup import NearDuplicateIndex, question_tokens  # noqa: E402
+
+
+def test_filler_characters_inside_words_are_kept():
+    """词语中的单字（中间件的“中”、是否的“是”）不会被当作虚词删除"""
+    assert {"中间", "间件"} <= question_tokens("什么是中间件？")
+    assert {"消息", "息中", "中间"} <= question_tokens("消息中间件的作用")
+    assert "解释" in question_tokens("解释器模式的应用场景")
+
+
+def test_template_wording_is_ignored():
+    """模板化措辞和整段虚词不影响特征"""
+    assert question_tokens("Redis的持久化机制有哪些？") == question_tokens("请介绍一下Redis持久化机制")
+    assert question_tokens("HashMap和Hashtable的区别") == {"hashmap", "hashtable", "区别"}
+
+
+def test_different_words_sharing_a_filler_character_are_not_merged():
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add(1, "消息中间件的作用")
+    assert index.find_duplicate("消息间件的作用") is None
+    assert index.find_duplicate("请说说消息中间件的作用") == 1
@@ -0,0 +1,64 @@
+"""
+资源搜索结果缓存的并发请求合并
+
+运行: cd backend && python -m pytest tests -q
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.resource_cache import ResourceCache  # noqa: E402
+
+
+def test_waiter_refetches_when_owner_is_cancelled():
+    """发起查询的请求被取消时，等待同一查询的请求不会一直挂起，而是重新查询"""
+    cache = ResourceCache()
+    calls = []
+    first_started = asyncio.Event()
+
+    async def fetch():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            first_started.set()
+            await asyncio.sleep(10)
+        return [{"title": "Go"}], True
+
+    async def run():
+        owner = asyncio.create_task(cache.get_or_fetch("bilibili", "Go", 1, fetch))
+        await first_started.wait()
+        waiter = asyncio.create_task(cache.get_or_fetch("bilibili", "Go", 1, fetch))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        result = await asyncio.wait_for(waiter, timeout=1)
+        assert owner.cancelled()
+        return result
+
+    assert asyncio.run(run()) == [{"title": "Go"}]
+    assert len(calls) == 2
+    assert cache._inflight == {}
+
+
+def test_cancelled_waiter_does_not_cancel_owner():
+    """等待者自己被取消时不影响正在进行的查询"""
+    cache = ResourceCache()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return [{"title": "Go"}], True
+
+    async def run():
+        owner = asyncio.create_task(cache.get_or_fetch("bilibili", "Go", 1, fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_fetch("bilibili", "Go", 1, fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await owner, waiter.cancelled()
+
+    assert asyncio.run(run()) == ([{"title": "Go"}], True)
+    assert cache._inflight == {}
@@ -17,7 +17,8 @@ import { BulbOutlined, SaveOutlined, EditOutlined, EyeOutlined } from '@ant-desi
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 import { aiNoteAPI, type NoteGenerationRequest, type NoteDraft } from '../services/aiNoteAPI';
-import { learningPathAPI, type LearningPath } from '../services/api';
+import { learningPathAPI } from '../services/api';
+import type { LearningPathSummary } from '../types';
 import MarkdownEditor from './MarkdownEditor';
 
 const { Step } = Steps;
@@ -49,7 +50,7 @@ const AINoteWizard: React.FC<AINoteWizardProps> = ({
   const [generating, setGenerating] = useState(false);
   const [saving, setSaving] = useState(false);
   const [selectedNotebook, setSelectedNotebook] = useState<number | undefined>();
-  const [learningPaths, setLearningPaths] = useState<LearningPath[]>([]);
+  const [learningPaths, setLearningPaths] = useState<LearningPathSummary[]>([]);
 
   // 加载用户的学习路线
   useEffect(() => {
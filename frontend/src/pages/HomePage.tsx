@@ -48,7 +48,7 @@ const HomePage: React.FC = () => {
       message.success('学习路线生成成功！');
       navigate(`/learning-path/${result.id}`);
     } catch (error: any) {
-      message.error(error.response?.data?.detail || '生成失败，请稍后重试');
+      message.error(error.response?.data?.detail || error.message || '生成失败，请稍后重试');
     } finally {
       setLoading(false);
     }
@@ -147,10 +147,19 @@ const InterviewSimulatorPage: React.FC = () => {
             timerRef.current = null;
           }
           
-          const response = await interviewSimulatorAPI.end(sessionId);
-          setEvaluation(response.evaluation);
-          setShowEvaluation(true);
-          message.success('面试已结束，评价报告已生成');
+          await interviewSimulatorAPI.end(sessionId);
+          message.info('面试已结束，正在生成评价报告...');
+          
+          const session = await interviewSimulatorAPI.waitForEvaluation(sessionId);
+          if (session.status === 'completed' && session.evaluation) {
+            setEvaluation(session.evaluation);
+            setShowEvaluation(true);
+            message.success('评价报告已生成');
+          } else if (session.status === 'evaluation_failed') {
+            message.error('评价报告生成失败，请稍后在历史记录中重试');
+          } else {
+            message.warning('评价报告仍在生成中，请稍后在历史记录中查看');
+          }
         } catch (error: any) {
           message.error(error.response?.data?.detail || '结束面试失败');
           console.error(error);
@@ -3,13 +3,13 @@ import { useNavigate } from 'react-router-dom';
 import { Card, List, Button, Typography, Space, Tag, Spin, Empty, Modal, message } from 'antd';
 import { BookOutlined, CalendarOutlined, DeleteOutlined, PlusOutlined } from '@ant-design/icons';
 import { learningPathAPI } from '../services/api';
-import type { LearningPath } from '../types';
+import type { LearningPathSummary } from '../types';
 
-const { Title, Paragraph } = Typography;
+const { Title } = Typography;
 
 const LearningPathsListPage: React.FC = () => {
   const navigate = useNavigate();
-  const [learningPaths, setLearningPaths] = useState<LearningPath[]>([]);
+  const [learningPaths, setLearningPaths] = useState<LearningPathSummary[]>([]);
   const [loading, setLoading] = useState(false);
   
   // 加载学习路线列表
@@ -130,27 +130,19 @@ const LearningPathsListPage: React.FC = () => {
                         <span style={{ fontSize: 18, fontWeight: 'bold' }}>
                           {path.position}
                         </span>
-                        {path.generated_content?.skills && (
-                          <Tag color="blue">
-                            {path.generated_content.skills.length} 个技能点
+                        {path.generation_status && path.generation_status !== 'completed' && (
+                          <Tag color={path.generation_status === 'failed' ? 'red' : 'blue'}>
+                            {path.generation_status === 'failed' ? '生成失败' : '生成中'}
                           </Tag>
                         )}
                       </Space>
                     }
                     description={
                       <Space direction="vertical" size="small" style={{ width: '100%' }}>
-                        {path.generated_content?.description && (
-                          <Paragraph 
-                            ellipsis={{ rows: 2 }} 
-                            style={{ margin: 0, color: '#666', fontSize: 14 }}
-                          >
-                            {path.generated_content.description}
-                          </Paragraph>
-                        )}
                         <Space>
                           <CalendarOutlined style={{ color: '#999' }} />
                           <span style={{ fontSize: 12, color: '#999' }}>
-                            创建于 {new Date(path.created_at).toLocaleDateString('zh-CN', {
+                            创建于 {new Date(path.created_at!).toLocaleDateString('zh-CN', {
                               year: 'numeric',
                               month: 'long',
                               day: 'numeric'
@@ -48,7 +48,7 @@ const MistakesPage: React.FC = () => {
         setQuestions(response.questions);
       } else {
         // 如果没有 ID，获取所有错题
-        const response = await interviewAPI.getAllMistakes(500, 0);
+        const response = await interviewAPI.getAllMistakes(500);
         setQuestions(response.questions);
       }
       setCurrentIndex(0);
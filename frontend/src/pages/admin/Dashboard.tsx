@@ -392,8 +392,18 @@ const Dashboard: React.FC = () => {
                   </div>
                   <div>
                     <GlobalOutlined style={{ marginRight: 8 }} />
-                    API: <Tag color="green">正常</Tag>
+                    API: <Tag color={systemStatus?.api_status === 'degraded' ? 'orange' : 'green'}>
+                      {systemStatus?.api_status === 'degraded' ? '部分降级' : '正常'}
+                    </Tag>
                   </div>
+                  {systemStatus?.platforms?.map((p) => (
+                    <div key={p.platform} style={{ marginTop: 8 }}>
+                      {p.platform}: <Tag color={p.state === 'closed' ? 'green' : p.state === 'open' ? 'red' : 'orange'}>
+                        {p.state === 'closed' ? '正常' : p.state === 'open' ? '熔断' : '探测中'}
+                      </Tag>
+                      {p.latency.count > 0 && `平均 ${(p.latency.sum / p.latency.count).toFixed(2)}s`}
+                    </div>
+                  ))}
                 </div>
               </Col>
               <Col span={12}>
@@ -61,6 +61,24 @@ export interface ActivityItem {
   timestamp: string;
 }
 
+export interface LatencyHistogram {
+  bounds: number[];
+  counts: number[];
+  count: number;
+  sum: number;
+}
+
+export interface PlatformHealth {
+  platform: string;
+  state: 'closed' | 'open' | 'half_open';
+  failure_rate: number;
+  slow_call_rate: number;
+  window_calls: number;
+  open_count: number;
+  retry_after?: number | null;
+  latency: LatencyHistogram;
+}
+
 export interface SystemStatus {
   database_status: string;
   api_status: string;
@@ -68,6 +86,19 @@ export interface SystemStatus {
   memory_usage: number;
   disk_usage: number;
   last_check_time: string;
+  platforms: PlatformHealth[];
+}
+
+export interface GenerationCacheStats {
+  enabled: boolean;
+  ttl_hours: number;
+  hits: number;
+  misses: number;
+  stores: number;
+  hit_rate: number;
+  entries: number;
+  entry_hits: number;
+  since: string;
 }
 
 export interface QuickStats {
@@ -265,6 +296,16 @@ export const dashboardAPI = {
     return response.data;
   },
 
+  async getGenerationCacheStats(): Promise<GenerationCacheStats> {
+    const response = await api.get('/admin/dashboard/generation-cache');
+    return response.data;
+  },
+
+  async clearGenerationCache(): Promise<{ success: boolean; deleted: number }> {
+    const response = await api.delete('/admin/dashboard/generation-cache');
+    return response.data;
+  },
+
   async getPopularPaths(limit: number = 5): Promise<PopularPath[]> {
     const response = await api.get('/admin/dashboard/popular-paths', {
       params: { limit }
@@ -5,6 +5,8 @@ import type {
   RegisterData,
   LearningPath,
   LearningPathCreate,
+  LearningPathList,
+  GenerationJob,
   ProgressUpdate,
   ProgressStats,
   Note,
@@ -61,13 +63,53 @@ export const authAPI = {
 
 // 学习路线API
 export const learningPathAPI = {
-  generate: async (pathData: LearningPathCreate): Promise<LearningPath> => {
-    const { data } = await api.post<LearningPath>('/learning-paths/generate', pathData);
+  // 提交生成任务（202），返回任务状态
+  submit: async (pathData: LearningPathCreate): Promise<GenerationJob> => {
+    const { data } = await api.post<GenerationJob>('/learning-paths/generate', pathData);
     return data;
   },
   
-  list: async (skip = 0, limit = 20): Promise<{ total: number; items: LearningPath[] }> => {
-    const { data } = await api.get('/learning-paths', { params: { skip, limit } });
+  getStatus: async (id: number): Promise<GenerationJob> => {
+    const { data } = await api.get<GenerationJob>(`/learning-paths/${id}/status`);
+    return data;
+  },
+  
+  retry: async (id: number): Promise<GenerationJob> => {
+    const { data } = await api.post<GenerationJob>(`/learning-paths/${id}/retry`);
+    return data;
+  },
+  
+  // 提交生成任务并轮询直到完成
+  generate: async (
+    pathData: LearningPathCreate,
+    intervalMs: number = 2000,
+    timeoutMs: number = 600000
+  ): Promise<LearningPath> => {
+    const job = await learningPathAPI.submit(pathData);
+    const deadline = Date.now() + timeoutMs;
+    let current = job;
+    while (current.status !== 'completed') {
+      if (current.status === 'failed') {
+        throw new Error(current.error || '学习路线生成失败');
+      }
+      if (Date.now() >= deadline) {
+        throw new Error('学习路线生成超时，请稍后在列表中查看');
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+      current = await learningPathAPI.getStatus(job.job_id);
+    }
+    return learningPathAPI.get(job.learning_path_id);
+  },
+  
+  // fields: 逗号分隔的返回字段；cursor: 上一页返回的 next_cursor（传入时忽略 skip）
+  list: async (
+    skip = 0,
+    limit = 20,
+    options: { cursor?: string; fields?: string } = {}
+  ): Promise<LearningPathList> => {
+    const { data } = await api.get<LearningPathList>('/learning-paths', {
+      params: { skip, limit, ...options }
+    });
     return data;
   },
   
@@ -4,7 +4,11 @@ import type {
   GenerateQuestionsRequest,
   GenerateQuestionsResponse,
   UpdateStatusRequest,
-  InterviewStatistics
+  BatchUpdateStatusResponse,
+  ReviewQueueResponse,
+  QuestionImportResponse,
+  InterviewStatistics,
+  InterviewSearchResponse
 } from '../types/interview';
 
 // 创建axios实例（使用相对路径，依赖Vite代理）
@@ -68,21 +72,35 @@ export const interviewAPI = {
   },
 
   /**
-   * 获取所有学习路线的错题
+   * 获取所有学习路线的错题（按最近复习时间倒序，cursor 传上一页的 next_cursor）
    */
   async getAllMistakes(
     limit: number = 500,
-    offset: number = 0
+    cursor?: string
   ): Promise<InterviewQuestionsListResponse> {
     const response = await api.get<InterviewQuestionsListResponse>(
       `/interview/questions/all/mistakes`,
       {
-        params: { limit, offset }
+        params: { limit, cursor }
       }
     );
     return response.data;
   },
 
+  /**
+   * 全文检索所有学习路线的面试题
+   */
+  async searchQuestions(
+    q: string,
+    limit: number = 20,
+    offset: number = 0
+  ): Promise<InterviewSearchResponse> {
+    const response = await api.get<InterviewSearchResponse>('/interview/search', {
+      params: { q, limit, offset }
+    });
+    return response.data;
+  },
+
   /**
    * 更新题目状态
    */
@@ -91,6 +109,62 @@ export const interviewAPI = {
     return response.data;
   },
 
+  /**
+   * 批量更新题目状态（同一题目多次出现时以最后一次为准）
+   */
+  async batchUpdateStatus(
+    items: UpdateStatusRequest[]
+  ): Promise<BatchUpdateStatusResponse> {
+    const response = await api.post<BatchUpdateStatusResponse>(
+      '/interview/status/batch',
+      { items }
+    );
+    return response.data;
+  },
+
+  /**
+   * 获取已到期的复习卡片（间隔复习）
+   */
+  async getReviewQueue(limit: number = 20): Promise<ReviewQueueResponse> {
+    const response = await api.get<ReviewQueueResponse>('/interview/review-queue', {
+      params: { limit }
+    });
+    return response.data;
+  },
+
+  /**
+   * 导出学习路线题库（JSONL）
+   */
+  async exportQuestions(
+    learningPathId: number,
+    includeStatuses: boolean = false
+  ): Promise<Blob> {
+    const response = await api.get(`/interview/export/${learningPathId}`, {
+      params: { include_statuses: includeStatuses },
+      responseType: 'blob'
+    });
+    return response.data;
+  },
+
+  /**
+   * 导入题库（JSONL，近似重复的题目会被跳过）
+   */
+  async importQuestions(
+    learningPathId: number,
+    file: Blob,
+    includeStatuses: boolean = false
+  ): Promise<QuestionImportResponse> {
+    const response = await api.post<QuestionImportResponse>(
+      `/interview/import/${learningPathId}`,
+      file,
+      {
+        params: { include_statuses: includeStatuses },
+        headers: { 'Content-Type': 'application/x-ndjson' }
+      }
+    );
+    return response.data;
+  },
+
   /**
    * 获取统计信息
    */
@@ -33,10 +33,12 @@ export interface Evaluation {
   summary: string;
 }
 
+export type SessionStatus = 'in_progress' | 'evaluating' | 'completed' | 'evaluation_failed';
+
 export interface InterviewSession {
   id: number;
   position: string;
-  status: string;
+  status: SessionStatus;
   conversation: Message[];
   evaluation?: Evaluation;
   duration_minutes: number;
@@ -73,6 +75,27 @@ export const interviewSimulatorAPI = {
   async getSession(session_id: number): Promise<InterviewSession> {
     const response = await api.get(`/interview-simulator/session/${session_id}`);
     return response.data;
+  },
+
+  async retryEvaluation(session_id: number) {
+    const response = await api.post(`/interview-simulator/session/${session_id}/evaluate`);
+    return response.data;
+  },
+
+  // 结束面试后评价在后台生成，轮询会话直到评价完成或失败
+  async waitForEvaluation(
+    session_id: number,
+    intervalMs: number = 2000,
+    timeoutMs: number = 300000
+  ): Promise<InterviewSession> {
+    const deadline = Date.now() + timeoutMs;
+    while (true) {
+      const session = await this.getSession(session_id);
+      if (session.status !== 'evaluating' || Date.now() >= deadline) {
+        return session;
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
   }
 };
 
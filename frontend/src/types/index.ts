@@ -33,12 +33,44 @@ export interface LearningPath {
   job_description?: string;
   generated_content?: any;
   created_at: string;
+  generation_status?: GenerationStatus;
+  generation_error?: string | null;
+}
+
+// 学习路线列表项（不含 generated_content，详情见 learningPathAPI.get）
+export interface LearningPathSummary {
+  id: number;
+  user_id?: number;
+  position?: string;
+  job_description?: string;
+  created_at?: string;
+  generation_status?: GenerationStatus;
+  generation_error?: string | null;
+}
+
+export interface LearningPathList {
+  total: number;
+  items: LearningPathSummary[];
+  has_more: boolean;
+  next_cursor?: string | null;
+}
+
+export type GenerationStatus = 'pending' | 'calling_workflow' | 'saving' | 'completed' | 'failed';
+
+export interface GenerationJob {
+  job_id: number;
+  learning_path_id: number;
+  status: GenerationStatus;
+  error?: string | null;
+  attempts: number;
+  from_cache?: boolean;
 }
 
 export interface LearningPathCreate {
   position: string;
   job_description: string;
   content_types?: string[];
+  use_cache?: boolean;  // 默认 true，false 时强制重新生成
 }
 
 // 资源类型
@@ -39,6 +39,14 @@ export interface InterviewQuestionsListResponse {
   statistics: InterviewStatistics;
   total: number;
   has_more: boolean;
+  next_cursor?: string | null;
+}
+
+export interface InterviewSearchResponse {
+  query: string;
+  questions: InterviewQuestion[];
+  total: number;
+  has_more: boolean;
 }
 
 export interface GenerateQuestionsRequest {
@@ -46,6 +54,7 @@ export interface GenerateQuestionsRequest {
   count?: number;
   category?: string;
   based_on_weak_points?: boolean;
+  use_shared_pool?: boolean; // 优先使用同职位的共享题库
 }
 
 export interface GenerateQuestionsResponse {
@@ -58,5 +67,37 @@ export interface GenerateQuestionsResponse {
 export interface UpdateStatusRequest {
   question_id: number;
   status: QuestionStatus;
+  quality?: number; // 复习评分 0-5，不传时按状态取默认值
+}
+
+export interface BatchUpdateStatusResponse {
+  success: boolean;
+  message: string;
+  statuses: {
+    question_id: number;
+    status: QuestionStatus;
+    review_count: number;
+    due_at?: string | null;
+  }[];
+}
+
+export interface ReviewCard extends InterviewQuestion {
+  due_at: string;
+  ease: number;
+  interval_days: number;
+}
+
+export interface QuestionImportResponse {
+  success: boolean;
+  message: string;
+  imported: number;
+  duplicates: number;
+  invalid: number;
+  statuses: number;
+}
+
+export interface ReviewQueueResponse {
+  cards: ReviewCard[];
+  has_more: boolean;
 }
 